@@ -0,0 +1,131 @@
+"""Throughput benchmarks for the async in-memory limiter paths.
+
+Run with `python -m benchmarks.aio`. Compares async leaky bucket checks over `AsyncMemoryStorage`, updated without
+awaiting, against the same storage hidden behind its plain `AsyncRateStorage` interface and locked with
+`AsyncMemoryMutex`, with a bare dictionary lookup per check as the reference.
+
+Then measures the latency of limit checks made by 10k concurrent tasks over blocking storages adapted with
+`AsyncExecutorAtomicStorage`, with executor hops batched and with a hop per call.
+"""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Self, final, override
+
+from benchmarks.harness import report
+from leak_snek.interfaces.storages.aio.rate_store import AsyncRateStorage
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.aio.leaky_bucket import AsyncLeakyBucketLimiter
+from leak_snek.mutexes.aio.memory_mutex import AsyncMemoryMutex
+from leak_snek.storages.aio.executor_storage import AsyncExecutorAtomicStorage, ExecutorBatcher
+from leak_snek.storages.aio.memory_storage import AsyncMemoryStorage
+from leak_snek.storages.memory_storage import MemoryStorage
+from leak_snek.storages.sqlite_storage import SQLiteStorage
+
+if TYPE_CHECKING:
+    from leak_snek.interfaces.storages.atomic_rate_store import AtomicRateStorage
+    from leak_snek.interfaces.values.rate import Rate
+
+OPERATIONS = 200_000
+KEYS = 1024
+RATE_LIMIT = RateLimit(operations=1_000_000, period=timedelta(seconds=1))
+TASKS = 10_000
+
+
+@final
+@dataclasses.dataclass
+class PlainStorage(AsyncRateStorage[int]):
+    """`AsyncMemoryStorage` exposing only reads and writes, so limiters have to lock the keys around them."""
+
+    storage: AsyncMemoryStorage[int] = dataclasses.field(default_factory=AsyncMemoryStorage[int])
+
+    @override
+    async def read(self: Self, key: int) -> Rate:
+        """Read the rate of the key from the wrapped storage."""
+        return await self.storage.read(key)
+
+    @override
+    async def write(self: Self, key: int, value: Rate) -> None:
+        """Write the rate of the key to the wrapped storage."""
+        await self.storage.write(key, value)
+
+
+async def bench_limiter(limiter: AsyncLeakyBucketLimiter[int]) -> float:
+    """Measure how many limit checks per second the limiter sustains."""
+    started_at = time.perf_counter()
+
+    for operation in range(OPERATIONS):
+        await limiter.limit_exceeded(operation % KEYS)
+
+    return OPERATIONS / (time.perf_counter() - started_at)
+
+
+async def bench_dict() -> float:
+    """Measure how many dictionary lookups per second a coroutine performs, as the reference."""
+    rates = dict.fromkeys(range(KEYS))
+    started_at = time.perf_counter()
+
+    for operation in range(OPERATIONS):
+        rates.get(operation % KEYS)
+
+    return OPERATIONS / (time.perf_counter() - started_at)
+
+
+async def bench() -> list[float]:
+    """Run the benchmarks of all the paths."""
+    nowait = AsyncLeakyBucketLimiter[int](rate_limit=RATE_LIMIT, rate_storage=AsyncMemoryStorage())
+    locked = AsyncLeakyBucketLimiter[int](
+        rate_limit=RATE_LIMIT,
+        rate_storage=PlainStorage(),
+        key_mutex=AsyncMemoryMutex(),
+    )
+
+    return [await bench_dict(), await bench_limiter(nowait), await bench_limiter(locked)]
+
+
+async def bench_latency(storage: AtomicRateStorage[str], max_batch: int) -> tuple[float, float, float]:
+    """Measure the p50 and p99 latencies in milliseconds and the checks per second of concurrent tasks."""
+    adapter = AsyncExecutorAtomicStorage[str](storage=storage, batcher=ExecutorBatcher(max_batch=max_batch))
+    limiter = AsyncLeakyBucketLimiter[str](rate_limit=RATE_LIMIT, rate_storage=adapter)
+    latencies: list[float] = []
+
+    async def check(key: str) -> None:
+        started_at = time.perf_counter()
+        await limiter.limit_exceeded(key)
+        latencies.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(check(f"client:{task % KEYS}") for task in range(TASKS)))
+    elapsed = time.perf_counter() - started_at
+
+    adapter.close()
+    percentiles = statistics.quantiles(latencies, n=100)
+
+    return percentiles[49] * 1000, percentiles[98] * 1000, TASKS / elapsed
+
+
+def main() -> None:
+    """Run the async benchmarks and report the limit checks per second and the latencies."""
+    report(("dict lookup", "nowait", "mutex"), [asyncio.run(bench())])
+
+    rows: list[tuple[object, ...]] = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        for max_batch, batching in ((256, "batched"), (1, "per call")):
+            rows.append(("memory", batching, *asyncio.run(bench_latency(MemoryStorage[str](), max_batch))))
+
+            sqlite = SQLiteStorage(path=str(Path(directory) / f"{max_batch}.db"))
+            rows.append(("sqlite", batching, *asyncio.run(bench_latency(sqlite, max_batch))))
+            sqlite.close()
+
+    report(("storage", "hops", "p50 ms", "p99 ms", "checks/s"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Minimal harness for multi-threaded throughput benchmarks."""
+from __future__ import annotations
+
+import sys
+import time
+from threading import Barrier, Thread
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+
+def measure_threads(threads: int, operations: int, worker: Callable[[int, int], None]) -> float:
+    """Run `worker(thread_index, operations)` in the given number of threads and measure the total throughput.
+
+    All the threads are released at the same time, so the measured time covers only the contended section.
+
+    Args:
+    ----
+    threads (int): The number of threads running the worker.
+    operations (int): The number of operations performed by each worker.
+    worker (Callable[[int, int], None]): The function performing the operations.
+
+    Returns:
+    -------
+    float: The number of operations per second performed by all the threads together.
+    """
+    barrier = Barrier(threads + 1)
+
+    def run(index: int) -> None:
+        barrier.wait()
+        worker(index, operations)
+
+    pool = [Thread(target=run, args=(index,)) for index in range(threads)]
+
+    for thread in pool:
+        thread.start()
+
+    barrier.wait()
+    started_at = time.perf_counter()
+
+    for thread in pool:
+        thread.join()
+
+    return threads * operations / (time.perf_counter() - started_at)
+
+
+def report(header: Sequence[str], rows: Sequence[Sequence[object]]) -> None:
+    """Write the benchmark results as an aligned table to the standard output."""
+    cells = [
+        list(map(str, header)),
+        *([f"{cell:,.0f}" if isinstance(cell, float) else str(cell) for cell in row] for row in rows),
+    ]
+    widths = [max(len(row[column]) for row in cells) for column in range(len(header))]
+
+    for row in cells:
+        sys.stdout.write("  ".join(cell.rjust(width) for cell, width in zip(row, widths, strict=True)) + "\n")
@@ -0,0 +1,67 @@
+"""Throughput benchmarks comparing the limiting algorithms.
+
+Run with `python -m benchmarks.limiters`. Measures how many limit checks per second a single thread makes with
+`LeakyBucketLimiter`, `GCRALimiter` and `LeasingLimiter` over the same storages, with keys cycling over a fixed
+set.
+"""
+from __future__ import annotations
+
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from benchmarks.harness import report
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.gcra import GCRALimiter
+from leak_snek.limiters.leaky_bucket import LeakyBucketLimiter
+from leak_snek.limiters.leasing import LeasingLimiter
+from leak_snek.storages.memory_storage import MemoryStorage
+from leak_snek.storages.shared_memory_storage import SharedMemoryStorage
+from leak_snek.storages.sqlite_storage import SQLiteStorage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from leak_snek.interfaces.limiters.rate_limiter import RateLimiter
+    from leak_snek.interfaces.storages.atomic_rate_store import AtomicRateStorage
+
+OPERATIONS = 200_000
+KEYS = tuple(f"client:{key}" for key in range(1024))
+RATE_LIMIT = RateLimit(operations=100, period=timedelta(seconds=1))
+
+LIMITERS: dict[str, Callable[[AtomicRateStorage[str]], RateLimiter[str]]] = {
+    "leaky bucket": lambda storage: LeakyBucketLimiter[str](rate_limit=RATE_LIMIT, rate_storage=storage),
+    "gcra": lambda storage: GCRALimiter[str](rate_limit=RATE_LIMIT, rate_storage=storage),
+    "leasing": lambda storage: LeasingLimiter[str](rate_limit=RATE_LIMIT, rate_storage=storage),
+}
+
+
+def bench(limiter: RateLimiter[str]) -> float:
+    """Measure how many limit checks per second the limiter sustains."""
+    started_at = time.perf_counter()
+
+    for operation in range(OPERATIONS):
+        limiter.limit_exceeded(KEYS[operation % len(KEYS)])
+
+    return OPERATIONS / (time.perf_counter() - started_at)
+
+
+def main() -> None:
+    """Run the limiter benchmarks and report the limit checks per second."""
+    with tempfile.TemporaryDirectory() as directory:
+        storages: dict[str, Callable[[], AtomicRateStorage[str]]] = {
+            "memory": MemoryStorage[str],
+            "shared-memory": lambda: SharedMemoryStorage(path=str(Path(directory) / f"{time.monotonic_ns()}")),
+            "sqlite": lambda: SQLiteStorage(path=str(Path(directory) / f"{time.monotonic_ns()}.db")),
+        }
+        rows = [
+            (name, *(bench(limiter(storage())) for limiter in LIMITERS.values())) for name, storage in storages.items()
+        ]
+
+    report(("storage", *LIMITERS), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Contention benchmarks for the in-memory mutexes.
+
+Run with `python -m benchmarks.mutexes`.
+"""
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Callable, Generator, Hashable
+from contextlib import contextmanager
+from threading import Lock
+from typing import Generic, Self, TypeVar, final, override
+
+from benchmarks.harness import measure_threads, report
+from leak_snek.interfaces.mutexes.mutex import Mutex
+from leak_snek.mutexes.memory_mutex import LockInterface, MemoryMutex
+from leak_snek.mutexes.striped_mutex import StripedMutex
+
+T_contra = TypeVar("T_contra", contravariant=True, bound=Hashable)
+L = TypeVar("L", bound=LockInterface)
+
+THREADS = (1, 2, 4, 8)
+OPERATIONS = 50_000
+
+
+@final
+@dataclasses.dataclass
+class LeakingMemoryMutex(Mutex[T_contra], Generic[T_contra, L]):
+    """`MemoryMutex` as it was before key locks were reference-counted, kept as the comparison baseline."""
+
+    local_lock: L
+    lock_factory: Callable[[], L]
+    key_locks: dict[T_contra, L] = dataclasses.field(default_factory=dict)
+
+    @override
+    @contextmanager
+    def lock(self: Self, key: T_contra) -> Generator[None, None, None]:
+        """Lock the access to the given key, never removing the key lock afterwards."""
+        with self.local_lock:
+            key_lock = self.key_locks.get(key)
+
+            if key_lock is None:
+                key_lock = self.lock_factory()
+
+                self.key_locks[key] = key_lock
+
+        with key_lock:
+            yield
+
+
+MUTEXES: dict[str, Callable[[], Mutex[str]]] = {
+    "leaking": lambda: LeakingMemoryMutex[str, Lock](local_lock=Lock(), lock_factory=Lock),
+    "memory": lambda: MemoryMutex[str, Lock](local_lock=Lock(), lock_factory=Lock),
+    "striped": lambda: StripedMutex[str, Lock](lock_factory=Lock),
+}
+
+KEYS: dict[str, Callable[[int, int], str]] = {
+    "hot": lambda _thread, _operation: "hot",
+    "per-thread": lambda thread, _operation: str(thread),
+    "unique": lambda thread, operation: f"{thread}:{operation}",
+}
+
+
+def bench(mutex: Mutex[str], threads: int, key: Callable[[int, int], str]) -> float:
+    """Measure how many lock acquisitions per second the mutex sustains."""
+    keys = [[key(thread, operation) for operation in range(OPERATIONS)] for thread in range(threads)]
+
+    def worker(thread: int, _operations: int) -> None:
+        for thread_key in keys[thread]:
+            with mutex.lock(thread_key):
+                pass
+
+    return measure_threads(threads, OPERATIONS, worker)
+
+
+def main() -> None:
+    """Run the mutex benchmarks and report the acquisitions per second."""
+    rows = [
+        (keys, threads, *(bench(factory(), threads, KEYS[keys]) for factory in MUTEXES.values()))
+        for keys in KEYS
+        for threads in THREADS
+    ]
+
+    report(("keys", "threads", *MUTEXES), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Snapshot benchmarks for the in-memory storage.
+
+Run with `python -m benchmarks.snapshot`. Reports how many milliseconds it takes to dump and to load a snapshot of
+a `MemoryStorage` holding string keys, and how many bytes the snapshot takes per key.
+"""
+from __future__ import annotations
+
+import time
+from io import BytesIO
+
+from benchmarks.harness import report
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.storages.memory_storage import MemoryStorage
+
+KEYS = (10_000, 100_000, 1_000_000)
+
+
+def bench(keys: int) -> tuple[int, float, float, float]:
+    """Measure the milliseconds to dump and load a snapshot of the storage holding the keys, and its bytes per key."""
+    storage = MemoryStorage[str]()
+
+    for key in range(keys):
+        storage.write(f"client:{key}", Rate(operations=1, updated_at=time.monotonic()))
+
+    snapshot = BytesIO()
+
+    started_at = time.perf_counter()
+    storage.dump(snapshot)
+    dumped_at = time.perf_counter()
+
+    snapshot.seek(0)
+    MemoryStorage[str].load(snapshot)
+    loaded_at = time.perf_counter()
+
+    return keys, (dumped_at - started_at) * 1000, (loaded_at - dumped_at) * 1000, len(snapshot.getvalue()) / keys
+
+
+def main() -> None:
+    """Run the snapshot benchmarks and report the dump and load times and the snapshot size."""
+    report(("keys", "dump ms", "load ms", "bytes/key"), [bench(keys) for keys in KEYS])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Throughput and memory benchmarks for the in-memory storages.
+
+Run with `python -m benchmarks.storages`. Throughput is measured with a multi-threaded `LeakyBucketLimiter` and only
+scales with threads on free-threaded Python builds, with the GIL enabled it shows the per-check overhead of each
+storage. The shared memory storage keeps its table in a file mapped into memory, in a temporary directory under
+`/dev/shm` when available, and the SQLite storage keeps its database in a regular temporary directory. Both are left
+out of the memory measurement as they keep the rates off the heap.
+Memory is measured with `tracemalloc` for string keys, including the key objects retained by the storage.
+"""
+from __future__ import annotations
+
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Hashable
+from datetime import timedelta
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from benchmarks.harness import measure_threads, report
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.leaky_bucket import LeakyBucketLimiter
+from leak_snek.mutexes.striped_mutex import StripedMutex
+from leak_snek.storages.columnar_storage import ColumnarStorage
+from leak_snek.storages.memory_storage import MemoryStorage
+from leak_snek.storages.sharded_memory_storage import ShardedMemoryStorage
+from leak_snek.storages.shared_memory_storage import SharedMemoryStorage
+from leak_snek.storages.sqlite_storage import SQLiteStorage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from leak_snek.interfaces.storages.rate_store import RateStorage
+
+THREADS = (1, 2, 4, 8)
+OPERATIONS = 50_000
+KEYS = tuple(f"client:{key}" for key in range(1024))
+MEMORY_KEYS = 100_000
+RATE_LIMIT = RateLimit(operations=1_000_000, period=timedelta(seconds=1))
+
+SHM = Path("/dev/shm")  # noqa: S108 - the directory is only the parent of a private temporary directory
+
+STORAGES: dict[str, Callable[[], RateStorage[str]]] = {
+    "memory": MemoryStorage[Hashable],
+    "sharded": ShardedMemoryStorage[Hashable],
+    "columnar": ColumnarStorage[Hashable],
+    "columnar-hashed": lambda: ColumnarStorage[Hashable](hash_keys=True),
+}
+
+
+def bench(storage: RateStorage[str], threads: int) -> float:
+    """Measure how many limit checks per second a leaky bucket limiter sustains over the storage."""
+    limiter = LeakyBucketLimiter[str](
+        rate_limit=RATE_LIMIT,
+        rate_storage=storage,
+        key_mutex=StripedMutex[str, Lock](lock_factory=Lock),
+    )
+
+    def worker(thread: int, operations: int) -> None:
+        for operation in range(operations):
+            limiter.limit_exceeded(KEYS[(thread * operations + operation) % len(KEYS)])
+
+    return measure_threads(threads, OPERATIONS, worker)
+
+
+def bench_memory(factory: Callable[[], RateStorage[str]]) -> float:
+    """Measure how many bytes the storage takes per stored key."""
+    tracemalloc.start()
+
+    storage = factory()
+
+    for key in range(MEMORY_KEYS):
+        storage.write(f"client:{key}", Rate(operations=1, updated_at=time.monotonic()))
+
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return allocated / MEMORY_KEYS
+
+
+def main() -> None:
+    """Run the storage benchmarks and report the limit checks per second and the bytes per key."""
+    with (
+        tempfile.TemporaryDirectory(dir=SHM if SHM.is_dir() else None) as shm_directory,
+        tempfile.TemporaryDirectory() as directory,
+    ):
+        files: dict[str, Callable[[], RateStorage[str]]] = {
+            "shared-memory": lambda: SharedMemoryStorage(path=str(Path(shm_directory) / f"{time.monotonic_ns()}")),
+            "sqlite": lambda: SQLiteStorage(path=str(Path(directory) / f"{time.monotonic_ns()}.db")),
+        }
+        rows = [
+            (threads, *(bench(factory(), threads) for factory in (STORAGES | files).values())) for threads in THREADS
+        ]
+
+    report(("threads", *STORAGES, *files), rows)
+    report(("keys", *STORAGES), [(MEMORY_KEYS, *map(bench_memory, STORAGES.values()))])
+
+
+if __name__ == "__main__":
+    main()
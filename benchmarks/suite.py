@@ -0,0 +1,403 @@
+"""Reproducible benchmark suite for the sync and async limiters, comparable between commits.
+
+Run with `make bench` or `python -m benchmarks.suite`. Every limiter is measured over a matrix of configurations:
+the number of tracked keys, from 1 to 10M, prefilled before measuring, the number of threads, or of tasks for async
+limiters, checking the limits concurrently, and the skew of the keys, uniform or with 90% of the checks made for 10
+hot keys. Every configuration reports the limit checks per second and the p50 and p99 latencies of single checks,
+timed with `perf_counter_ns` around every call. The memory per tracked key of every limiter is measured with
+`tracemalloc` while filling it with keys.
+
+The keys are drawn from a seeded generator, so every run makes the same checks. The results are written as JSON to
+`benchmarks/results/<commit>.json`, and `--compare` reports the ratios against the results of another run. The full
+matrix keeps up to 10M keys in memory, which takes several gigabytes, `--quick` (`make bench BENCH_ARGS=--quick`) stops
+at 100k keys and 4 threads.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import gc
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Self, final, override
+
+from benchmarks.harness import measure_threads, report
+from leak_snek.interfaces.storages.aio.rate_store import AsyncRateStorage
+from leak_snek.interfaces.storages.rate_store import RateStorage
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.aio.leaky_bucket import AsyncLeakyBucketLimiter
+from leak_snek.limiters.gcra import GCRALimiter
+from leak_snek.limiters.leaky_bucket import LeakyBucketLimiter
+from leak_snek.limiters.memory_leaky_bucket import MemoryLeakyBucketLimiter
+from leak_snek.mutexes.aio.memory_mutex import AsyncMemoryMutex
+from leak_snek.mutexes.memory_mutex import MemoryMutex
+from leak_snek.observers.metrics_observer import MetricsObserver
+from leak_snek.storages.aio.memory_storage import AsyncMemoryStorage
+from leak_snek.storages.memory_storage import MemoryStorage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from leak_snek.interfaces.limiters.aio.rate_limiter import AsyncRateLimiter
+    from leak_snek.interfaces.limiters.rate_limiter import RateLimiter
+
+RESULTS = Path(__file__).parent / "results"
+RATE_LIMIT = RateLimit(operations=1_000_000, period=timedelta(seconds=1))
+SEED = 20231017
+HOT_KEYS = 10
+SKEWS = {"uniform": 0.0, "hot": 0.9}
+
+
+@final
+@dataclasses.dataclass(frozen=True)
+class Matrix:
+    """The configurations the limiters are measured with."""
+
+    keys: tuple[int, ...] = (1, 1_000, 100_000, 1_000_000, 10_000_000)
+    threads: tuple[int, ...] = (1, 2, 4, 8)
+    thread_keys: int = 1_000
+    operations: int = 100_000
+    memory_keys: int = 100_000
+
+
+QUICK = Matrix(keys=(1, 1_000, 100_000), threads=(1, 4), operations=20_000, memory_keys=10_000)
+
+
+@final
+@dataclasses.dataclass(frozen=True)
+class Result:
+    """The measurements of a limiter in a configuration."""
+
+    limiter: str
+    keys: int
+    concurrency: int
+    skew: str
+    checks_per_second: float
+    p50_ns: float
+    p99_ns: float
+
+
+@final
+@dataclasses.dataclass
+class PlainStorage(RateStorage[int]):
+    """In-memory storage exposing only reads and writes, so limiters have to lock the keys with a mutex."""
+
+    rates: dict[int, Rate] = dataclasses.field(default_factory=dict)
+
+    @override
+    def read(self: Self, key: int) -> Rate:
+        """Read the rate of the key."""
+        return self.rates.get(key) or Rate.default()
+
+    @override
+    def write(self: Self, key: int, value: Rate) -> None:
+        """Write the rate of the key."""
+        self.rates[key] = value
+
+
+@final
+@dataclasses.dataclass
+class AsyncPlainStorage(AsyncRateStorage[int]):
+    """Async in-memory storage exposing only reads and writes, so limiters have to lock the keys with a mutex."""
+
+    rates: dict[int, Rate] = dataclasses.field(default_factory=dict)
+
+    @override
+    async def read(self: Self, key: int) -> Rate:
+        """Read the rate of the key."""
+        return self.rates.get(key) or Rate.default()
+
+    @override
+    async def write(self: Self, key: int, value: Rate) -> None:
+        """Write the rate of the key."""
+        self.rates[key] = value
+
+
+SYNC_LIMITERS: dict[str, Callable[[], RateLimiter[int]]] = {
+    "leaky bucket": lambda: LeakyBucketLimiter[int](rate_limit=RATE_LIMIT, rate_storage=MemoryStorage()),
+    "leaky bucket + mutex": lambda: LeakyBucketLimiter[int](
+        rate_limit=RATE_LIMIT,
+        rate_storage=PlainStorage(),
+        key_mutex=MemoryMutex(local_lock=Lock(), lock_factory=Lock),
+    ),
+    "leaky bucket + metrics": lambda: LeakyBucketLimiter[int](
+        rate_limit=RATE_LIMIT,
+        rate_storage=MemoryStorage(),
+        observer=MetricsObserver(),
+    ),
+    "memory leaky bucket": lambda: MemoryLeakyBucketLimiter[int](rate_limit=RATE_LIMIT),
+    "gcra": lambda: GCRALimiter[int](rate_limit=RATE_LIMIT, rate_storage=MemoryStorage()),
+}
+ASYNC_LIMITERS: dict[str, Callable[[], AsyncRateLimiter[int]]] = {
+    "async leaky bucket": lambda: AsyncLeakyBucketLimiter[int](
+        rate_limit=RATE_LIMIT,
+        rate_storage=AsyncMemoryStorage(),
+    ),
+    "async leaky bucket + metrics": lambda: AsyncLeakyBucketLimiter[int](
+        rate_limit=RATE_LIMIT,
+        rate_storage=AsyncMemoryStorage(),
+        observer=MetricsObserver(),
+    ),
+    "async leaky bucket + mutex": lambda: AsyncLeakyBucketLimiter[int](
+        rate_limit=RATE_LIMIT,
+        rate_storage=AsyncPlainStorage(),
+        key_mutex=AsyncMemoryMutex(),
+    ),
+}
+
+
+def accesses(keys: int, skew: str, operations: int) -> list[int]:
+    """Draw the keys of the checks, sending the skewed share of them to the hot keys."""
+    generator = random.Random(f"{SEED}:{keys}:{skew}")
+    hot_keys = min(keys, HOT_KEYS)
+    hot_share = SKEWS[skew]
+
+    return [
+        generator.randrange(hot_keys) if generator.random() < hot_share else generator.randrange(keys)
+        for _ in range(operations)
+    ]
+
+
+def summarize(limiter: str, configuration: tuple[int, int, str], rate: float, latencies: list[int]) -> Result:
+    """Compute the percentiles of the latencies of a configuration."""
+    keys, concurrency, skew = configuration
+    percentiles = statistics.quantiles(latencies, n=100)
+
+    return Result(limiter, keys, concurrency, skew, rate, percentiles[49], percentiles[98])
+
+
+def bench_sync(limiter: RateLimiter[int], keys: list[int], threads: int) -> tuple[float, list[int]]:
+    """Measure the checks per second and the latencies of threads checking the keys concurrently."""
+    latencies: list[list[int]] = [[] for _ in range(threads)]
+    share = len(keys) // threads
+
+    def worker(index: int, operations: int) -> None:
+        record = latencies[index].append
+        limit_exceeded = limiter.limit_exceeded
+        clock = time.perf_counter_ns
+
+        for key in keys[index * share : index * share + operations]:
+            started_at = clock()
+            limit_exceeded(key)
+            record(clock() - started_at)
+
+    rate = measure_threads(threads, share, worker)
+
+    return rate, [latency for thread_latencies in latencies for latency in thread_latencies]
+
+
+async def bench_async(limiter: AsyncRateLimiter[int], keys: list[int], tasks: int) -> tuple[float, list[int]]:
+    """Measure the checks per second and the latencies of tasks checking the keys concurrently."""
+    latencies: list[int] = []
+    share = len(keys) // tasks
+
+    async def worker(index: int) -> None:
+        record = latencies.append
+        limit_exceeded = limiter.limit_exceeded
+        clock = time.perf_counter_ns
+
+        for key in keys[index * share : (index + 1) * share]:
+            started_at = clock()
+            await limit_exceeded(key)
+            record(clock() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(tasks)))
+
+    return tasks * share / (time.perf_counter() - started_at), latencies
+
+
+def configurations(matrix: Matrix) -> dict[int, list[tuple[int, str]]]:
+    """Group the concurrency and skew configurations by the number of keys they are measured with."""
+    grouped: dict[int, list[tuple[int, str]]] = {keys: [] for keys in sorted({*matrix.keys, matrix.thread_keys})}
+
+    for keys in grouped:
+        # Both skews are the same when there are no more keys than hot keys
+        skews = [skew for skew in SKEWS if keys > HOT_KEYS or not SKEWS[skew]]
+        threads = matrix.threads if keys == matrix.thread_keys else (1,)
+
+        grouped[keys] = [(concurrency, skew) for concurrency in threads for skew in skews]
+
+    return grouped
+
+
+def run_sync(matrix: Matrix) -> list[Result]:
+    """Measure the sync limiters in all the configurations, filling every limiter with the keys first."""
+    results = []
+
+    for keys, grouped in configurations(matrix).items():
+        for name, factory in SYNC_LIMITERS.items():
+            limiter = factory()
+            fill(limiter, keys)
+
+            for concurrency, skew in grouped:
+                rate, latencies = bench_sync(limiter, accesses(keys, skew, matrix.operations), concurrency)
+                results.append(summarize(name, (keys, concurrency, skew), rate, latencies))
+
+            del limiter
+            gc.collect()
+
+    return results
+
+
+async def run_async(matrix: Matrix) -> list[Result]:
+    """Measure the async limiters in all the configurations, filling every limiter with the keys first."""
+    results = []
+
+    for keys, grouped in configurations(matrix).items():
+        for name, factory in ASYNC_LIMITERS.items():
+            limiter = factory()
+            await fill_async(limiter, keys)
+
+            for concurrency, skew in grouped:
+                rate, latencies = await bench_async(limiter, accesses(keys, skew, matrix.operations), concurrency)
+                results.append(summarize(name, (keys, concurrency, skew), rate, latencies))
+
+            del limiter
+            gc.collect()
+
+    return results
+
+
+def fill(limiter: RateLimiter[int], keys: int) -> None:
+    """Check the limit once for every key, so the limiter tracks all of them."""
+    for key in range(keys):
+        limiter.limit_exceeded(key)
+
+
+async def fill_async(limiter: AsyncRateLimiter[int], keys: int) -> None:
+    """Check the limit once for every key, so the async limiter tracks all of them."""
+    for key in range(keys):
+        await limiter.limit_exceeded(key)
+
+
+def memory_per_key(fill: Callable[[], None]) -> int:
+    """Measure the bytes allocated while filling a limiter with keys."""
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        fill()
+
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def run_memory(matrix: Matrix) -> dict[str, float]:
+    """Measure the memory per tracked key of all the limiters."""
+    memory = {}
+
+    for name, factory in SYNC_LIMITERS.items():
+        memory[name] = memory_per_key(partial(fill, factory(), matrix.memory_keys)) / matrix.memory_keys
+
+    for name, async_factory in ASYNC_LIMITERS.items():
+        # The limiter is referenced here, as the coroutine releases it once done
+        async_limiter = async_factory()
+        coroutine = fill_async(async_limiter, matrix.memory_keys)
+        memory[name] = memory_per_key(partial(asyncio.run, coroutine)) / matrix.memory_keys
+
+    return memory
+
+
+def commit() -> str:
+    """Get the short hash of the checked out commit, or "unknown" outside of a git checkout."""
+    try:
+        # The command is fixed, git is looked up in PATH on purpose
+        command = ["git", "rev-parse", "--short", "HEAD"]
+        output = subprocess.run(command, capture_output=True, check=True, text=True)  # noqa: S603 - fixed command
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+    return output.stdout.strip()
+
+
+def compare(results: list[Result], baseline: dict[str, Any]) -> None:
+    """Report the ratios of the checks per second and the p99 latencies against the results of another run."""
+    previous = {
+        (result["limiter"], result["keys"], result["concurrency"], result["skew"]): result
+        for result in baseline["results"]
+    }
+    rows = []
+
+    for result in results:
+        old = previous.get((result.limiter, result.keys, result.concurrency, result.skew))
+
+        if old is not None:
+            rows.append(
+                (
+                    result.limiter,
+                    str(result.keys),
+                    str(result.concurrency),
+                    result.skew,
+                    f"{result.checks_per_second / old['checks_per_second']:.2f}x",
+                    f"{result.p99_ns / old['p99_ns']:.2f}x",
+                ),
+            )
+
+    sys.stdout.write(f"\ncompared with {baseline['commit']}\n")
+    report(("limiter", "keys", "concurrency", "skew", "checks/s", "p99"), rows)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Run the benchmark suite, write the results as JSON and report them."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="measure up to 100k keys and 4 threads")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="the JSON file to write, benchmarks/results/<commit>.json by default",
+    )
+    parser.add_argument("--compare", type=Path, help="the JSON file of another run to compare the results with")
+    arguments = parser.parse_args(argv)
+
+    matrix = QUICK if arguments.quick else Matrix()
+    results = run_sync(matrix) + asyncio.run(run_async(matrix))
+    memory = run_memory(matrix)
+
+    revision = commit()
+    output = arguments.output or RESULTS / f"{revision}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "commit": revision,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "matrix": dataclasses.asdict(matrix),
+                "results": [dataclasses.asdict(result) for result in results],
+                "bytes_per_key": memory,
+            },
+            indent=2,
+        ),
+    )
+
+    report(
+        ("limiter", "keys", "concurrency", "skew", "checks/s", "p50 ns", "p99 ns"),
+        [
+            (result.limiter, result.keys, result.concurrency, result.skew, *dataclasses.astuple(result)[4:])
+            for result in results
+        ],
+    )
+    sys.stdout.write("\n")
+    report(("limiter", "bytes/key"), list(memory.items()))
+    sys.stdout.write(f"\nresults written to {output}\n")
+
+    if arguments.compare is not None:
+        compare(results, json.loads(arguments.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""The implementation of a clock caching the time, refreshed by the event loop."""
+import asyncio
+import dataclasses
+import time
+from typing import Self, final, override
+
+from leak_snek.interfaces.clocks.clock import Clock
+
+
+@final
+@dataclasses.dataclass
+class AsyncCoarseClock(Clock):
+    """A clock returning a cached `time.monotonic` timestamp refreshed by a callback of the running event loop.
+
+    Reading the clock only reads an attribute, which takes the system clock call off the path of every check, without
+    a background thread. The refresh is a callback scheduled every `resolution` seconds, so it runs at most once per
+    iteration of the loop and all the checks made by the coroutines of an iteration see the same time. The time lags
+    behind `time.monotonic` by up to `resolution` seconds, plus however long the loop is blocked, so buckets leak that
+    much later and rate limiters are slightly stricter than their limits, never looser.
+
+    The clock must be created from a coroutine, as the refresh is scheduled on the running loop. Call `close` to
+    cancel it on shutdown, the clock then keeps returning the last time it read.
+
+    Attributes
+    ----------
+        resolution (float): The number of seconds between refreshes of the time.
+
+    Methods
+    -------
+        monotonic: Returns the cached time.
+        close: Cancels the refresh.
+    """
+
+    resolution: float = 0.001
+    _now: float = dataclasses.field(default_factory=time.monotonic, init=False, repr=False)
+    _loop: asyncio.AbstractEventLoop = dataclasses.field(init=False, repr=False)
+    _handle: asyncio.TimerHandle = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Schedule the first refresh of the time on the running loop."""
+        if self.resolution <= 0:
+            msg = "resolution must be positive."
+            raise ValueError(msg)
+
+        self._loop = asyncio.get_running_loop()
+        self._handle = self._loop.call_later(self.resolution, self._refresh)
+
+    @override
+    def monotonic(self: Self) -> float:
+        """Return the time of the last refresh.
+
+        Returns
+        -------
+        float: The cached time in seconds, never lower than a previously returned one.
+        """
+        return self._now
+
+    def close(self: Self) -> None:
+        """Cancel the refresh of the time."""
+        self._handle.cancel()
+
+    def _refresh(self: Self) -> None:
+        """Refresh the time and schedule the next refresh."""
+        self._now = time.monotonic()
+        self._handle = self._loop.call_later(self.resolution, self._refresh)
@@ -0,0 +1,64 @@
+"""The implementation of a clock caching the time, refreshed by a background thread."""
+import dataclasses
+import threading
+import time
+from typing import Self, final, override
+
+from leak_snek.interfaces.clocks.clock import Clock
+
+
+@final
+@dataclasses.dataclass
+class CoarseClock(Clock):
+    """A clock returning a cached `time.monotonic` timestamp refreshed by a background thread.
+
+    Reading the clock only reads an attribute, which takes the system clock call off the path of every check. In
+    exchange the time lags behind `time.monotonic` by up to `resolution` seconds, so buckets leak that much later and
+    rate limiters are slightly stricter than their limits, never looser.
+
+    The background thread refreshes the time every `resolution` seconds until the clock is closed. Call `close` to
+    stop it on shutdown, the clock then keeps returning the last time it read.
+
+    Attributes
+    ----------
+        resolution (float): The number of seconds between refreshes of the time.
+
+    Methods
+    -------
+        monotonic: Returns the cached time.
+        close: Stops the background thread.
+    """
+
+    resolution: float = 0.001
+    _now: float = dataclasses.field(default_factory=time.monotonic, init=False, repr=False)
+    _closed: threading.Event = dataclasses.field(default_factory=threading.Event, init=False, repr=False)
+    _thread: threading.Thread = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Start the background thread refreshing the time."""
+        if self.resolution <= 0:
+            msg = "resolution must be positive."
+            raise ValueError(msg)
+
+        self._thread = threading.Thread(target=self._run, name="leak-snek-coarse-clock", daemon=True)
+        self._thread.start()
+
+    @override
+    def monotonic(self: Self) -> float:
+        """Return the time of the last refresh.
+
+        Returns
+        -------
+        float: The cached time in seconds, never lower than a previously returned one.
+        """
+        return self._now
+
+    def close(self: Self) -> None:
+        """Stop the background thread refreshing the time."""
+        self._closed.set()
+        self._thread.join()
+
+    def _run(self: Self) -> None:
+        """Refresh the time every resolution until closed."""
+        while not self._closed.wait(self.resolution):
+            self._now = time.monotonic()
@@ -8,6 +8,8 @@ if TYPE_CHECKING:
     from collections.abc import Awaitable, Callable
 
     from leak_snek.interfaces.limiters.aio.rate_limiter import AsyncRateLimiter
+    from leak_snek.interfaces.limiters.aio.waiting_rate_limiter import AsyncWaitingRateLimiter
+    from leak_snek.interfaces.observers.observer import Observer
 
 T = TypeVar("T")
 K = TypeVar("K")
@@ -18,13 +20,76 @@ def async_rate_limit(
     rate_limiter: AsyncRateLimiter[K],
     key: Callable[P, K],
     default: T,
+    cost: Callable[P, int] | None = None,
+    observer: Observer[K] | None = None,
 ) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
-    """Decorate the function, rate limiting it's execution using given rate limiter."""
+    """Decorate the function, rate limiting it's execution using given rate limiter.
+
+    Each call costs the number of operations returned by `cost` for the call arguments, or a single one without
+    `cost`, in which case the rate limiter is only passed the key.
+    The observer, if any, receives whether every call was allowed, unless it is the observer of the rate limiter too,
+    which already receives the decisions of its checks, so they are never counted twice.
+    """
+    # Limiters sharing the observer already report their decisions to it
+    decision_observer = None if observer is getattr(rate_limiter, "observer", None) else observer
+
+    def decorator(function: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        @wraps(function)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            limited_key = key(*args, **kwargs)
+
+            if cost is None:
+                # Limiters implementing checks without a cost are still supported when no cost is given
+                exceeded = await rate_limiter.limit_exceeded(limited_key)
+            else:
+                exceeded = await rate_limiter.limit_exceeded(limited_key, cost(*args, **kwargs))
+
+            if decision_observer is not None:
+                decision_observer.decided(limited_key, allowed=not exceeded)
+
+            if exceeded:
+                return default
+
+            return await function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def async_waiting_rate_limit(  # noqa: PLR0913 - timeout, cost and observer are optional
+    rate_limiter: AsyncWaitingRateLimiter[K],
+    key: Callable[P, K],
+    default: T,
+    timeout: float | None = None,
+    cost: Callable[P, int] | None = None,
+    observer: Observer[K] | None = None,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """Decorate the function, waiting for given rate limiter to allow it's execution.
+
+    Each call costs the number of operations returned by `cost` for the call arguments, or a single one without
+    `cost`, in which case the rate limiter is only passed the key.
+    The observer, if any, receives whether every call was allowed, unless it is the observer of the rate limiter too,
+    which already receives the decisions of its checks, so they are never counted twice.
+    The default is only returned when the execution wouldn't be allowed within the timeout.
+    """
+    # Limiters sharing the observer already report their decisions to it
+    decision_observer = None if observer is getattr(rate_limiter, "observer", None) else observer
 
     def decorator(function: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
         @wraps(function)
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-            if await rate_limiter.limit_exceeded(key(*args, **kwargs)):
+            limited_key = key(*args, **kwargs)
+
+            if cost is None:
+                acquired = await rate_limiter.acquire(limited_key, timeout)
+            else:
+                acquired = await rate_limiter.acquire(limited_key, timeout, cost(*args, **kwargs))
+
+            if decision_observer is not None:
+                decision_observer.decided(limited_key, allowed=acquired)
+
+            if not acquired:
                 return default
 
             return await function(*args, **kwargs)
@@ -0,0 +1 @@
+"""Clock interfaces."""
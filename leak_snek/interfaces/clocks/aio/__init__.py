@@ -0,0 +1 @@
+"""Async clock interfaces."""
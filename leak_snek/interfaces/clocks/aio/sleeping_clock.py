@@ -0,0 +1,28 @@
+"""Module providing the interface of a clock the coroutines waiting for rate limiters sleep with."""
+from typing import Protocol, Self, runtime_checkable
+
+from leak_snek.interfaces.clocks.clock import Clock
+
+
+@runtime_checkable
+class AsyncSleepingClock(Clock, Protocol):
+    """Clock telling the time rate limiters leak their buckets with, and sleeping in that time without blocking.
+
+    Async rate limiters detect clocks implementing this protocol and sleep with them while waiting for their buckets
+    to leak, like `SleepingClock` for threads. The method is named `async_sleep` so a clock can implement both
+    protocols. Limiters sleep with `asyncio.sleep` for other clocks, which must follow real time.
+
+    Methods
+    -------
+    - monotonic: Return the current time.
+    - async_sleep: Suspend the current coroutine until the time advanced by the given number of seconds.
+    """
+
+    async def async_sleep(self: Self, seconds: float) -> None:
+        """Suspend the current coroutine until the time advanced by the given number of seconds.
+
+        Args:
+        ----
+        seconds (float): The number of seconds to sleep for.
+        """
+        raise NotImplementedError
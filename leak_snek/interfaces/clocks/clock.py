@@ -0,0 +1,23 @@
+"""Module providing a clock interface telling the time rate limiters measure buckets with."""
+from typing import Protocol, Self
+
+
+class Clock(Protocol):
+    """Clock telling the time rate limiters leak their buckets with.
+
+    The time is in seconds from an arbitrary reference point, like `time.monotonic`, and must never go back. Rate
+    limiters read it on every check, so implementations should be quick and must not block.
+
+    Methods
+    -------
+    - monotonic: Return the current time.
+    """
+
+    def monotonic(self: Self) -> float:
+        """Return the current time in seconds.
+
+        Returns
+        -------
+        float: The current time, never lower than a previously returned one.
+        """
+        raise NotImplementedError
@@ -0,0 +1,28 @@
+"""Module providing the interface of a clock the threads waiting for rate limiters sleep with."""
+from typing import Protocol, Self, runtime_checkable
+
+from leak_snek.interfaces.clocks.clock import Clock
+
+
+@runtime_checkable
+class SleepingClock(Clock, Protocol):
+    """Clock telling the time rate limiters leak their buckets with, and sleeping in that time.
+
+    Rate limiters detect clocks implementing this protocol and sleep with them while waiting for their buckets to
+    leak, so a clock driven by virtual time, like a fake clock in tests, advances with the waits instead of the
+    waits passing in real time only. Limiters sleep with `time.sleep` for other clocks, which must follow real time.
+
+    Methods
+    -------
+    - monotonic: Return the current time.
+    - sleep: Block the current thread until the time advanced by the given number of seconds.
+    """
+
+    def sleep(self: Self, seconds: float) -> None:
+        """Block the current thread until the time advanced by the given number of seconds.
+
+        Args:
+        ----
+        seconds (float): The number of seconds to sleep for.
+        """
+        raise NotImplementedError
@@ -1,4 +1,5 @@
 """Module containing async rate limiter interface."""
+from collections.abc import Sequence
 from typing import Protocol, Self, TypeVar
 
 T_contra = TypeVar("T_contra", contravariant=True)
@@ -21,22 +22,44 @@ class AsyncRateLimiter(Protocol[T_contra]):
     -------
     limit_exceeded: Should be implemented by concrete classes to check
                       if the rate limit for a given key is exceeded.
+    limit_exceeded_many: Checks if the rate limit is exceeded for each of the given keys,
+                           may be overridden by concrete classes to check the keys in bulk.
 
     """
 
-    async def limit_exceeded(self: Self, key: T_contra) -> bool:
+    async def limit_exceeded(self: Self, key: T_contra, cost: int = 1) -> bool:
         """Determine if the rate limit for a specific key has been exceeded.
 
         Concrete implementations should provide logic to determine
-        if a rate limit corresponding to the provided key is exceeded or not.
+        if a rate limit corresponding to the provided key is exceeded or not,
+        consuming `cost` units of the limit at once if it isn't.
 
         Args:
         ----
         key (T_contra): The key (identifier) for which the rate limit
                           check needs to be performed.
+        cost (int): The number of operations the check accounts for, at least 1.
 
         Returns:
         -------
         - bool: True if the limit for the given key is exceeded, False otherwise.
         """
         raise NotImplementedError
+
+    async def limit_exceeded_many(self: Self, keys: Sequence[T_contra]) -> list[bool]:
+        """Determine if the rate limit has been exceeded for each of the given keys.
+
+        The keys are checked in order, so a key repeated in the sequence is charged once per occurrence.
+        By default the keys are checked one by one with `limit_exceeded`, concrete implementations may
+        override this method to check the whole batch at once.
+
+        Args:
+        ----
+        keys (Sequence[T_contra]): The keys (identifiers) for which the rate limit
+                                     check needs to be performed.
+
+        Returns:
+        -------
+        - list[bool]: For each key, True if the limit is exceeded, False otherwise.
+        """
+        return [await self.limit_exceeded(key) for key in keys]
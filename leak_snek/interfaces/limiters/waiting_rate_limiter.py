@@ -0,0 +1,44 @@
+"""Module containing the interface for rate limiting algorithms able to wait for the limit."""
+from typing import Protocol, Self, TypeVar
+
+from leak_snek.interfaces.limiters.rate_limiter import RateLimiter
+
+T_contra = TypeVar("T_contra", contravariant=True)
+
+
+class WaitingRateLimiter(RateLimiter[T_contra], Protocol[T_contra]):
+    """Protocol for rate limiting algorithms able to wait until an operation is allowed.
+
+    Algorithms knowing when the next operation of a key will be allowed implement this protocol, so callers
+    sleep exactly until then instead of polling `limit_exceeded` in a retry loop.
+
+    Type Params
+    -----------
+    T_contra: A contravariant type variable which denotes the type of
+                key for rate limiting checks.
+
+    Methods
+    -------
+    limit_exceeded: Should be implemented by concrete classes to check
+                      if the rate limit for a given key is exceeded.
+    acquire: Should be implemented by concrete classes to wait until
+               an operation is allowed for a given key.
+    """
+
+    def acquire(self: Self, key: T_contra, timeout: float | None = None, cost: int = 1) -> bool:
+        """Wait until an operation is allowed for the specific key and count it.
+
+        Concrete implementations should block the calling thread until the rate limit allows the operation,
+        without waiting if it is allowed right away, and give up if it wouldn't be allowed within the timeout.
+
+        Args:
+        ----
+        key (T_contra): The key (identifier) for which the operation is made.
+        timeout (float | None): The maximum number of seconds to wait, or None to wait as long as needed.
+        cost (int): The number of operations to wait for, at least 1.
+
+        Returns:
+        -------
+        - bool: True if the operation is allowed and counted, False if the timeout would elapse first.
+        """
+        raise NotImplementedError
@@ -0,0 +1,48 @@
+"""Module providing the interface of a mutex mapping keys onto a fixed pool of locks."""
+from contextlib import AbstractContextManager
+from typing import Any, Protocol, Self, TypeVar, runtime_checkable
+
+from leak_snek.interfaces.mutexes.mutex import Mutex
+
+T_contra = TypeVar("T_contra", contravariant=True)
+
+
+@runtime_checkable
+class StripingMutex(Mutex[T_contra], Protocol[T_contra]):
+    """Mutex guarding the keys with a fixed pool of locks, so distinct keys may share a lock.
+
+    Keys of the same stripe share a lock, which isn't reentrant in general, so holding the locks of two keys at once
+    may deadlock. Rate limiters locking several keys at once detect mutexes implementing this protocol and reject
+    them, while keys of distinct stripes never wait for each other.
+
+    Methods
+    -------
+    - lock: Return a context manager for accessing stored rates for a given key.
+    - stripe: Return the index of the lock guarding a given key.
+    """
+
+    def lock(self: Self, key: T_contra) -> AbstractContextManager[Any]:
+        """Obtain a context manager for safe access to stored rates for the specified key.
+
+        Args:
+        ----
+        key (T_contra): The key (identifier) for which the mutex should be locked.
+
+        Returns:
+        -------
+        AbstractContextManager[Any]: A context manager holding the lock of the stripe of the key.
+        """
+        raise NotImplementedError
+
+    def stripe(self: Self, key: T_contra) -> int:
+        """Get the index of the lock guarding the specified key.
+
+        Args:
+        ----
+        key (T_contra): The key whose stripe is returned.
+
+        Returns:
+        -------
+        int: The index of the lock, equal for all the keys sharing it.
+        """
+        raise NotImplementedError
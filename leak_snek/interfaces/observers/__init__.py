@@ -0,0 +1 @@
+"""Observer interfaces."""
@@ -0,0 +1,50 @@
+"""Module providing an observer interface receiving the events of rate limiting."""
+from typing import Protocol, Self, TypeVar
+
+T_contra = TypeVar("T_contra", contravariant=True)
+
+
+class Observer(Protocol[T_contra]):
+    """Observer of the decisions of a rate limiter and of the time it spends in mutexes and storages.
+
+    Rate limiters and decorators accepting an observer call it synchronously on every check, from the thread or the
+    coroutine making the check, so implementations should be quick and must not block. Durations are measured with
+    `time.perf_counter` and reported in seconds.
+
+    Methods
+    -------
+    - decided: Receive whether an operation was allowed for a key.
+    - lock_waited: Receive how long a check waited to lock a key.
+    - storage_called: Receive how long a storage call made by a check took.
+    """
+
+    def decided(self: Self, key: T_contra, *, allowed: bool) -> None:
+        """Receive whether an operation was allowed for the specified key.
+
+        Args:
+        ----
+        key (T_contra): The key the operation was checked for.
+        allowed (bool): True if the operation was allowed, False if the rate limit was exceeded.
+        """
+        raise NotImplementedError
+
+    def lock_waited(self: Self, key: T_contra, seconds: float) -> None:
+        """Receive how long a check waited to lock the specified key with the mutex.
+
+        Args:
+        ----
+        key (T_contra): The key that was locked.
+        seconds (float): The time it took to acquire the lock.
+        """
+        raise NotImplementedError
+
+    def storage_called(self: Self, key: T_contra, operation: str, seconds: float) -> None:
+        """Receive how long a storage call made for the specified key took.
+
+        Args:
+        ----
+        key (T_contra): The key the storage was called for.
+        operation (str): The storage method that was called: "read", "write", "update" or "update_nowait".
+        seconds (float): The time the call took.
+        """
+        raise NotImplementedError
@@ -0,0 +1,43 @@
+"""Module containing async interface for the access rate storing with updates that never suspend."""
+from collections.abc import Callable
+from typing import Protocol, Self, TypeVar, runtime_checkable
+
+from leak_snek.interfaces.storages.aio.atomic_rate_store import AsyncAtomicRateStorage
+from leak_snek.interfaces.values.rate import Rate
+
+T_contra = TypeVar("T_contra", contravariant=True)
+
+
+@runtime_checkable
+class AsyncNowaitRateStorage(AsyncAtomicRateStorage[T_contra], Protocol[T_contra]):
+    """Protocol defining async storage operations for access rate information kept by the event loop itself.
+
+    Storages implementing this protocol can update a rate without ever suspending the calling coroutine, like
+    in-memory storages used from a single event loop. Nothing else runs on the loop between reading and writing
+    the rate, so the update is atomic without any lock, and rate limiters detect these storages and call
+    `update_nowait` directly, skipping both the mutex and the awaiting of `update`.
+
+    Methods
+    -------
+    - read: Fetch the rate for a given key.
+    - write: Store or update the rate for a given key.
+    - update: Atomically replace the rate for a given key with the result of a function.
+    - update_nowait: Atomically replace the rate for a given key with the result of a function, without suspending.
+    """
+
+    def update_nowait(self: Self, key: T_contra, function: Callable[[Rate], Rate | None]) -> Rate | None:
+        """Atomically replace the rate for the specified key with the result of the function, without suspending.
+
+        The function receives the current rate and returns the new rate to be stored, or None to
+        leave the stored rate unchanged.
+
+        Args:
+        ----
+        key (T_contra): The key for which the rate should be updated.
+        function (Callable[[Rate], Rate | None]): The function computing the new rate from the current one.
+
+        Returns:
+        -------
+        Rate | None: The value returned by the function.
+        """
+        raise NotImplementedError
@@ -0,0 +1,43 @@
+"""Module containing the interface for the access rate storing with atomic updates."""
+from collections.abc import Callable
+from typing import Protocol, Self, TypeVar, runtime_checkable
+
+from leak_snek.interfaces.storages.rate_store import RateStorage
+from leak_snek.interfaces.values.rate import Rate
+
+T_contra = TypeVar("T_contra", contravariant=True)
+
+
+@runtime_checkable
+class AtomicRateStorage(RateStorage[T_contra], Protocol[T_contra]):
+    """Protocol defining storage operations for access rate information with atomic read-modify-write.
+
+    Storages implementing this protocol can apply a modification to a rate atomically, so rate limiters
+    detect them and skip locking the key with a mutex around separate `read` and `write` calls. Backends
+    supporting compare-and-set can implement `update` as a loop reading the rate and conditionally writing
+    the new one until no concurrent modification is detected.
+
+    Methods
+    -------
+    - read: Fetch the rate for a given key.
+    - write: Store or update the rate for a given key.
+    - update: Atomically replace the rate for a given key with the result of a function.
+    """
+
+    def update(self: Self, key: T_contra, function: Callable[[Rate], Rate | None]) -> Rate | None:
+        """Atomically replace the rate for the specified key with the result of the function.
+
+        The function receives the current rate and returns the new rate to be stored, or None to
+        leave the stored rate unchanged. It may be called more than once by implementations
+        retrying on concurrent modifications, so it should have no side effects.
+
+        Args:
+        ----
+        key (T_contra): The key for which the rate should be updated.
+        function (Callable[[Rate], Rate | None]): The function computing the new rate from the current one.
+
+        Returns:
+        -------
+        Rate | None: The value returned by the function.
+        """
+        raise NotImplementedError
@@ -0,0 +1,48 @@
+"""Module containing the interface for the access rate storing with atomic updates of several keys."""
+from collections.abc import Callable, Sequence
+from typing import Protocol, Self, TypeVar, runtime_checkable
+
+from leak_snek.interfaces.storages.rate_store import RateStorage
+from leak_snek.interfaces.values.rate import Rate
+
+T_contra = TypeVar("T_contra", contravariant=True)
+
+
+@runtime_checkable
+class BatchRateStorage(RateStorage[T_contra], Protocol[T_contra]):
+    """Protocol defining storage operations for access rate information with atomic updates of several keys.
+
+    Storages implementing this protocol can apply a modification to the rates of several keys at once, so rate
+    limiters charging several keys for an operation detect them and update all the keys in a single round trip,
+    without locking any of them with a mutex. Backends supporting transactions can implement `update_many` as a
+    single transaction reading all the rates and writing the new ones.
+
+    Methods
+    -------
+    - read: Fetch the rate for a given key.
+    - write: Store or update the rate for a given key.
+    - update_many: Atomically replace the rates for the given keys with the result of a function.
+    """
+
+    def update_many(
+        self: Self,
+        keys: Sequence[T_contra],
+        function: Callable[[list[Rate]], list[Rate] | None],
+    ) -> list[Rate] | None:
+        """Atomically replace the rates for the specified keys with the result of the function.
+
+        The function receives the current rates of the keys, in the order of the keys, and returns the new rates to
+        be stored in the same order, or None to leave all the stored rates unchanged. It may be called more than
+        once by implementations retrying on concurrent modifications, so it should have no side effects.
+
+        Args:
+        ----
+        keys (Sequence[T_contra]): The keys for which the rates should be updated.
+        function (Callable[[list[Rate]], list[Rate] | None]): The function computing the new rates from the current
+                                                               ones.
+
+        Returns:
+        -------
+        list[Rate] | None: The value returned by the function.
+        """
+        raise NotImplementedError
@@ -0,0 +1,26 @@
+"""Module containing decision model."""
+import dataclasses
+from typing import final
+
+
+@final
+@dataclasses.dataclass(slots=True)
+class Decision:
+    """A model representing the outcome of a rate limit check.
+
+    This data class holds whether an operation is allowed along with the state of the limit once the operation
+    is counted, computed in the same critical section as the check, so headers like `X-RateLimit-Remaining` and
+    `Retry-After` are set without reading the storage again.
+
+    Attributes
+    ----------
+    allowed (bool): Whether the operation is allowed.
+    remaining (int): The number of operations still allowed right away after this one.
+    reset_at (float): The time at which the limit is fully restored, represented in monotonic time.
+    retry_after (float): The number of seconds to wait before the operation would be allowed, 0 if it is allowed.
+    """
+
+    allowed: bool
+    remaining: int
+    reset_at: float
+    retry_after: float
@@ -0,0 +1,133 @@
+"""Async implementation of the generic cell rate algorithm."""
+import dataclasses
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Self, TypeVar, cast, final, override
+
+from leak_snek.interfaces.limiters.aio.rate_limiter import AsyncRateLimiter
+from leak_snek.interfaces.mutexes.aio.mutex import AsyncMutex
+from leak_snek.interfaces.storages.aio.atomic_rate_store import AsyncAtomicRateStorage
+from leak_snek.interfaces.storages.aio.nowait_rate_store import AsyncNowaitRateStorage
+from leak_snek.interfaces.storages.aio.rate_store import AsyncRateStorage
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.interfaces.values.rate_limit import RateLimit
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+T_contra = TypeVar("T_contra", contravariant=True)
+
+
+@final
+@dataclasses.dataclass
+class AsyncGCRALimiter(AsyncRateLimiter[T_contra]):
+    """Asynchronous rate limiter implementing the generic cell rate algorithm (GCRA).
+
+    GCRA is the leaky bucket algorithm expressed with a single timestamp per key, the theoretical arrival time
+    (TAT): the time at which the bucket of the key will be empty. Operations are spaced by the emission interval,
+    the period divided by the number of operations, and an operation is allowed if the bucket is emptied within a
+    period of it, which lets bursts of up to `rate_limit.operations` operations through.
+
+    The TAT is kept in the `updated_at` field of the stored rates, and `operations` is left at 0, so the limiter
+    works with any async rate storage.
+
+    Attributes
+    ----------
+        rate_limit (RateLimit): The configuration specifying how many operations are allowed within a given period.
+        rate_storage (AsyncRateStorage[T_contra]): Asynchronous storage keeping the theoretical arrival times.
+        key_mutex (AsyncMutex[T_contra] | None): Asynchronous mutex to ensure thread-safety for the limiter. It is not
+                                                used and may be omitted when the storage is an
+                                                `AsyncAtomicRateStorage`, as atomic updates are safe on their own.
+                                                When given with such a storage it is ignored, so it doesn't serialize
+                                                the checks with other code locking the same keys, which must update the
+                                                rates through the storage instead.
+                                                Storages whose updates never suspend, implementing
+                                                `AsyncNowaitRateStorage`, are updated without awaiting at all.
+
+    Methods
+    -------
+        limit_exceeded: Asynchronously checks if the rate limit is exceeded for a specific key.
+    """
+
+    rate_limit: RateLimit
+    rate_storage: AsyncRateStorage[T_contra]
+    key_mutex: AsyncMutex[T_contra] | None = None
+    _atomic_storage: AsyncAtomicRateStorage[T_contra] | None = dataclasses.field(default=None, init=False, repr=False)
+    _nowait_storage: AsyncNowaitRateStorage[T_contra] | None = dataclasses.field(default=None, init=False, repr=False)
+    _emission_interval: float = dataclasses.field(init=False, repr=False)
+    _tolerance: float = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Detect whether the storage supports atomic updates, requiring a mutex if it doesn't."""
+        if isinstance(self.rate_storage, AsyncNowaitRateStorage):
+            self._nowait_storage = self.rate_storage
+
+        if isinstance(self.rate_storage, AsyncAtomicRateStorage):
+            self._atomic_storage = self.rate_storage
+        elif self.key_mutex is None:
+            msg = "key_mutex is required for storages without atomic updates."
+            raise ValueError(msg)
+
+        period = self.rate_limit.period.total_seconds()
+
+        self._emission_interval = period / self.rate_limit.operations
+        self._tolerance = period - self._emission_interval
+
+    @override
+    async def limit_exceeded(self: Self, key: T_contra, cost: int = 1) -> bool:
+        """Asynchronously checks if the rate limit is exceeded for a given key.
+
+        Args:
+        ----
+        key (T_contra): The key for which the rate limit is checked.
+        cost (int): The number of operations the check accounts for at once.
+
+        Returns:
+        -------
+        bool: True if the rate limit is surpassed, otherwise False.
+
+        Raises:
+        ------
+        ValueError: If the cost is lower than 1.
+        """
+        if cost < 1:
+            msg = "cost must be at least 1."
+            raise ValueError(msg)
+
+        arrive: Callable[[Rate], Rate | None] = self._arrive
+
+        if cost != 1:
+            arrive = partial(self._arrive, cost=cost)
+
+        nowait_storage = self._nowait_storage
+
+        if nowait_storage is not None:
+            return nowait_storage.update_nowait(key, arrive) is None
+
+        atomic_storage = self._atomic_storage
+
+        if atomic_storage is not None:
+            return await atomic_storage.update(key, arrive) is None
+
+        # The mutex is validated to be present for storages without atomic updates
+        async with cast(AsyncMutex[T_contra], self.key_mutex).lock(key):
+            rate = arrive(await self.rate_storage.read(key))
+
+            if rate is None:
+                return True
+
+            await self.rate_storage.write(key=key, value=rate)
+
+            return False
+
+    def _arrive(self: Self, rate: Rate, cost: int = 1) -> Rate | None:
+        """Advance the theoretical arrival time by the operations, returning None if it's too far in the future."""
+        now = time.monotonic()
+
+        arrival_time = max(rate.updated_at, now)
+
+        # The bucket can't be emptied within a period of the operations
+        if arrival_time - now > self._tolerance - (cost - 1) * self._emission_interval:
+            return None
+
+        return Rate(operations=0, updated_at=arrival_time + cost * self._emission_interval)
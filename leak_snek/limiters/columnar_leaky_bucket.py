@@ -0,0 +1,139 @@
+"""Vectorized implementation of the leaky bucket algorithm over columnar storage.
+
+This module requires the optional `numpy` dependency, installable with the `numpy` extra.
+"""
+from __future__ import annotations
+
+import dataclasses
+import time
+from collections.abc import Hashable, Sequence
+from typing import TYPE_CHECKING, Self, TypeVar, final, override
+
+import numpy as np
+
+from leak_snek.interfaces.limiters.rate_limiter import RateLimiter
+
+if TYPE_CHECKING:
+    from leak_snek.interfaces.values.rate_limit import RateLimit
+    from leak_snek.storages.columnar_storage import ColumnarStorage
+
+T_contra = TypeVar("T_contra", contravariant=True, bound=Hashable)
+
+
+@final
+@dataclasses.dataclass
+class ColumnarLeakyBucketLimiter(RateLimiter[T_contra]):
+    """A leaky bucket rate limiter evaluating batches of keys with vectorized NumPy operations.
+
+    The limiter works directly on the columns of a `ColumnarStorage`: a batch of keys is resolved to slots once,
+    and the leaks, the admission decisions and the new bucket states of all the keys are computed with array
+    operations under a single acquisition of the storage lock. A key repeated in the batch is charged once per
+    occurrence, in order, exactly as if the keys were checked one by one with `LeakyBucketLimiter`.
+
+    Attributes
+    ----------
+        rate_limit (RateLimit): The limit configuration detailing how many operations are allowed in a given period.
+        rate_storage (ColumnarStorage[T_contra]): Columnar storage keeping the buckets.
+
+    Methods
+    -------
+        limit_exceeded: Checks if the rate limit is exceeded for a given key.
+        limit_exceeded_many: Checks if the rate limit is exceeded for each of the given keys.
+    """
+
+    rate_limit: RateLimit
+    rate_storage: ColumnarStorage[T_contra]
+
+    @override
+    def limit_exceeded(self: Self, key: T_contra, cost: int = 1) -> bool:
+        """Check if the rate limit is exceeded for a given key.
+
+        Args:
+        ----
+        key (T_contra): The key to check the rate limit for.
+        cost (int): The number of operations the check adds to the bucket at once.
+
+        Returns:
+        -------
+        bool: True if the rate limit is exceeded, otherwise False.
+
+        Raises:
+        ------
+        ValueError: If the cost is lower than 1.
+        """
+        if cost < 1:
+            msg = "cost must be at least 1."
+            raise ValueError(msg)
+
+        if cost == 1:
+            return self.limit_exceeded_many((key,))[0]
+
+        storage = self.rate_storage
+
+        with storage.lock:
+            slot = storage.slots((key,))[0]
+            now = time.monotonic()
+
+            elapsed = now - float(storage.updated_at[slot])
+            leaked = int(elapsed / self.rate_limit.period.total_seconds() * self.rate_limit.operations)
+
+            new_operations = int(storage.operations[slot]) + cost - leaked
+
+            if new_operations > self.rate_limit.operations:
+                return True
+
+            storage.operations[slot] = max(new_operations, 0)
+            storage.updated_at[slot] = now
+
+            return False
+
+    @override
+    def limit_exceeded_many(self: Self, keys: Sequence[T_contra]) -> list[bool]:
+        """Check if the rate limit is exceeded for each of the given keys.
+
+        Within a batch all the keys share the same timestamp, so only the first occurrence of a key leaks the
+        bucket. If it is admitted, each following occurrence adds one operation until the bucket is full.
+        If it is rejected, so are the following ones, as the bucket doesn't change.
+
+        Args:
+        ----
+        keys (Sequence[T_contra]): The keys to check the rate limit for.
+
+        Returns:
+        -------
+        list[bool]: For each key, True if the rate limit is exceeded, otherwise False.
+        """
+        if not keys:
+            return []
+
+        capacity = self.rate_limit.operations
+        storage = self.rate_storage
+
+        with storage.lock:
+            slots = storage.slots(keys)
+            now = time.monotonic()
+
+            unique_slots, inverse, counts = np.unique(slots, return_inverse=True, return_counts=True)
+
+            # The rank of every occurrence among the occurrences of the same key
+            order = np.argsort(inverse, kind="stable")
+            ranks = np.empty_like(order)
+            ranks[order] = np.arange(order.size) - np.repeat(np.cumsum(counts) - counts, counts)
+
+            operations = storage.operations[unique_slots].astype(np.int64)
+            elapsed = now - storage.updated_at[unique_slots]
+            leaked = (elapsed / self.rate_limit.period.total_seconds() * capacity).astype(np.int64)
+
+            new_operations = operations + 1 - leaked
+            admitted = new_operations <= capacity
+            base = np.maximum(new_operations, 0)
+
+            allowed = admitted[inverse] & (base[inverse] + ranks <= capacity)
+
+            updated_slots = unique_slots[admitted]
+            storage.operations[updated_slots] = (base + np.minimum(counts - 1, capacity - base))[admitted]
+            storage.updated_at[updated_slots] = now
+
+        exceeded: list[bool] = (~allowed).tolist()
+
+        return exceeded
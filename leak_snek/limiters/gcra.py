@@ -0,0 +1,123 @@
+"""The implementation of the generic cell rate algorithm."""
+import dataclasses
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Self, TypeVar, cast, final, override
+
+from leak_snek.interfaces.limiters.rate_limiter import RateLimiter
+from leak_snek.interfaces.mutexes.mutex import Mutex
+from leak_snek.interfaces.storages.atomic_rate_store import AtomicRateStorage
+from leak_snek.interfaces.storages.rate_store import RateStorage
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.interfaces.values.rate_limit import RateLimit
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+T_contra = TypeVar("T_contra", contravariant=True)
+
+
+@final
+@dataclasses.dataclass
+class GCRALimiter(RateLimiter[T_contra]):
+    """A rate limiter implementing the generic cell rate algorithm (GCRA).
+
+    GCRA is the leaky bucket algorithm expressed with a single timestamp per key, the theoretical arrival time
+    (TAT): the time at which the bucket of the key will be empty. Operations are spaced by the emission interval,
+    the period divided by the number of operations, and an operation is allowed if the bucket is emptied within a
+    period of it, which lets bursts of up to `rate_limit.operations` operations through. Unlike
+    `LeakyBucketLimiter`, leaks aren't truncated to whole operations, so the limit is enforced exactly.
+
+    The TAT is kept in the `updated_at` field of the stored rates, and `operations` is left at 0, so the limiter
+    works with any rate storage. With a single value per key, an atomic update amounts to a single compare-and-set
+    on backends supporting it.
+
+    Attributes
+    ----------
+        rate_limit (RateLimit): The limit configuration detailing how many operations are allowed in a given period.
+        rate_storage (RateStorage[T_contra]): Storage mechanism to keep track of the theoretical arrival times.
+        key_mutex (Mutex[T_contra] | None): Mutex to ensure thread-safety for the limiter. It is not used and may be
+                                           omitted when the storage is an `AtomicRateStorage`, as atomic updates
+                                           are thread-safe on their own.
+                                           When given with such a storage it is ignored, so it doesn't serialize the
+                                           checks with other code locking the same keys, which must update the rates
+                                           through the storage instead.
+
+    Methods
+    -------
+        limit_exceeded: Checks if the rate limit is exceeded for a given key.
+    """
+
+    rate_limit: RateLimit
+    rate_storage: RateStorage[T_contra]
+    key_mutex: Mutex[T_contra] | None = None
+    _atomic_storage: AtomicRateStorage[T_contra] | None = dataclasses.field(default=None, init=False, repr=False)
+    _emission_interval: float = dataclasses.field(init=False, repr=False)
+    _tolerance: float = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Detect whether the storage supports atomic updates, requiring a mutex if it doesn't."""
+        if isinstance(self.rate_storage, AtomicRateStorage):
+            self._atomic_storage = self.rate_storage
+        elif self.key_mutex is None:
+            msg = "key_mutex is required for storages without atomic updates."
+            raise ValueError(msg)
+
+        period = self.rate_limit.period.total_seconds()
+
+        self._emission_interval = period / self.rate_limit.operations
+        self._tolerance = period - self._emission_interval
+
+    @override
+    def limit_exceeded(self: Self, key: T_contra, cost: int = 1) -> bool:
+        """Check if the rate limit is exceeded for a given key.
+
+        Args:
+        ----
+        key (T_contra): The key to check the rate limit for.
+        cost (int): The number of operations the check accounts for at once.
+
+        Returns:
+        -------
+        bool: True if the rate limit is exceeded, otherwise False.
+
+        Raises:
+        ------
+        ValueError: If the cost is lower than 1.
+        """
+        if cost < 1:
+            msg = "cost must be at least 1."
+            raise ValueError(msg)
+
+        arrive: Callable[[Rate], Rate | None] = self._arrive
+
+        if cost != 1:
+            arrive = partial(self._arrive, cost=cost)
+
+        atomic_storage = self._atomic_storage
+
+        if atomic_storage is not None:
+            return atomic_storage.update(key, arrive) is None
+
+        # The mutex is validated to be present for storages without atomic updates
+        with cast(Mutex[T_contra], self.key_mutex).lock(key):
+            rate = arrive(self.rate_storage.read(key))
+
+            if rate is None:
+                return True
+
+            self.rate_storage.write(key=key, value=rate)
+
+            return False
+
+    def _arrive(self: Self, rate: Rate, cost: int = 1) -> Rate | None:
+        """Advance the theoretical arrival time by the operations, returning None if it's too far in the future."""
+        now = time.monotonic()
+
+        arrival_time = max(rate.updated_at, now)
+
+        # The bucket can't be emptied within a period of the operations
+        if arrival_time - now > self._tolerance - (cost - 1) * self._emission_interval:
+            return None
+
+        return Rate(operations=0, updated_at=arrival_time + cost * self._emission_interval)
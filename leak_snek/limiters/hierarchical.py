@@ -0,0 +1,193 @@
+"""The implementation of the leaky bucket algorithm charging a key and its parent keys at once."""
+from __future__ import annotations
+
+import dataclasses
+import time
+from contextlib import ExitStack
+from functools import partial
+from typing import TYPE_CHECKING, Self, TypeVar, cast, final, override
+
+from leak_snek.interfaces.limiters.rate_limiter import RateLimiter
+from leak_snek.interfaces.mutexes.mutex import Mutex
+from leak_snek.interfaces.mutexes.striping_mutex import StripingMutex
+from leak_snek.interfaces.storages.atomic_rate_store import AtomicRateStorage
+from leak_snek.interfaces.storages.batch_rate_store import BatchRateStorage
+from leak_snek.interfaces.values.rate import Rate
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from leak_snek.interfaces.storages.rate_store import RateStorage
+    from leak_snek.interfaces.values.rate_limit import RateLimit
+
+T_contra = TypeVar("T_contra", contravariant=True)
+
+
+@final
+@dataclasses.dataclass
+class HierarchicalLimiter(RateLimiter[T_contra]):
+    """A leaky bucket rate limiter charging operations to a key and to its parent keys at once.
+
+    Every level of the hierarchy has its own rate limit, the one of the key first, and `parents` derives the keys of
+    the levels above the key from it, nearest first. An operation is only added to the buckets of the levels if it
+    fits in all of them, so no level is ever charged for an operation another one rejects.
+
+    The levels are updated in a single call for storages implementing `BatchRateStorage`, e.g. a single transaction
+    for `SQLiteStorage`. Storages without atomic updates are locked with the mutex for every distinct key of the
+    levels, always in the order of their `repr`, so concurrent checks lock shared keys in the same order. Other
+    `AtomicRateStorage`s are updated level by level, and the levels already charged are refunded when one of them
+    rejects the operation, so concurrent checks may briefly see them charged.
+
+    Attributes
+    ----------
+        rate_limits (Sequence[RateLimit]): The limit configurations of the levels detailing how many operations are
+                                           allowed in a given period, the one of the key first.
+        parents (Callable[[T_contra], Sequence[T_contra]]): The function deriving the keys of the levels above a key,
+                                                            nearest first, one for every rate limit but the first.
+        rate_storage (RateStorage[T_contra]): Storage mechanism to keep track of rate values.
+        key_mutex (Mutex[T_contra] | None): Mutex to ensure thread-safety for the limiter. It is not used and may be
+                                           omitted when the storage is an `AtomicRateStorage` or a
+                                           `BatchRateStorage`, as their updates are thread-safe on their own.
+                                           When given with such a storage it is ignored, so it doesn't serialize the
+                                           checks with other code locking the same keys, which must update the rates
+                                           through the storage instead.
+                                           It must lock distinct keys with distinct locks, which rules out
+                                           `StripingMutex`s like `StripedMutex` and `SharedMemoryMutex`.
+
+    Methods
+    -------
+        limit_exceeded: Checks if the rate limit of a given key or of any of its parent keys is exceeded.
+    """
+
+    rate_limits: Sequence[RateLimit]
+    parents: Callable[[T_contra], Sequence[T_contra]]
+    rate_storage: RateStorage[T_contra]
+    key_mutex: Mutex[T_contra] | None = None
+    _batch_storage: BatchRateStorage[T_contra] | None = dataclasses.field(default=None, init=False, repr=False)
+    _atomic_storage: AtomicRateStorage[T_contra] | None = dataclasses.field(default=None, init=False, repr=False)
+    _buckets: tuple[tuple[int, float], ...] = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Detect the updates the storage supports and precompute the capacity and leak of the buckets."""
+        if not self.rate_limits:
+            msg = "At least one rate limit is required."
+            raise ValueError(msg)
+
+        if isinstance(self.rate_storage, BatchRateStorage):
+            self._batch_storage = self.rate_storage
+
+        if isinstance(self.rate_storage, AtomicRateStorage):
+            self._atomic_storage = self.rate_storage
+        elif self._batch_storage is None and self.key_mutex is None:
+            msg = "key_mutex is required for storages without atomic updates."
+            raise ValueError(msg)
+        elif self._batch_storage is None and isinstance(self.key_mutex, StripingMutex):
+            msg = "Striping mutexes can't lock the keys of all the levels at once, as keys may share a lock."
+            raise ValueError(msg)
+
+        self._buckets = tuple(
+            (rate_limit.operations, rate_limit.operations / rate_limit.period.total_seconds())
+            for rate_limit in self.rate_limits
+        )
+
+    @override
+    def limit_exceeded(self: Self, key: T_contra, cost: int = 1) -> bool:
+        """Check if the rate limit of a given key or of any of its parent keys is exceeded.
+
+        Args:
+        ----
+        key (T_contra): The key to check the rate limits for.
+        cost (int): The number of operations the check adds to the bucket of every level at once.
+
+        Returns:
+        -------
+        bool: True if the rate limit of any level is exceeded, otherwise False.
+
+        Raises:
+        ------
+        ValueError: If the cost is lower than 1 or `parents` doesn't derive a key for every rate limit but the first.
+        """
+        if cost < 1:
+            msg = "cost must be at least 1."
+            raise ValueError(msg)
+
+        keys = [key, *self.parents(key)]
+
+        if len(keys) != len(self._buckets):
+            msg = "parents must derive a key for every rate limit but the first."
+            raise ValueError(msg)
+
+        batch_storage = self._batch_storage
+
+        if batch_storage is not None:
+            return batch_storage.update_many(keys, partial(self._leak_all, cost=cost)) is None
+
+        atomic_storage = self._atomic_storage
+
+        if atomic_storage is not None:
+            return self._charge_levels(atomic_storage, keys, cost)
+
+        # The mutex is validated to be present for storages without atomic updates
+        key_mutex = cast(Mutex[T_contra], self.key_mutex)
+
+        with ExitStack() as stack:
+            # Every key is locked once, in the same order for all the checks, so checks sharing keys can't deadlock
+            for level_key in sorted(set(keys), key=repr):
+                stack.enter_context(key_mutex.lock(level_key))
+
+            rates = self._leak_all([self.rate_storage.read(level_key) for level_key in keys], cost)
+
+            if rates is not None:
+                for level_key, rate in zip(keys, rates, strict=True):
+                    self.rate_storage.write(key=level_key, value=rate)
+
+        return rates is None
+
+    def _charge_levels(
+        self: Self,
+        atomic_storage: AtomicRateStorage[T_contra],
+        keys: list[T_contra],
+        cost: int,
+    ) -> bool:
+        """Charge the levels one by one, refunding the charged ones if a level rejects the operations."""
+        for level, (level_key, (capacity, leak_rate)) in enumerate(zip(keys, self._buckets, strict=True)):
+            leak = partial(self._leak, capacity=capacity, leak_rate=leak_rate, cost=cost)
+
+            if atomic_storage.update(level_key, leak) is None:
+                for charged_key in keys[:level]:
+                    atomic_storage.update(charged_key, partial(self._refund, cost=cost))
+
+                return True
+
+        return False
+
+    def _leak_all(self: Self, rates: list[Rate], cost: int = 1) -> list[Rate] | None:
+        """Leak the buckets of all the levels and add the operations to them, returning None if any would overflow."""
+        new_rates = []
+
+        for rate, (capacity, leak_rate) in zip(rates, self._buckets, strict=True):
+            new_rate = self._leak(rate, capacity, leak_rate, cost)
+
+            if new_rate is None:
+                return None
+
+            new_rates.append(new_rate)
+
+        return new_rates
+
+    @staticmethod
+    def _leak(rate: Rate, capacity: int, leak_rate: float, cost: int) -> Rate | None:
+        """Leak the bucket of a level and add the operations to it, returning None if the bucket would overflow."""
+        now = time.monotonic()
+
+        new_operations = rate.operations + cost - int((now - rate.updated_at) * leak_rate)
+
+        if new_operations > capacity:
+            return None
+
+        return Rate(operations=max(new_operations, 0), updated_at=now)
+
+    @staticmethod
+    def _refund(rate: Rate, cost: int) -> Rate:
+        """Remove the operations from the bucket of a level, keeping its update time so it keeps leaking as before."""
+        return Rate(operations=max(rate.operations - cost, 0), updated_at=rate.updated_at)
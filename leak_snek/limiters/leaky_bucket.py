@@ -1,11 +1,19 @@
 """The implementation of the leaky bucket algorithm."""
 import dataclasses
+import math
 import time
-from typing import Self, TypeVar, final, override
+from collections.abc import Callable
+from functools import partial
+from typing import Self, TypeVar, cast, final, override
 
-from leak_snek.interfaces.limiters.rate_limiter import RateLimiter
+from leak_snek.interfaces.clocks.clock import Clock
+from leak_snek.interfaces.clocks.sleeping_clock import SleepingClock
+from leak_snek.interfaces.limiters.waiting_rate_limiter import WaitingRateLimiter
 from leak_snek.interfaces.mutexes.mutex import Mutex
+from leak_snek.interfaces.observers.observer import Observer
+from leak_snek.interfaces.storages.atomic_rate_store import AtomicRateStorage
 from leak_snek.interfaces.storages.rate_store import RateStorage
+from leak_snek.interfaces.values.decision import Decision
 from leak_snek.interfaces.values.rate import Rate
 from leak_snek.interfaces.values.rate_limit import RateLimit
 
@@ -14,7 +22,7 @@ T_contra = TypeVar("T_contra", contravariant=True)
 
 @final
 @dataclasses.dataclass
-class LeakyBucketLimiter(RateLimiter[T_contra]):
+class LeakyBucketLimiter(WaitingRateLimiter[T_contra]):
     """A rate limiter implementing the leaky bucket algorithm.
 
     The leaky bucket algorithm views traffic as water entering a bucket with a hole.
@@ -30,19 +38,42 @@ class LeakyBucketLimiter(RateLimiter[T_contra]):
     ----------
         rate_limit (RateLimit): The limit configuration detailing how many operations are allowed in a given period.
         rate_storage (RateStorage[T_contra]): Storage mechanism to keep track of rate values.
-        key_mutex (Mutex[T_contra]): Mutex to ensure thread-safety for the limiter.
+        key_mutex (Mutex[T_contra] | None): Mutex to ensure thread-safety for the limiter. It is not used and may be
+                                           omitted when the storage is an `AtomicRateStorage`, as atomic updates
+                                           are thread-safe on their own.
+                                           When given with such a storage it is ignored, so it doesn't serialize the
+                                           checks with other code locking the same keys, which must update the rates
+                                           through the storage instead.
+        observer (Observer[T_contra] | None): Observer receiving the decisions and the time spent in the mutex and
+                                              the storage. Checks don't measure anything without one.
+        clock (Clock | None): Clock the buckets are leaked with, e.g. a `FakeClock` driving the limiter from virtual
+                              time or a `CoarseClock` caching it. `time.monotonic` is read directly without one.
+                              `acquire` also sleeps with it when it is a `SleepingClock`.
 
     Methods
     -------
         limit_exceeded: Checks if the rate limit is exceeded for a given key.
+        check: Checks the rate limit for a given key, detailing the state of the bucket.
+        acquire: Waits until an operation is allowed for a given key.
     """
 
     rate_limit: RateLimit
     rate_storage: RateStorage[T_contra]
-    key_mutex: Mutex[T_contra]
+    key_mutex: Mutex[T_contra] | None = None
+    observer: Observer[T_contra] | None = None
+    clock: Clock | None = None
+    _atomic_storage: AtomicRateStorage[T_contra] | None = dataclasses.field(default=None, init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Detect whether the storage supports atomic updates, requiring a mutex if it doesn't."""
+        if isinstance(self.rate_storage, AtomicRateStorage):
+            self._atomic_storage = self.rate_storage
+        elif self.key_mutex is None:
+            msg = "key_mutex is required for storages without atomic updates."
+            raise ValueError(msg)
 
     @override
-    def limit_exceeded(self: Self, key: T_contra) -> bool:
+    def limit_exceeded(self: Self, key: T_contra, cost: int = 1) -> bool:
         """Check if the rate limit is exceeded for a given key.
 
         This method uses the leaky bucket algorithm to determine if a request
@@ -51,23 +82,224 @@ class LeakyBucketLimiter(RateLimiter[T_contra]):
         Args:
         ----
         key (T_contra): The key to check the rate limit for.
+        cost (int): The number of operations the check adds to the bucket at once.
 
         Returns:
         -------
         bool: True if the rate limit is exceeded, otherwise False.
+
+        Raises:
+        ------
+        ValueError: If the cost is lower than 1.
         """
-        with self.key_mutex.lock(key):
-            rate = self.rate_storage.read(key)
+        if cost < 1:
+            msg = "cost must be at least 1."
+            raise ValueError(msg)
+
+        leak: Callable[[Rate], Rate | None] = self._leak
+
+        if cost != 1:
+            leak = partial(self._leak, cost=cost)
 
-            now = time.monotonic()
+        observer = self.observer
 
-            leaked = int((now - rate.updated_at) / self.rate_limit.period.seconds * self.rate_limit.operations)
+        if observer is not None:
+            return self._observe(observer, key, leak) is None
 
-            new_operations = rate.operations + 1 - leaked
+        atomic_storage = self._atomic_storage
 
-            if new_operations > self.rate_limit.operations:
+        if atomic_storage is not None:
+            return atomic_storage.update(key, leak) is None
+
+        # The mutex is validated to be present for storages without atomic updates
+        with cast(Mutex[T_contra], self.key_mutex).lock(key):
+            rate = leak(self.rate_storage.read(key))
+
+            if rate is None:
                 return True
 
-            self.rate_storage.write(key=key, value=Rate(operations=max(new_operations, 0), updated_at=now))
+            self.rate_storage.write(key=key, value=rate)
 
             return False
+
+    @override
+    def acquire(self: Self, key: T_contra, timeout: float | None = None, cost: int = 1) -> bool:
+        """Wait until an operation is allowed for the given key and add it to the bucket.
+
+        When the bucket is full, the time until it leaks enough to take the operation is computed from its state,
+        and the thread sleeps once for that long. It only sleeps again if a concurrent operation took the room first.
+        The thread sleeps with the clock when it is a `SleepingClock`, so a clock driven by virtual time advances
+        with the wait, and with `time.sleep` otherwise.
+
+        Args:
+        ----
+        key (T_contra): The key to add the operation for.
+        timeout (float | None): The maximum number of seconds to wait, or None to wait as long as needed.
+        cost (int): The number of operations to add, they are never added if they don't fit in the bucket.
+
+        Returns:
+        -------
+        bool: True if the operation was added, False if the bucket wouldn't take it before the timeout.
+
+        Raises:
+        ------
+        ValueError: If the cost is lower than 1.
+        """
+        if cost < 1:
+            msg = "cost must be at least 1."
+            raise ValueError(msg)
+
+        if cost > self.rate_limit.operations:
+            return False
+
+        clock = self.clock
+        sleep: Callable[[float], None] = time.sleep
+
+        if isinstance(clock, SleepingClock):
+            sleep = clock.sleep
+
+        deadline = None if timeout is None else self._monotonic() + timeout
+
+        while not (decision := self.check(key, cost)).allowed:
+            if deadline is not None and self._monotonic() + decision.retry_after > deadline:
+                return False
+
+            sleep(decision.retry_after)
+
+        return True
+
+    def check(self: Self, key: T_contra, cost: int = 1) -> Decision:
+        """Check the rate limit for a given key, detailing the state of the bucket.
+
+        The operation is added to the bucket if it fits, like `limit_exceeded` does, and the decision is computed
+        from the rate seen by the update, so the remaining room, the time the bucket empties and the time until the
+        operation would fit come without another pass over the storage.
+
+        Args:
+        ----
+        key (T_contra): The key to check the rate limit for.
+        cost (int): The number of operations to add.
+
+        Returns:
+        -------
+        Decision: Whether the operation is allowed, with the state of the bucket once it is counted.
+
+        Raises:
+        ------
+        ValueError: If the cost is lower than 1.
+        """
+        if cost < 1:
+            msg = "cost must be at least 1."
+            raise ValueError(msg)
+
+        observed: Rate | None = None
+
+        def leak(rate: Rate) -> Rate | None:
+            nonlocal observed
+
+            observed = rate
+
+            return self._leak(rate, cost)
+
+        observer = self.observer
+
+        if observer is not None:
+            new_rate = self._observe(observer, key, leak)
+
+            # The function is called at least once by the update
+            return self._decide(cast(Rate, observed), new_rate, cost)
+
+        atomic_storage = self._atomic_storage
+
+        if atomic_storage is not None:
+            new_rate = atomic_storage.update(key, leak)
+
+            # The function is called at least once by the update
+            return self._decide(cast(Rate, observed), new_rate, cost)
+
+        # The mutex is validated to be present for storages without atomic updates
+        with cast(Mutex[T_contra], self.key_mutex).lock(key):
+            rate = self.rate_storage.read(key)
+            new_rate = self._leak(rate, cost)
+
+            if new_rate is not None:
+                self.rate_storage.write(key=key, value=new_rate)
+
+            return self._decide(rate, new_rate, cost)
+
+    def _observe(
+        self: Self,
+        observer: Observer[T_contra],
+        key: T_contra,
+        leak: Callable[[Rate], Rate | None],
+    ) -> Rate | None:
+        """Update the bucket with the function, reporting the decision and the time spent in the mutex and storage."""
+        atomic_storage = self._atomic_storage
+        started_at = time.perf_counter()
+
+        if atomic_storage is not None:
+            rate = atomic_storage.update(key, leak)
+            observer.storage_called(key, "update", time.perf_counter() - started_at)
+        else:
+            # The mutex is validated to be present for storages without atomic updates
+            with cast(Mutex[T_contra], self.key_mutex).lock(key):
+                locked_at = time.perf_counter()
+                observer.lock_waited(key, locked_at - started_at)
+
+                current_rate = self.rate_storage.read(key)
+                observer.storage_called(key, "read", time.perf_counter() - locked_at)
+
+                rate = leak(current_rate)
+
+                if rate is not None:
+                    started_at = time.perf_counter()
+                    self.rate_storage.write(key=key, value=rate)
+                    observer.storage_called(key, "write", time.perf_counter() - started_at)
+
+        observer.decided(key, allowed=rate is not None)
+
+        return rate
+
+    def _monotonic(self: Self) -> float:
+        """Read the time from the clock, or from `time.monotonic` without one."""
+        return time.monotonic() if self.clock is None else self.clock.monotonic()
+
+    def _decide(self: Self, rate: Rate, new_rate: Rate | None, cost: int) -> Decision:
+        """Describe the bucket once the operations are added, or the full bucket if they didn't fit."""
+        interval = self.rate_limit.period.total_seconds() / self.rate_limit.operations
+
+        if new_rate is not None:
+            return Decision(
+                allowed=True,
+                remaining=self.rate_limit.operations - new_rate.operations,
+                reset_at=new_rate.updated_at + new_rate.operations * interval,
+                retry_after=0,
+            )
+
+        # The bucket takes the operations once it leaked the operations overflowing it, if they fit in it at all
+        overflow = rate.operations + cost - self.rate_limit.operations
+        retry_after = rate.updated_at + overflow * interval - self._monotonic()
+
+        return Decision(
+            allowed=False,
+            remaining=0,
+            reset_at=rate.updated_at + rate.operations * interval,
+            retry_after=math.inf if cost > self.rate_limit.operations else max(retry_after, 0),
+        )
+
+    def _leak(self: Self, rate: Rate, cost: int = 1) -> Rate | None:
+        """Leak the bucket and add the operations to it, returning None if the bucket would overflow."""
+        clock = self.clock
+        now = time.monotonic() if clock is None else clock.monotonic()
+
+        rate_limit = self.rate_limit
+
+        # Storages stamp new rates with `time.monotonic`, which the clock may be behind, and buckets never fill up alone
+        leaked = max(int((now - rate.updated_at) / rate_limit.period.total_seconds() * rate_limit.operations), 0)
+
+        new_operations = rate.operations + cost - leaked
+
+        if new_operations > rate_limit.operations:
+            return None
+
+        return Rate(operations=max(new_operations, 0), updated_at=now)
@@ -0,0 +1,177 @@
+"""The implementation of the leaky bucket algorithm leasing operations to the process."""
+from __future__ import annotations
+
+import dataclasses
+import time
+from collections.abc import Hashable
+from threading import Lock
+from typing import TYPE_CHECKING, Self, TypeVar, cast, final, override
+
+from leak_snek.interfaces.limiters.rate_limiter import RateLimiter
+from leak_snek.interfaces.mutexes.mutex import Mutex
+from leak_snek.interfaces.storages.atomic_rate_store import AtomicRateStorage
+from leak_snek.interfaces.values.rate import Rate
+
+if TYPE_CHECKING:
+    from leak_snek.interfaces.storages.rate_store import RateStorage
+    from leak_snek.interfaces.values.rate_limit import RateLimit
+
+T_contra = TypeVar("T_contra", contravariant=True, bound=Hashable)
+
+
+@final
+@dataclasses.dataclass(slots=True)
+class Lease:
+    """A mutable per-key record holding the operations leased from the shared bucket and not spent yet.
+
+    Attributes
+    ----------
+    tokens (int): The number of leased operations left to spend.
+    expires_at (float): The time after which the leased operations can't be spent, represented in monotonic time.
+    lock (Lock): The lock guarding the lease.
+    """
+
+    tokens: int = 0
+    expires_at: float = 0.0
+    lock: Lock = dataclasses.field(default_factory=Lock)
+
+
+@final
+@dataclasses.dataclass
+class LeasingLimiter(RateLimiter[T_contra]):
+    """A leaky bucket rate limiter leasing batches of operations from a shared bucket to spend them locally.
+
+    When a key has no leased operations left, up to `lease_size` operations are added to its bucket in the storage
+    in a single update, and the following checks of the key are answered from the lease without touching the
+    storage, which divides the storage round trips by about the lease size. The buckets are the ones of
+    `LeakyBucketLimiter`, so both limiters can share a storage.
+
+    Leased operations can only be spent for `lease_duration` seconds. The operations left in an expired lease are
+    removed from the bucket by the update leasing the next batch of the key, and `release` removes all of them, to be
+    called on shutdown. Operations are counted when they are leased rather than when they are spent, so the limit can
+    be exceeded by at most `lease_size` operations per process within `lease_duration`, and other processes may be
+    denied at most `lease_size - 1` operations per process leasing the key.
+
+    Attributes
+    ----------
+        rate_limit (RateLimit): The limit configuration detailing how many operations are allowed in a given period.
+        rate_storage (RateStorage[T_contra]): Storage mechanism to keep track of rate values, usually shared with
+                                              other processes.
+        key_mutex (Mutex[T_contra] | None): Mutex to ensure thread-safety for the storage. It is not used and may be
+                                           omitted when the storage is an `AtomicRateStorage`, as atomic updates
+                                           are thread-safe on their own.
+                                           When given with such a storage it is ignored, so it doesn't serialize the
+                                           checks with other code locking the same keys, which must update the rates
+                                           through the storage instead.
+        lease_size (int): The maximum number of operations leased from the storage at once.
+        lease_duration (float): The number of seconds the leased operations can be spent for.
+        leases (dict[T_contra, Lease]): A dictionary mapping unique keys to their leases.
+
+    Methods
+    -------
+        limit_exceeded: Checks if the rate limit is exceeded for a given key.
+        release: Removes the operations left in all the leases from the storage.
+    """
+
+    rate_limit: RateLimit
+    rate_storage: RateStorage[T_contra]
+    key_mutex: Mutex[T_contra] | None = None
+    lease_size: int = 16
+    lease_duration: float = 1.0
+    leases: dict[T_contra, Lease] = dataclasses.field(default_factory=dict)
+    _atomic_storage: AtomicRateStorage[T_contra] | None = dataclasses.field(default=None, init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Detect whether the storage supports atomic updates, requiring a mutex if it doesn't."""
+        if isinstance(self.rate_storage, AtomicRateStorage):
+            self._atomic_storage = self.rate_storage
+        elif self.key_mutex is None:
+            msg = "key_mutex is required for storages without atomic updates."
+            raise ValueError(msg)
+
+    @override
+    def limit_exceeded(self: Self, key: T_contra, cost: int = 1) -> bool:
+        """Check if the rate limit is exceeded for a given key.
+
+        The operations are taken from the lease of the key. If the lease is expired or doesn't hold enough of them,
+        a new batch of at least `cost` operations is leased from the storage, and kept even if it is too small.
+
+        Args:
+        ----
+        key (T_contra): The key to check the rate limit for.
+        cost (int): The number of operations the check takes from the lease at once.
+
+        Returns:
+        -------
+        bool: True if the rate limit is exceeded, otherwise False.
+
+        Raises:
+        ------
+        ValueError: If the cost is lower than 1.
+        """
+        if cost < 1:
+            msg = "cost must be at least 1."
+            raise ValueError(msg)
+
+        lease = self.leases.get(key)
+
+        if lease is None:
+            # `setdefault` is atomic, so concurrent first checks of the same key share a single lease
+            lease = self.leases.setdefault(key, Lease())
+
+        with lease.lock:
+            now = time.monotonic()
+
+            if lease.tokens >= cost and now < lease.expires_at:
+                lease.tokens -= cost
+                return False
+
+            leased = self._exchange(key, lease.tokens, max(self.lease_size, cost))
+
+            lease.tokens = leased - cost if leased >= cost else leased
+            lease.expires_at = now + self.lease_duration
+
+            return leased < cost
+
+    def release(self: Self) -> None:
+        """Remove the operations left in all the leases from the storage."""
+        for key, lease in list(self.leases.items()):
+            with lease.lock:
+                if lease.tokens:
+                    self._exchange(key, lease.tokens, 0)
+                    lease.tokens = 0
+
+    def _exchange(self: Self, key: T_contra, returned: int, size: int) -> int:
+        """Remove the returned operations from the bucket and lease up to `size` ones, returning the leased count."""
+        leased = 0
+
+        def lease(rate: Rate) -> Rate | None:
+            nonlocal leased
+
+            now = time.monotonic()
+
+            leaked = int((now - rate.updated_at) / self.rate_limit.period.total_seconds() * self.rate_limit.operations)
+
+            operations = max(rate.operations - leaked - returned, 0)
+            leased = min(size, self.rate_limit.operations - operations)
+
+            # Like a denied operation, a full bucket is left as is so it keeps leaking
+            if not leased and not returned:
+                return None
+
+            return Rate(operations=operations + leased, updated_at=now)
+
+        atomic_storage = self._atomic_storage
+
+        if atomic_storage is not None:
+            atomic_storage.update(key, lease)
+            return leased
+
+        # The mutex is validated to be present for storages without atomic updates
+        with cast(Mutex[T_contra], self.key_mutex).lock(key):
+            rate = lease(self.rate_storage.read(key))
+
+            if rate is not None:
+                self.rate_storage.write(key=key, value=rate)
+
+            return leased
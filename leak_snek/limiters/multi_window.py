@@ -0,0 +1,144 @@
+"""The implementation of the leaky bucket algorithm enforcing several rate limits at once."""
+from __future__ import annotations
+
+import dataclasses
+import math
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Self, TypeVar, cast, final, override
+
+from leak_snek.interfaces.limiters.rate_limiter import RateLimiter
+from leak_snek.interfaces.mutexes.mutex import Mutex
+from leak_snek.interfaces.storages.atomic_rate_store import AtomicRateStorage
+from leak_snek.interfaces.values.rate import Rate
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from leak_snek.interfaces.storages.rate_store import RateStorage
+    from leak_snek.interfaces.values.rate_limit import RateLimit
+
+T_contra = TypeVar("T_contra", contravariant=True)
+
+# The packed buckets have to fit in the signed 64-bit integers of the shared memory and sqlite storages
+MAX_PACKED_OPERATIONS = 2**63 - 1
+
+
+@final
+@dataclasses.dataclass
+class MultiWindowLimiter(RateLimiter[T_contra]):
+    """A leaky bucket rate limiter enforcing several rate limits, e.g. per second and per hour, at once.
+
+    Every rate limit has its own bucket, and an operation is only added to the buckets if it fits in all of them,
+    so a bucket is never charged for an operation another one rejects. The buckets of a key are packed in the
+    `operations` of a single rate, the one of the first rate limit in the lowest digits, so all of them are
+    checked with a single storage update, or a single lock, read and write for storages without atomic updates.
+    They all leak since the `updated_at` of the rate, as they are only ever updated together.
+
+    Attributes
+    ----------
+        rate_limits (Sequence[RateLimit]): The limit configurations detailing how many operations are allowed in
+                                           every period.
+        rate_storage (RateStorage[T_contra]): Storage mechanism to keep track of rate values.
+        key_mutex (Mutex[T_contra] | None): Mutex to ensure thread-safety for the limiter. It is not used and may be
+                                           omitted when the storage is an `AtomicRateStorage`, as atomic updates
+                                           are thread-safe on their own.
+                                           When given with such a storage it is ignored, so it doesn't serialize the
+                                           checks with other code locking the same keys, which must update the rates
+                                           through the storage instead.
+
+    Methods
+    -------
+        limit_exceeded: Checks if any of the rate limits is exceeded for a given key.
+    """
+
+    rate_limits: Sequence[RateLimit]
+    rate_storage: RateStorage[T_contra]
+    key_mutex: Mutex[T_contra] | None = None
+    _atomic_storage: AtomicRateStorage[T_contra] | None = dataclasses.field(default=None, init=False, repr=False)
+    _buckets: tuple[tuple[int, float], ...] = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Detect whether the storage supports atomic updates and precompute the capacity and leak of the buckets."""
+        if not self.rate_limits:
+            msg = "At least one rate limit is required."
+            raise ValueError(msg)
+
+        if math.prod(rate_limit.operations + 1 for rate_limit in self.rate_limits) - 1 > MAX_PACKED_OPERATIONS:
+            msg = "The buckets of the rate limits don't fit in a 64-bit integer."
+            raise ValueError(msg)
+
+        if isinstance(self.rate_storage, AtomicRateStorage):
+            self._atomic_storage = self.rate_storage
+        elif self.key_mutex is None:
+            msg = "key_mutex is required for storages without atomic updates."
+            raise ValueError(msg)
+
+        self._buckets = tuple(
+            (rate_limit.operations, rate_limit.operations / rate_limit.period.total_seconds())
+            for rate_limit in self.rate_limits
+        )
+
+    @override
+    def limit_exceeded(self: Self, key: T_contra, cost: int = 1) -> bool:
+        """Check if any of the rate limits is exceeded for a given key.
+
+        Args:
+        ----
+        key (T_contra): The key to check the rate limits for.
+        cost (int): The number of operations the check adds to every bucket at once.
+
+        Returns:
+        -------
+        bool: True if any of the rate limits is exceeded, otherwise False.
+
+        Raises:
+        ------
+        ValueError: If the cost is lower than 1.
+        """
+        if cost < 1:
+            msg = "cost must be at least 1."
+            raise ValueError(msg)
+
+        leak: Callable[[Rate], Rate | None] = self._leak
+
+        if cost != 1:
+            leak = partial(self._leak, cost=cost)
+
+        atomic_storage = self._atomic_storage
+
+        if atomic_storage is not None:
+            return atomic_storage.update(key, leak) is None
+
+        # The mutex is validated to be present for storages without atomic updates
+        with cast(Mutex[T_contra], self.key_mutex).lock(key):
+            rate = leak(self.rate_storage.read(key))
+
+            if rate is None:
+                return True
+
+            self.rate_storage.write(key=key, value=rate)
+
+            return False
+
+    def _leak(self: Self, rate: Rate, cost: int = 1) -> Rate | None:
+        """Leak the buckets and add the operations to them, returning None if any of them would overflow."""
+        now = time.monotonic()
+        elapsed = now - rate.updated_at
+
+        packed = rate.operations
+        operations = 0
+        scale = 1
+
+        for capacity, leak_rate in self._buckets:
+            packed, bucket = divmod(packed, capacity + 1)
+
+            new_bucket = bucket + cost - int(elapsed * leak_rate)
+
+            if new_bucket > capacity:
+                return None
+
+            operations += max(new_bucket, 0) * scale
+            scale *= capacity + 1
+
+        return Rate(operations=operations, updated_at=now)
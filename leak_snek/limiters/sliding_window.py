@@ -0,0 +1,219 @@
+"""In-memory implementations of the sliding window algorithms."""
+from __future__ import annotations
+
+import array
+import dataclasses
+from collections import deque
+from collections.abc import Hashable
+from itertools import repeat
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Self, TypeVar, final, override
+
+from leak_snek.interfaces.limiters.rate_limiter import RateLimiter
+
+if TYPE_CHECKING:
+    from leak_snek.interfaces.values.rate_limit import RateLimit
+
+T_contra = TypeVar("T_contra", contravariant=True, bound=Hashable)
+
+
+@final
+@dataclasses.dataclass(slots=True)
+class WindowLog:
+    """A mutable per-key record holding the times of the operations made within the window.
+
+    Attributes
+    ----------
+    timestamps (deque[float]): The times of the operations made within the window, oldest first, represented in
+                               monotonic time.
+    lock (Lock): The lock guarding the log.
+    """
+
+    timestamps: deque[float]
+    lock: Lock = dataclasses.field(default_factory=Lock)
+
+
+@final
+@dataclasses.dataclass(slots=True)
+class SlidingWindowLogLimiter(RateLimiter[T_contra]):
+    """A sliding window log rate limiter keeping its whole state in memory.
+
+    The limiter logs the time of every allowed operation of a key and allows a new one only if fewer than
+    `rate_limit.operations` operations were made within the last `rate_limit.period`, so the limit holds exactly
+    for any rolling window, with no burst at window boundaries. The log of a key never holds more than
+    `rate_limit.operations` timestamps, which bounds the memory per key, but checks and memory grow with the limit,
+    use `SlidingWindowCounterLimiter` for large limits.
+
+    Attributes
+    ----------
+        rate_limit (RateLimit): The limit configuration detailing how many operations are allowed in a given period.
+        logs (dict[T_contra, WindowLog]): A dictionary mapping unique keys to their logs.
+
+    Methods
+    -------
+        limit_exceeded: Checks if the rate limit is exceeded for a given key.
+    """
+
+    rate_limit: RateLimit
+    logs: dict[T_contra, WindowLog] = dataclasses.field(default_factory=dict)
+    _period: float = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Precompute the length of the window in seconds."""
+        self._period = self.rate_limit.period.total_seconds()
+
+    @override
+    def limit_exceeded(self: Self, key: T_contra, cost: int = 1) -> bool:
+        """Check if the rate limit is exceeded for a given key.
+
+        Args:
+        ----
+        key (T_contra): The key to check the rate limit for.
+        cost (int): The number of operations the check accounts for at once.
+
+        Returns:
+        -------
+        bool: True if the rate limit is exceeded, otherwise False.
+
+        Raises:
+        ------
+        ValueError: If the cost is lower than 1.
+        """
+        if cost < 1:
+            msg = "cost must be at least 1."
+            raise ValueError(msg)
+
+        log = self.logs.get(key)
+
+        if log is None:
+            # `setdefault` is atomic, so concurrent first checks of the same key share a single log
+            log = self.logs.setdefault(key, WindowLog(timestamps=deque(maxlen=self.rate_limit.operations)))
+
+        with log.lock:
+            now = monotonic()
+            timestamps = log.timestamps
+            window_start = now - self._period
+
+            while timestamps and timestamps[0] <= window_start:
+                timestamps.popleft()
+
+            if len(timestamps) + cost > self.rate_limit.operations:
+                return True
+
+            timestamps.extend(repeat(now, cost))
+
+            return False
+
+
+@final
+@dataclasses.dataclass(slots=True)
+class WindowCounter:
+    """A mutable per-key record holding a ring of operation counts of consecutive sub-windows.
+
+    Attributes
+    ----------
+    counts (array.array[int]): The ring of operation counts, one more than the number of sub-windows of the window,
+                               so the counts of the sub-window partially overlapping the window are kept.
+    slot (int): The number of the sub-window the last operation was counted in, since the monotonic clock start.
+    total (int): The sum of all the counts of the ring.
+    lock (Lock): The lock guarding the counter.
+    """
+
+    counts: array.array[int]
+    slot: int
+    total: int = 0
+    lock: Lock = dataclasses.field(default_factory=Lock)
+
+
+@final
+@dataclasses.dataclass(slots=True)
+class SlidingWindowCounterLimiter(RateLimiter[T_contra]):
+    """A sliding window counter rate limiter keeping its whole state in memory.
+
+    The window of `rate_limit.period` is split in `sub_windows` sub-windows whose operations are counted in a ring
+    of a fixed size per key. The number of operations made within the last period is estimated as the sum of the
+    counts of the sub-windows it covers, taking the sub-window it partially overlaps in proportion to the overlap,
+    and an operation is allowed if the estimate stays within `rate_limit.operations`. Memory per key and time per
+    check only depend on the number of sub-windows, not on the limit or the traffic, and the estimate is exact when
+    the operations are evenly spread within the oldest sub-window, more sub-windows making it more precise.
+
+    Attributes
+    ----------
+        rate_limit (RateLimit): The limit configuration detailing how many operations are allowed in a given period.
+        sub_windows (int): The number of sub-windows the window is split in.
+        counters (dict[T_contra, WindowCounter]): A dictionary mapping unique keys to their counters.
+
+    Methods
+    -------
+        limit_exceeded: Checks if the rate limit is exceeded for a given key.
+    """
+
+    rate_limit: RateLimit
+    sub_windows: int = 10
+    counters: dict[T_contra, WindowCounter] = dataclasses.field(default_factory=dict)
+    _sub_window: float = dataclasses.field(init=False, repr=False)
+    _empty_counts: array.array[int] = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Precompute the length of a sub-window in seconds and the counts of an empty ring."""
+        self._sub_window = self.rate_limit.period.total_seconds() / self.sub_windows
+        self._empty_counts = array.array("q", bytes(8 * (self.sub_windows + 1)))
+
+    @override
+    def limit_exceeded(self: Self, key: T_contra, cost: int = 1) -> bool:
+        """Check if the rate limit is exceeded for a given key.
+
+        Args:
+        ----
+        key (T_contra): The key to check the rate limit for.
+        cost (int): The number of operations the check accounts for at once.
+
+        Returns:
+        -------
+        bool: True if the rate limit is exceeded, otherwise False.
+
+        Raises:
+        ------
+        ValueError: If the cost is lower than 1.
+        """
+        if cost < 1:
+            msg = "cost must be at least 1."
+            raise ValueError(msg)
+
+        counter = self.counters.get(key)
+
+        if counter is None:
+            # `setdefault` is atomic, so concurrent first checks of the same key share a single counter
+            counter = self.counters.setdefault(
+                key,
+                WindowCounter(counts=array.array("q", self._empty_counts), slot=int(monotonic() / self._sub_window)),
+            )
+
+        with counter.lock:
+            position = monotonic() / self._sub_window
+            slot = int(position)
+            counts = counter.counts
+            size = len(counts)
+
+            if slot - counter.slot >= size:
+                counts[:] = self._empty_counts
+                counter.total = 0
+            else:
+                # Clear the sub-windows that went by since the last operation, at most the whole ring
+                for passed_slot in range(counter.slot + 1, slot + 1):
+                    counter.total -= counts[passed_slot % size]
+                    counts[passed_slot % size] = 0
+
+            counter.slot = slot
+
+            # The oldest sub-window of the ring only overlaps the window for the part the current one hasn't covered
+            estimate = counter.total - counts[(slot + 1) % size] * (position - slot)
+
+            if estimate + cost > self.rate_limit.operations:
+                return True
+
+            counts[slot % size] += cost
+            counter.total += cost
+
+            return False
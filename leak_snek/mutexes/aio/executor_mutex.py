@@ -0,0 +1,144 @@
+"""Async adapter running a sync mutex in a thread pool."""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import threading
+from collections.abc import Hashable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
+from functools import partial
+from typing import TYPE_CHECKING, Any, Self, TypeVar, cast, final, override
+
+from leak_snek.interfaces.mutexes.aio.mutex import AsyncMutex
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from leak_snek.interfaces.mutexes.mutex import Mutex
+
+T_contra = TypeVar("T_contra", contravariant=True, bound=Hashable)
+
+
+@final
+@dataclasses.dataclass(slots=True)
+class ExecutorLockGuard(AbstractAsyncContextManager[None]):
+    """Async context manager acquiring the lock of a blocking mutex in a thread pool.
+
+    The lock is released by the thread that acquired it, which waits for the coroutine to exit the context, as
+    locks like `RLock` can only be released by their owner. If the coroutine is cancelled while the lock is being
+    acquired, the thread releases the lock as soon as it acquires it, so a cancelled coroutine never keeps a key
+    locked.
+
+    Attributes
+    ----------
+    executor (ThreadPoolExecutor): The thread pool acquiring and releasing the lock.
+    context (AbstractContextManager[Any]): The context manager of the blocking mutex holding the lock.
+    """
+
+    executor: ThreadPoolExecutor
+    context: AbstractContextManager[Any]
+    _released: threading.Event = dataclasses.field(default_factory=threading.Event, init=False, repr=False)
+    _exit_args: tuple[type[BaseException] | None, BaseException | None, TracebackType | None] = dataclasses.field(
+        default=(None, None, None),
+        init=False,
+        repr=False,
+    )
+    _holding: asyncio.Future[None] | None = dataclasses.field(default=None, init=False, repr=False)
+
+    @override
+    async def __aenter__(self: Self) -> None:
+        """Acquire the lock in the thread pool, the thread then holds it until the context is exited."""
+        loop = asyncio.get_running_loop()
+        acquired: asyncio.Future[None] = loop.create_future()
+        holding = loop.run_in_executor(self.executor, self._hold, loop, acquired)
+        holding.add_done_callback(partial(self._forward_failure, acquired))
+
+        try:
+            await asyncio.shield(acquired)
+        except asyncio.CancelledError:
+            self._released.set()
+            raise
+
+        self._holding = holding
+
+    @override
+    async def __aexit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Let the thread holding the lock release it and wait for it."""
+        self._exit_args = (exc_type, exc_val, tb)
+        self._released.set()
+
+        # The thread is validated to hold the lock once the context is entered
+        await cast(asyncio.Future[None], self._holding)
+
+    def _hold(self: Self, loop: asyncio.AbstractEventLoop, acquired: asyncio.Future[None]) -> None:
+        """Acquire the lock, report it to the coroutine and hold it until the context is exited or cancelled."""
+        self.context.__enter__()
+
+        try:
+            loop.call_soon_threadsafe(acquired.set_result, None)
+            self._released.wait()
+        finally:
+            self.context.__exit__(*self._exit_args)
+
+    def _forward_failure(self: Self, acquired: asyncio.Future[None], holding: asyncio.Future[None]) -> None:
+        """Fail the acquisition with the exception of the thread, unless the lock was acquired or given up."""
+        if not acquired.done() and not self._released.is_set():
+            acquired.set_exception(cast(BaseException, holding.exception()))
+
+
+@final
+@dataclasses.dataclass
+class AsyncExecutorMutex(AsyncMutex[T_contra]):
+    """An async mutex adapter acquiring the locks of a blocking mutex in a thread pool.
+
+    `AsyncExecutorMutex` lets `AsyncLeakyBucketLimiter` lock keys with a `Mutex` whose locks block, like
+    cross-process mutexes, without blocking the event loop. The mutex has a thread pool of its own, separate from
+    the one of `AsyncExecutorStorage`: coroutines waiting for a key may take all its threads, and the coroutine
+    holding the key must still be able to reach the storage to release it. Every lock is released by the thread that
+    acquired it, which holds it until the coroutine exits the context, so locks owned by threads like `RLock` are
+    supported.
+
+    Attributes
+    ----------
+    mutex (Mutex[T_contra]): The blocking mutex the locks are acquired from.
+    max_workers (int): The number of threads of the pool, bounding the number of locks being acquired or held at
+                       once, so coroutines holding a lock while waiting for another one may wait for a thread.
+
+    Methods
+    -------
+    lock: Provides an async context manager to lock access to a specific key, ensuring exclusive access to the
+          critical section of code associated with that key.
+    close: Waits for the locks being acquired and shuts the thread pool down.
+    """
+
+    mutex: Mutex[T_contra]
+    max_workers: int = 4
+    _executor: ThreadPoolExecutor = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Create the thread pool."""
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="leak-snek-mutex")
+
+    @override
+    def lock(self: Self, key: T_contra) -> ExecutorLockGuard:
+        """Lock the access to the given key, ensuring exclusive access to the associated critical section.
+
+        Args:
+        ----
+        key (T_contra): The key for which exclusive access is required.
+
+        Returns:
+        -------
+        ExecutorLockGuard: An async context manager holding the lock of the given key while entered.
+        """
+        return ExecutorLockGuard(executor=self._executor, context=self.mutex.lock(key))
+
+    def close(self: Self) -> None:
+        """Wait for the locks being acquired and shut the thread pool down."""
+        self._executor.shutdown(wait=True)
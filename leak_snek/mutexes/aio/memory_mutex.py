@@ -0,0 +1,129 @@
+"""Async mutex implementation storing locks in memory."""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from collections.abc import Hashable
+from contextlib import AbstractAsyncContextManager
+from typing import TYPE_CHECKING, Generic, Self, TypeVar, final, override
+
+from leak_snek.interfaces.mutexes.aio.mutex import AsyncMutex
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+T = TypeVar("T", bound=Hashable)
+T_contra = TypeVar("T_contra", contravariant=True, bound=Hashable)
+
+
+@final
+@dataclasses.dataclass(slots=True)
+class AsyncKeyLock:
+    """An async lock of a specific key together with the number of its current holders.
+
+    Attributes
+    ----------
+    lock (asyncio.Lock): The lock guarding the key.
+    holders (int): The number of coroutines holding or waiting for the lock.
+    """
+
+    lock: asyncio.Lock = dataclasses.field(default_factory=asyncio.Lock)
+    holders: int = 0
+
+
+@final
+@dataclasses.dataclass(slots=True)
+class AsyncKeyLockGuard(AbstractAsyncContextManager[None], Generic[T]):
+    """Async context manager holding the lock of a specific key of an `AsyncMemoryMutex`.
+
+    Entering the guard registers it as a holder of the key lock and acquires the lock, exiting it releases the lock
+    and removes the key lock from the mutex if the guard was its last holder.
+
+    Attributes
+    ----------
+    mutex (AsyncMemoryMutex[T]): The mutex the key lock belongs to.
+    key (T): The key to lock.
+    """
+
+    mutex: AsyncMemoryMutex[T]
+    key: T
+    _key_lock: AsyncKeyLock = dataclasses.field(init=False, repr=False)
+
+    @override
+    async def __aenter__(self: Self) -> None:
+        """Acquire the key lock, creating it if the key isn't locked by anyone else."""
+        key_locks = self.mutex.key_locks
+        key_lock = key_locks.get(self.key)
+
+        if key_lock is None:
+            key_lock = AsyncKeyLock()
+            key_locks[self.key] = key_lock
+
+        key_lock.holders += 1
+        self._key_lock = key_lock
+
+        try:
+            await key_lock.lock.acquire()
+        except BaseException:
+            self._release()
+            raise
+
+    @override
+    async def __aexit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Release the key lock, removing it from the mutex if there are no other holders."""
+        self._key_lock.lock.release()
+        self._release()
+
+    def _release(self: Self) -> None:
+        """Unregister the guard as a holder of the key lock."""
+        self._key_lock.holders -= 1
+
+        if not self._key_lock.holders:
+            del self.mutex.key_locks[self.key]
+
+
+@final
+@dataclasses.dataclass
+class AsyncMemoryMutex(AsyncMutex[T_contra]):
+    """Async mutex implementation that stores locks for specific keys in memory.
+
+    `AsyncMemoryMutex` is the asynchronous counterpart of `MemoryMutex`, meant to be used from a single event loop.
+    The bookkeeping of the key locks never suspends, so it needs no lock of its own, and acquiring a key nobody
+    else holds completes without suspending either. A key lock is removed once its last holder releases it,
+    including holders cancelled while waiting, so only the keys currently in use are tracked.
+
+    Attributes
+    ----------
+    key_locks (dict[T_contra, AsyncKeyLock]): A dictionary mapping unique keys to their corresponding
+                                              reference-counted locks.
+
+    Methods
+    -------
+    lock: Provides an async context manager to lock access to a specific key, ensuring exclusive access to the
+          critical section of code associated with that key.
+    """
+
+    key_locks: dict[T_contra, AsyncKeyLock] = dataclasses.field(default_factory=dict)
+
+    @override
+    def lock(self: Self, key: T_contra) -> AsyncKeyLockGuard[T_contra]:
+        """Lock the access to the given key, ensuring exclusive access to the associated critical section.
+
+        This method provides an async context manager that can be used with an `async with` statement. When
+        entering the context, the access to the provided key is locked, and when exiting the context, the lock is
+        released.
+
+        Args:
+        ----
+        key (T_contra): The key for which exclusive access is required.
+
+        Returns:
+        -------
+        AsyncKeyLockGuard[T_contra]: An async context manager holding the lock of the given key while entered.
+        """
+        return AsyncKeyLockGuard(mutex=self, key=key)
@@ -2,21 +2,105 @@
 from __future__ import annotations
 
 import dataclasses
-from collections.abc import Callable, Generator, Hashable
-from contextlib import AbstractContextManager, contextmanager
-from typing import Any, Generic, Protocol, Self, TypeVar, final, override
+from collections.abc import Callable, Hashable
+from contextlib import AbstractContextManager
+from typing import TYPE_CHECKING, Any, Generic, Protocol, Self, TypeVar, final, override
 
 from leak_snek.interfaces.mutexes.mutex import Mutex
 
+if TYPE_CHECKING:
+    from types import TracebackType
+
 
 class LockInterface(AbstractContextManager[Any], Protocol):
     """Interface representing any kind of lock supporting context manager interface."""
 
 
+T = TypeVar("T", bound=Hashable)
 T_contra = TypeVar("T_contra", contravariant=True, bound=Hashable)
 L = TypeVar("L", bound=LockInterface)
 
 
+@final
+@dataclasses.dataclass(slots=True)
+class KeyLock(Generic[L]):
+    """A lock of a specific key together with the number of its current holders.
+
+    Attributes
+    ----------
+    lock (L): The lock guarding the key.
+    holders (int): The number of callers holding or waiting for the lock.
+    """
+
+    lock: L
+    holders: int = 0
+
+
+@final
+@dataclasses.dataclass(slots=True)
+class KeyLockGuard(AbstractContextManager[None], Generic[T, L]):
+    """Context manager holding the lock of a specific key of a `MemoryMutex`.
+
+    Entering the guard registers it as a holder of the key lock and acquires the lock, exiting it releases the lock
+    and removes the key lock from the mutex if the guard was its last holder.
+
+    Attributes
+    ----------
+    mutex (MemoryMutex[T, L]): The mutex the key lock belongs to.
+    key (T): The key to lock.
+    """
+
+    mutex: MemoryMutex[T, L]
+    key: T
+    _key_lock: KeyLock[L] = dataclasses.field(init=False, repr=False)
+
+    @override
+    def __enter__(self: Self) -> None:
+        """Acquire the key lock, creating it if the key isn't locked by anyone else."""
+        mutex = self.mutex
+
+        with mutex.local_lock:
+            key_lock = mutex.key_locks.get(self.key)
+
+            if key_lock is None:
+                key_lock = KeyLock(lock=mutex.lock_factory())
+
+                mutex.key_locks[self.key] = key_lock
+
+            key_lock.holders += 1
+
+        self._key_lock = key_lock
+
+        try:
+            key_lock.lock.__enter__()
+        except BaseException:
+            self._release()
+            raise
+
+    @override
+    def __exit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Release the key lock, removing it from the mutex if there are no other holders."""
+        try:
+            self._key_lock.lock.__exit__(exc_type, exc_val, tb)
+        finally:
+            self._release()
+
+    def _release(self: Self) -> None:
+        """Unregister the guard as a holder of the key lock."""
+        mutex = self.mutex
+
+        with mutex.local_lock:
+            self._key_lock.holders -= 1
+
+            if not self._key_lock.holders:
+                del mutex.key_locks[self.key]
+
+
 @final
 @dataclasses.dataclass
 class MemoryMutex(Mutex[T_contra], Generic[T_contra, L]):
@@ -31,7 +115,9 @@ class MemoryMutex(Mutex[T_contra], Generic[T_contra, L]):
     local_lock (L): A local lock that protects the internal state of the `MemoryMutex`, ensuring
                     thread-safe operations when managing key-specific locks.
     lock_factory (Callable[[], L]): A factory function that creates a new lock instance whenever needed.
-    key_locks (dict[T_contra, L]): A dictionary mapping unique keys to their corresponding locks.
+    key_locks (dict[T_contra, KeyLock[L]]): A dictionary mapping unique keys to their corresponding reference-counted
+                                           locks. A key lock is removed once its last holder releases it, so only
+                                           the keys currently in use are tracked.
 
     Methods
     -------
@@ -41,11 +127,10 @@ class MemoryMutex(Mutex[T_contra], Generic[T_contra, L]):
 
     local_lock: L
     lock_factory: Callable[[], L]
-    key_locks: dict[T_contra, L] = dataclasses.field(default_factory=dict)
+    key_locks: dict[T_contra, KeyLock[L]] = dataclasses.field(default_factory=dict)
 
     @override
-    @contextmanager
-    def lock(self: Self, key: T_contra) -> Generator[None, None, None]:
+    def lock(self: Self, key: T_contra) -> KeyLockGuard[T_contra, L]:
         """Lock the access to the given key, ensuring exclusive access to the associated critical section.
 
         This method provides a context manager that can be used with a `with` statement. When entering the
@@ -55,18 +140,9 @@ class MemoryMutex(Mutex[T_contra], Generic[T_contra, L]):
         ----
         key (T_contra): The key for which exclusive access is required.
 
-        Yields:
-        ------
-        None: Yields once the lock for the given key is acquired.
-              The actual critical section of code should be placed inside the `with` block.
+        Returns:
+        -------
+        KeyLockGuard[T_contra, L]: A context manager holding the lock of the given key while entered.
+                                   The actual critical section of code should be placed inside the `with` block.
         """
-        with self.local_lock:
-            key_lock = self.key_locks.get(key)
-
-            if key_lock is None:
-                key_lock = self.lock_factory()
-
-                self.key_locks[key] = key_lock
-
-        with key_lock:
-            yield
+        return KeyLockGuard(mutex=self, key=key)
@@ -0,0 +1,198 @@
+"""Cross-process mutex implementation based on file record locks.
+
+This module relies on `fcntl` and is only available on POSIX systems.
+"""
+from __future__ import annotations
+
+import dataclasses
+import fcntl
+import hashlib
+import os
+from contextlib import AbstractContextManager, contextmanager
+from threading import Lock
+from typing import TYPE_CHECKING, Self, final, override
+
+from leak_snek.interfaces.mutexes.striping_mutex import StripingMutex
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+@final
+@dataclasses.dataclass(slots=True)
+class SharedFile:
+    """A file descriptor and thread locks shared by all the users of a file in the process, with their number.
+
+    Attributes
+    ----------
+    fd (int): The file descriptor.
+    locks (tuple[Lock, ...]): The thread locks serializing the threads of the process locking the slots of the file.
+    users (int): The number of mutexes using the file descriptor.
+    """
+
+    fd: int
+    locks: tuple[Lock, ...]
+    users: int = 1
+
+
+# Closing any descriptor of a file releases all the record locks held by the process on it, so every file is opened
+# once per process and only closed by the last of its users. Record locks don't exclude the threads of the process
+# holding them either, so the threads locking a file are serialized by thread locks shared by all its users too
+# The files are keyed by their real path, so the links to a file share its descriptor too
+shared_files: dict[str, SharedFile] = {}
+shared_files_lock = Lock()
+
+
+def open_shared_file(path: str, stripes: int) -> SharedFile:
+    """Open the file at the path, or share the descriptor and the thread locks the process already has for it.
+
+    Args:
+    ----
+    path (str): The path of the file, which is created if it doesn't exist.
+    stripes (int): The number of thread locks to create if the file isn't open yet.
+
+    Returns:
+    -------
+    SharedFile: The descriptor and the thread locks of the file, to be released with `close_shared_file`.
+    """
+    path = os.path.realpath(path)
+
+    with shared_files_lock:
+        shared_file = shared_files.get(path)
+
+        if shared_file is None:
+            shared_file = SharedFile(
+                fd=os.open(path, os.O_RDWR | os.O_CREAT, 0o600),
+                locks=tuple(Lock() for _ in range(stripes)),
+            )
+            shared_files[path] = shared_file
+        else:
+            shared_file.users += 1
+
+        return shared_file
+
+
+def close_shared_file(path: str) -> None:
+    """Release the descriptor of the file at the path, closing it if no other user of the process is left.
+
+    Args:
+    ----
+    path (str): The path the file was opened with by `open_shared_file`.
+    """
+    path = os.path.realpath(path)
+
+    with shared_files_lock:
+        shared_file = shared_files[path]
+        shared_file.users -= 1
+
+        if not shared_file.users:
+            del shared_files[path]
+            os.close(shared_file.fd)
+
+
+def stable_hash(key: str) -> int:
+    """Hash the key to a non-zero 64-bit integer that is the same in every process, unlike `hash()`."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+
+@final
+@dataclasses.dataclass
+class SharedMemoryMutex(StripingMutex[str]):
+    """Mutex implementation that locks keys across all the processes of a host.
+
+    `SharedMemoryMutex` maps every key onto one of `slots` byte ranges of the file at `path` and guards it with an
+    exclusive `fcntl` record lock, so any process opening the same file (forked or not) gets mutual exclusion with
+    no external service. Record locks are owned by processes rather than threads, so the threads of a process are
+    additionally serialized by a pool of `stripes` thread locks. The kernel releases the record locks of a process
+    when it dies, so a worker killed inside a critical section never blocks the others.
+
+    The kernel also releases them when the process closes any descriptor of the file, so all the mutexes of a process
+    locking the same file share a single descriptor, only closed with the last of them, and the same pool of thread
+    locks, created with the `stripes` of the first of them. The file must not be opened by other means while it is
+    locked.
+
+    The file may be the one of a `SharedMemoryStorage` with the same number of buckets as `slots`, in which case the
+    mutex locks the same buckets as the atomic updates of the storage.
+
+    Attributes
+    ----------
+    path (str): The path of the file whose byte ranges are locked. The file is created if it doesn't exist.
+    slots (int): The number of byte ranges the keys are spread over.
+    stripes (int): The number of thread locks serializing the threads of the process, unless another mutex of the
+                   process already locks the file.
+    fd (int): The descriptor of the file, shared by all the mutexes of the process locking the same path.
+
+    Methods
+    -------
+    lock: Provides a context manager to lock access to a specific key, ensuring exclusive access to the
+          critical section of code associated with that key.
+    lock_slot: Provides a context manager to lock access to a specific slot.
+    stripe: Returns the index of the thread lock guarding a specific key.
+    close: Releases the file, closing it if no other mutex of the process uses it.
+    """
+
+    path: str
+    slots: int = 65536
+    stripes: int = 64
+    fd: int = dataclasses.field(init=False, repr=False)
+    _locks: tuple[Lock, ...] = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Open the file and share its thread locks, preallocating them for the first mutex of the file."""
+        shared_file = open_shared_file(self.path, self.stripes)
+        self.fd = shared_file.fd
+        self._locks = shared_file.locks
+
+    @override
+    def lock(self: Self, key: str) -> AbstractContextManager[None]:
+        """Lock the access to the given key across all the processes, ensuring exclusive access to it.
+
+        Args:
+        ----
+        key (str): The key for which exclusive access is required.
+
+        Returns:
+        -------
+        AbstractContextManager[None]: A context manager holding the lock of the slot the key belongs to.
+        """
+        return self.lock_slot(stable_hash(key) % self.slots)
+
+    @override
+    def stripe(self: Self, key: str) -> int:
+        """Get the index of the thread lock guarding the given key.
+
+        Keys of the same slot always share a thread lock, so keys of distinct stripes never share a record lock.
+
+        Args:
+        ----
+        key (str): The key whose stripe is returned.
+
+        Returns:
+        -------
+        int: The index of the thread lock in the pool of the file.
+        """
+        return stable_hash(key) % self.slots % len(self._locks)
+
+    @contextmanager
+    def lock_slot(self: Self, slot: int) -> Generator[None, None, None]:
+        """Lock the access to the given slot across all the processes, ensuring exclusive access to it.
+
+        Args:
+        ----
+        slot (int): The index of the slot for which exclusive access is required.
+
+        Yields:
+        ------
+        None: Yields once the slot is locked both for the threads of the process and for the other processes.
+        """
+        with self._locks[slot % len(self._locks)]:
+            fcntl.lockf(self.fd, fcntl.LOCK_EX, 1, slot)
+
+            try:
+                yield
+            finally:
+                fcntl.lockf(self.fd, fcntl.LOCK_UN, 1, slot)
+
+    def close(self: Self) -> None:
+        """Release the file, closing it if no other mutex of the process uses it."""
+        close_shared_file(self.path)
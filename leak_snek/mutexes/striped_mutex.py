@@ -0,0 +1,72 @@
+"""Mutex implementation sharing a fixed pool of locks between keys."""
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Callable, Hashable
+from typing import Generic, Self, TypeVar, final, override
+
+from leak_snek.interfaces.mutexes.striping_mutex import StripingMutex
+from leak_snek.mutexes.memory_mutex import LockInterface
+
+T_contra = TypeVar("T_contra", contravariant=True, bound=Hashable)
+L = TypeVar("L", bound=LockInterface)
+
+
+@final
+@dataclasses.dataclass
+class StripedMutex(StripingMutex[T_contra], Generic[T_contra, L]):
+    """Mutex implementation that maps keys onto a fixed pool of locks.
+
+    `StripedMutex` preallocates `stripes` locks and guards every key with the lock selected by `hash(key) % stripes`.
+    Memory stays bounded regardless of the number of keys and no global lock is taken to find the key lock, at the
+    cost of unrelated keys sharing a stripe occasionally waiting for each other. Because of that, holding the locks
+    of two keys at once may deadlock unless `lock_factory` produces reentrant locks.
+
+    Attributes
+    ----------
+    lock_factory (Callable[[], L]): A factory function creating the locks of the pool.
+    stripes (int): The number of locks in the pool.
+
+    Methods
+    -------
+    lock: Provides a context manager to lock access to a specific key, ensuring exclusive access to the
+          critical section of code associated with that key.
+    stripe: Returns the index of the lock guarding a specific key.
+    """
+
+    lock_factory: Callable[[], L]
+    stripes: int = 1024
+    _locks: tuple[L, ...] = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Preallocate the pool of locks."""
+        self._locks = tuple(self.lock_factory() for _ in range(self.stripes))
+
+    @override
+    def lock(self: Self, key: T_contra) -> L:
+        """Lock the access to the given key, ensuring exclusive access to the associated critical section.
+
+        Args:
+        ----
+        key (T_contra): The key for which exclusive access is required.
+
+        Returns:
+        -------
+        L: The lock of the stripe the key belongs to.
+           The actual critical section of code should be placed inside the `with` block.
+        """
+        return self._locks[self.stripe(key)]
+
+    @override
+    def stripe(self: Self, key: T_contra) -> int:
+        """Get the index of the lock guarding the given key.
+
+        Args:
+        ----
+        key (T_contra): The key whose stripe is returned.
+
+        Returns:
+        -------
+        int: The index of the lock in the pool.
+        """
+        return hash(key) % self.stripes
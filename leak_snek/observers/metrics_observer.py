@@ -0,0 +1,188 @@
+"""The implementation of an observer counting the decisions and recording latencies in histograms."""
+from __future__ import annotations
+
+import dataclasses
+import math
+from bisect import bisect_left
+from threading import Lock
+from typing import Self, final, override
+
+from leak_snek.interfaces.observers.observer import Observer
+
+# Upper bounds of the latency buckets in seconds, from a microsecond to a second
+LATENCY_BOUNDS = (
+    1e-6,
+    2.5e-6,
+    5e-6,
+    1e-5,
+    2.5e-5,
+    5e-5,
+    1e-4,
+    2.5e-4,
+    5e-4,
+    1e-3,
+    2.5e-3,
+    5e-3,
+    1e-2,
+    2.5e-2,
+    5e-2,
+    1e-1,
+    2.5e-1,
+    5e-1,
+    1.0,
+)
+
+
+@final
+@dataclasses.dataclass(slots=True)
+class Histogram:
+    """A histogram counting values in buckets with fixed upper bounds.
+
+    Memory and time per observed value don't depend on the number of values, and quantiles are estimated as the upper
+    bound of the bucket holding them.
+
+    Attributes
+    ----------
+    bounds (tuple[float, ...]): The sorted upper bounds of the buckets, values above the last one are counted in an
+                                extra bucket.
+    counts (list[int]): The number of values counted in every bucket.
+    total (float): The sum of all the values.
+    lock (Lock): The lock guarding the counts.
+    """
+
+    bounds: tuple[float, ...] = LATENCY_BOUNDS
+    counts: list[int] = dataclasses.field(init=False)
+    total: float = 0.0
+    lock: Lock = dataclasses.field(default_factory=Lock, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Create a count for every bucket and for the values above the last bound."""
+        self.counts = [0] * (len(self.bounds) + 1)
+
+    @property
+    def count(self: Self) -> int:
+        """Get the number of values counted."""
+        return sum(self.counts)
+
+    def observe(self: Self, value: float) -> None:
+        """Count the value in the first bucket whose upper bound isn't below it.
+
+        Args:
+        ----
+        value (float): The value to count.
+        """
+        bucket = bisect_left(self.bounds, value)
+
+        with self.lock:
+            self.counts[bucket] += 1
+            self.total += value
+
+    def quantile(self: Self, quantile: float) -> float:
+        """Estimate the quantile of the values as the upper bound of the bucket holding it.
+
+        Args:
+        ----
+        quantile (float): The quantile to estimate, between 0 and 1.
+
+        Returns:
+        -------
+        float: The upper bound of the bucket holding the quantile, infinity if it's above the last bound, or NaN if no
+               value was counted.
+        """
+        counts = list(self.counts)
+        rank = quantile * sum(counts)
+        seen = 0
+
+        for bucket, count in enumerate(counts):
+            seen += count
+
+            if count and seen >= rank:
+                return self.bounds[bucket] if bucket < len(self.bounds) else math.inf
+
+        return math.nan
+
+
+@final
+@dataclasses.dataclass
+class MetricsObserver(Observer[object]):
+    """An observer counting the decisions and recording the lock waits and the storage latencies in histograms.
+
+    The metrics are aggregated over all the keys, so their memory doesn't grow with the number of keys, and a single
+    observer can be shared by several limiters.
+
+    Attributes
+    ----------
+        bounds (tuple[float, ...]): The upper bounds of the buckets of the latency histograms, in seconds.
+        allowed (int): The number of allowed operations.
+        denied (int): The number of operations denied because the rate limit was exceeded.
+        lock_wait (Histogram): The times checks waited to lock keys.
+        storage_latency (dict[str, Histogram]): The times of the storage calls, by storage method.
+
+    Methods
+    -------
+        decided: Counts an allowed or denied operation.
+        lock_waited: Records how long a check waited to lock a key.
+        storage_called: Records how long a storage call took.
+    """
+
+    bounds: tuple[float, ...] = LATENCY_BOUNDS
+    allowed: int = 0
+    denied: int = 0
+    lock_wait: Histogram = dataclasses.field(init=False)
+    storage_latency: dict[str, Histogram] = dataclasses.field(default_factory=dict)
+    _lock: Lock = dataclasses.field(default_factory=Lock, init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Create the lock wait histogram with the bounds."""
+        self.lock_wait = Histogram(self.bounds)
+
+    @property
+    def denied_ratio(self: Self) -> float:
+        """Get the share of the operations that were denied, or 0 if none was checked."""
+        checked = self.allowed + self.denied
+
+        return self.denied / checked if checked else 0.0
+
+    @override
+    def decided(self: Self, key: object, *, allowed: bool) -> None:
+        """Count an allowed or denied operation.
+
+        Args:
+        ----
+        key (object): The key the operation was checked for, not recorded.
+        allowed (bool): True if the operation was allowed, False if the rate limit was exceeded.
+        """
+        with self._lock:
+            if allowed:
+                self.allowed += 1
+            else:
+                self.denied += 1
+
+    @override
+    def lock_waited(self: Self, key: object, seconds: float) -> None:
+        """Record how long a check waited to lock a key.
+
+        Args:
+        ----
+        key (object): The key that was locked, not recorded.
+        seconds (float): The time it took to acquire the lock.
+        """
+        self.lock_wait.observe(seconds)
+
+    @override
+    def storage_called(self: Self, key: object, operation: str, seconds: float) -> None:
+        """Record how long a storage call took in the histogram of the storage method.
+
+        Args:
+        ----
+        key (object): The key the storage was called for, not recorded.
+        operation (str): The storage method that was called.
+        seconds (float): The time the call took.
+        """
+        histogram = self.storage_latency.get(operation)
+
+        if histogram is None:
+            # `setdefault` is atomic, so concurrent first calls of the same method share a single histogram
+            histogram = self.storage_latency.setdefault(operation, Histogram(self.bounds))
+
+        histogram.observe(seconds)
@@ -92,3 +92,29 @@ def rl(rate_limit: str) -> RateLimit:
         period = "1"
 
     return RateLimit(operations=int(operations), period=period_unit * float(period))
+
+
+def rls(rate_limits: str) -> list[RateLimit]:
+    """Parse a compound rate limit string and convert it into a list of RateLimit objects.
+
+    The compound string holds rate limit strings in the format accepted by `rl`, separated by semicolons.
+
+    Args:
+    ----
+    rate_limits: The compound rate limit string to be parsed.
+
+    Returns:
+    -------
+    list[RateLimit]: The RateLimit objects of the rate limit strings, in the same order.
+
+    Raises:
+    ------
+    ValueError: If any of the rate limit strings is not in the format accepted by `rl`.
+
+    Example:
+    -------
+    >>> rls("10/s;1000/h")
+    [RateLimit(operations=10, period=datetime.timedelta(seconds=1)),
+     RateLimit(operations=1000, period=datetime.timedelta(seconds=3600))]
+    """
+    return [rl(rate_limit) for rate_limit in rate_limits.split(";")]
@@ -0,0 +1,260 @@
+"""Async adapters running sync rate storages in a thread pool."""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from collections.abc import Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Self, TypeVar, final, override
+
+from leak_snek.interfaces.storages.aio.atomic_rate_store import AsyncAtomicRateStorage
+from leak_snek.interfaces.storages.aio.rate_store import AsyncRateStorage
+
+if TYPE_CHECKING:
+    from leak_snek.interfaces.storages.atomic_rate_store import AtomicRateStorage
+    from leak_snek.interfaces.storages.rate_store import RateStorage
+    from leak_snek.interfaces.values.rate import Rate
+
+R = TypeVar("R")
+T_contra = TypeVar("T_contra", contravariant=True, bound=Hashable)
+
+Call = tuple[Callable[[], Any], asyncio.Future[Any]]
+Outcome = tuple[Any, Exception | None]
+
+
+def run_calls(calls: list[Call]) -> list[Outcome]:
+    """Run the calls of a batch one after another, collecting their results and exceptions."""
+    outcomes: list[Outcome] = []
+
+    for call, _ in calls:
+        try:
+            outcomes.append((call(), None))
+        except Exception as exception:  # noqa: BLE001 - the exception is raised in the awaiting coroutine
+            outcomes.append((None, exception))
+
+    return outcomes
+
+
+@final
+@dataclasses.dataclass
+class ExecutorBatcher:
+    """Runs blocking calls made by many coroutines in a thread pool, a batch of calls per executor hop.
+
+    Calls made during the same iteration of the event loop are queued and run one after another, in order, by a
+    single task of the pool once the iteration ends, or as soon as `max_batch` calls are queued. Coroutines serving
+    concurrent requests usually reach their storage calls in the same iteration, so instead of scheduling a task,
+    waking a thread and waking the loop back for every call, the costs are paid once per batch.
+
+    Attributes
+    ----------
+    max_workers (int): The number of threads of the pool, bounding the number of batches running at once.
+    max_batch (int): The number of queued calls triggering a batch before the iteration ends.
+
+    Methods
+    -------
+    run: Runs a blocking call in the pool as part of the current batch and waits for its result.
+    close: Waits for the running batches and shuts the pool down.
+    """
+
+    max_workers: int = 4
+    max_batch: int = 256
+    _executor: ThreadPoolExecutor = dataclasses.field(init=False, repr=False)
+    _calls: list[Call] = dataclasses.field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Create the thread pool."""
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="leak-snek")
+
+    async def run(self: Self, call: Callable[[], R]) -> R:
+        """Run the blocking call in the pool as part of the current batch and wait for its result.
+
+        Args:
+        ----
+        call (Callable[[], R]): The blocking call to run.
+
+        Returns:
+        -------
+        R: The result of the call.
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[R] = loop.create_future()
+
+        self._calls.append((call, future))
+
+        if len(self._calls) >= self.max_batch:
+            self._flush(loop)
+        elif len(self._calls) == 1:
+            loop.call_soon(self._flush, loop)
+
+        return await future
+
+    def close(self: Self) -> None:
+        """Wait for the running batches and shut the pool down."""
+        self._executor.shutdown(wait=True)
+
+    def _flush(self: Self, loop: asyncio.AbstractEventLoop) -> None:
+        """Submit the queued calls to the pool as a single batch."""
+        calls, self._calls = self._calls, []
+
+        if not calls:
+            return
+
+        try:
+            batch = loop.run_in_executor(self._executor, run_calls, calls)
+        except RuntimeError as exception:
+            # The pool has been shut down
+            self._fail(calls, exception)
+        else:
+            batch.add_done_callback(lambda _: self._resolve(calls, batch))
+
+    @classmethod
+    def _resolve(cls: type[Self], calls: list[Call], batch: asyncio.Future[list[Outcome]]) -> None:
+        """Pass the outcomes of the batch to the coroutines still waiting for them."""
+        exception = batch.exception()
+
+        if exception is not None:
+            cls._fail(calls, exception)
+            return
+
+        for (_, future), (result, call_exception) in zip(calls, batch.result(), strict=True):
+            if future.done():
+                continue
+
+            if call_exception is None:
+                future.set_result(result)
+            else:
+                future.set_exception(call_exception)
+
+    @staticmethod
+    def _fail(calls: list[Call], exception: BaseException) -> None:
+        """Raise the exception in the coroutines still waiting for the calls."""
+        for _, future in calls:
+            if not future.done():
+                future.set_exception(exception)
+
+
+@final
+@dataclasses.dataclass
+class AsyncExecutorStorage(AsyncRateStorage[T_contra]):
+    """An async storage adapter running the operations of a blocking storage in a thread pool.
+
+    `AsyncExecutorStorage` lets `AsyncLeakyBucketLimiter` use a `RateStorage` whose operations block, like database
+    clients, without blocking the event loop. Concurrent reads and writes are batched into single executor hops by
+    an `ExecutorBatcher`. The storage has no atomic updates, so limiters need a mutex to use it, like
+    `AsyncExecutorMutex`. Use `AsyncExecutorAtomicStorage` for storages with atomic updates.
+
+    Attributes
+    ----------
+        storage (RateStorage[T_contra]): The blocking storage the operations are run on.
+        batcher (ExecutorBatcher): The batcher running the operations in its thread pool.
+
+    Methods
+    -------
+        read: Retrieves the access rate for a given key.
+        write: Sets the access rate for a specified key.
+        close: Waits for the running operations and shuts the thread pool down.
+    """
+
+    storage: RateStorage[T_contra]
+    batcher: ExecutorBatcher = dataclasses.field(default_factory=ExecutorBatcher)
+
+    @override
+    async def read(self: Self, key: T_contra) -> Rate:
+        """Retrieve the access rate for the specified key from the blocking storage.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be fetched.
+
+        Returns:
+        -------
+        Rate: The access rate associated with the given key.
+        """
+        return await self.batcher.run(lambda: self.storage.read(key))
+
+    @override
+    async def write(self: Self, key: T_contra, value: Rate) -> None:
+        """Set the access rate for a specified key in the blocking storage.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be set or updated.
+        value (Rate): The access rate to be set for the specified key.
+        """
+        await self.batcher.run(lambda: self.storage.write(key, value))
+
+    def close(self: Self) -> None:
+        """Wait for the running operations and shut the thread pool down."""
+        self.batcher.close()
+
+
+@final
+@dataclasses.dataclass
+class AsyncExecutorAtomicStorage(AsyncAtomicRateStorage[T_contra]):
+    """An async storage adapter running the operations of a blocking storage with atomic updates in a thread pool.
+
+    `AsyncExecutorAtomicStorage` behaves like `AsyncExecutorStorage`, and also runs the atomic updates of the
+    blocking storage in the thread pool, so limiters using it need no mutex.
+
+    Attributes
+    ----------
+        storage (AtomicRateStorage[T_contra]): The blocking storage the operations are run on.
+        batcher (ExecutorBatcher): The batcher running the operations in its thread pool.
+
+    Methods
+    -------
+        read: Retrieves the access rate for a given key.
+        write: Sets the access rate for a specified key.
+        update: Atomically replaces the access rate for a given key.
+        close: Waits for the running operations and shuts the thread pool down.
+    """
+
+    storage: AtomicRateStorage[T_contra]
+    batcher: ExecutorBatcher = dataclasses.field(default_factory=ExecutorBatcher)
+
+    @override
+    async def read(self: Self, key: T_contra) -> Rate:
+        """Retrieve the access rate for the specified key from the blocking storage.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be fetched.
+
+        Returns:
+        -------
+        Rate: The access rate associated with the given key.
+        """
+        return await self.batcher.run(lambda: self.storage.read(key))
+
+    @override
+    async def write(self: Self, key: T_contra, value: Rate) -> None:
+        """Set the access rate for a specified key in the blocking storage.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be set or updated.
+        value (Rate): The access rate to be set for the specified key.
+        """
+        await self.batcher.run(lambda: self.storage.write(key, value))
+
+    @override
+    async def update(self: Self, key: T_contra, function: Callable[[Rate], Rate | None]) -> Rate | None:
+        """Atomically replace the access rate for the specified key with the result of the function.
+
+        The function is called by a thread of the pool.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be updated.
+        function (Callable[[Rate], Rate | None]): The function computing the new rate from the current one,
+                                                   returning None to leave the stored rate unchanged.
+
+        Returns:
+        -------
+        Rate | None: The value returned by the function.
+        """
+        return await self.batcher.run(lambda: self.storage.update(key, function))
+
+    def close(self: Self) -> None:
+        """Wait for the running operations and shut the thread pool down."""
+        self.batcher.close()
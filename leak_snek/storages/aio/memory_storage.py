@@ -0,0 +1,109 @@
+"""The implementation of async in-memory rate storage."""
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Callable, Hashable
+from typing import Self, TypeVar, final, override
+
+from leak_snek.interfaces.storages.aio.nowait_rate_store import AsyncNowaitRateStorage
+from leak_snek.interfaces.values.rate import Rate
+
+T_contra = TypeVar("T_contra", contravariant=True, bound=Hashable)
+
+
+@final
+@dataclasses.dataclass
+class AsyncMemoryStorage(AsyncNowaitRateStorage[T_contra]):
+    """An async storage implementation that keeps access rates in memory.
+
+    `AsyncMemoryStorage` is the asynchronous counterpart of `MemoryStorage`, meant to be used from a single event
+    loop. None of its operations ever suspend, so updates are atomic without any lock, and `AsyncLeakyBucketLimiter`
+    checks limits over it with a plain dictionary lookup and no mutex.
+
+    Attributes
+    ----------
+        _rates (dict[T_contra, Rate]): An internal dictionary mapping unique keys to their respective access rates.
+
+    Methods
+    -------
+        read: Retrieves the access rate for a given key.
+        write: Sets the access rate for a specified key.
+        update: Atomically replaces the access rate for a given key.
+        update_nowait: Atomically replaces the access rate for a given key, without suspending.
+    """
+
+    _rates: dict[T_contra, Rate] = dataclasses.field(default_factory=dict)
+
+    @override
+    async def read(self: Self, key: T_contra) -> Rate:
+        """Retrieve the access rate for the specified key.
+
+        If the key does not exist in the storage, a default rate is set and returned.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be fetched.
+
+        Returns:
+        -------
+        Rate: The access rate associated with the given key.
+        """
+        rate = self._rates.get(key)
+
+        if rate is None:
+            rate = Rate.default()
+            self._rates[key] = rate
+
+        return rate
+
+    @override
+    async def write(self: Self, key: T_contra, value: Rate) -> None:
+        """Set the access rate for a specified key.
+
+        This method updates or inserts the access rate for the given key in the storage.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be set or updated.
+        value (Rate): The access rate to be set for the specified key.
+        """
+        self._rates[key] = value
+
+    @override
+    async def update(self: Self, key: T_contra, function: Callable[[Rate], Rate | None]) -> Rate | None:
+        """Atomically replace the access rate for the specified key with the result of the function.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be updated.
+        function (Callable[[Rate], Rate | None]): The function computing the new rate from the current one,
+                                                   returning None to leave the stored rate unchanged.
+
+        Returns:
+        -------
+        Rate | None: The value returned by the function.
+        """
+        return self.update_nowait(key, function)
+
+    @override
+    def update_nowait(self: Self, key: T_contra, function: Callable[[Rate], Rate | None]) -> Rate | None:
+        """Atomically replace the access rate for the specified key with the result of the function, without suspending.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be updated.
+        function (Callable[[Rate], Rate | None]): The function computing the new rate from the current one,
+                                                   returning None to leave the stored rate unchanged.
+
+        Returns:
+        -------
+        Rate | None: The value returned by the function.
+        """
+        rate = self._rates.get(key)
+
+        value = function(Rate.default() if rate is None else rate)
+
+        if value is not None:
+            self._rates[key] = value
+
+        return value
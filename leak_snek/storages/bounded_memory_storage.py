@@ -0,0 +1,116 @@
+"""The implementation of bounded in-memory rate storage."""
+from __future__ import annotations
+
+import dataclasses
+from collections import OrderedDict
+from collections.abc import Hashable
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Self, TypeVar, final, override
+
+from leak_snek.interfaces.storages.rate_store import RateStorage
+from leak_snek.interfaces.values.rate import Rate
+
+if TYPE_CHECKING:
+    from leak_snek.interfaces.values.rate_limit import RateLimit
+
+T_contra = TypeVar("T_contra", contravariant=True, bound=Hashable)
+
+
+@final
+@dataclasses.dataclass
+class BoundedMemoryStorage(RateStorage[T_contra]):
+    """A storage implementation that keeps a bounded number of access rates in memory.
+
+    `BoundedMemoryStorage` behaves like `MemoryStorage`, but doesn't let the number of tracked keys grow forever.
+    Rates are kept in least-recently-used order: every read performs an incremental sweep of up to `sweep_batch`
+    least recently used rates, dropping the ones that have fully leaked according to the `rate_limit` (their state
+    is the same as `Rate.default()`), so expiry is amortized over accesses instead of requiring a full scan.
+    When `max_keys` is set, writing a new key past the cap evicts the least recently used rate.
+
+    Attributes
+    ----------
+        rate_limit (RateLimit): The rate limit the stored rates leak by, used to detect fully leaked rates.
+        max_keys (int | None): The maximum number of tracked keys, or None to bound the storage by expiry only.
+        sweep_batch (int): The maximum number of least recently used rates inspected for expiry on every read.
+
+    Methods
+    -------
+        read: Retrieves the access rate for a given key.
+        write: Sets the access rate for a specified key.
+    """
+
+    rate_limit: RateLimit
+    max_keys: int | None = None
+    sweep_batch: int = 2
+    _rates: OrderedDict[T_contra, Rate] = dataclasses.field(default_factory=OrderedDict)
+    _lock: Lock = dataclasses.field(default_factory=Lock, init=False, repr=False)
+    _seconds_per_operation: float = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Precompute the time it takes for a single operation to leak."""
+        self._seconds_per_operation = self.rate_limit.period.total_seconds() / self.rate_limit.operations
+
+    def __len__(self: Self) -> int:
+        """Get the number of currently tracked keys."""
+        return len(self._rates)
+
+    @override
+    def read(self: Self, key: T_contra) -> Rate:
+        """Retrieve the access rate for the specified key.
+
+        If the key does not exist in the storage, a default rate is returned without being stored.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be fetched.
+
+        Returns:
+        -------
+        Rate: The access rate associated with the given key.
+        """
+        with self._lock:
+            self._sweep()
+
+            rate = self._rates.get(key)
+
+            if rate is None:
+                return Rate.default()
+
+            self._rates.move_to_end(key)
+
+            return rate
+
+    @override
+    def write(self: Self, key: T_contra, value: Rate) -> None:
+        """Set the access rate for a specified key.
+
+        This method updates or inserts the access rate for the given key in the storage,
+        evicting the least recently used rate if the `max_keys` cap is exceeded.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be set or updated.
+        value (Rate): The access rate to be set for the specified key.
+        """
+        with self._lock:
+            self._rates[key] = value
+            self._rates.move_to_end(key)
+
+            if self.max_keys is not None and len(self._rates) > self.max_keys:
+                self._rates.popitem(last=False)
+
+    def _sweep(self: Self) -> None:
+        """Drop up to `sweep_batch` least recently used rates, stopping at the first one that hasn't fully leaked."""
+        now = monotonic()
+
+        for _ in range(self.sweep_batch):
+            if not self._rates:
+                return
+
+            key, rate = next(iter(self._rates.items()))
+
+            if rate.updated_at + rate.operations * self._seconds_per_operation > now:
+                return
+
+            del self._rates[key]
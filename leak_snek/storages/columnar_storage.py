@@ -0,0 +1,246 @@
+"""The implementation of columnar in-memory rate storage backed by NumPy arrays.
+
+This module requires the optional `numpy` dependency, installable with the `numpy` extra.
+"""
+from __future__ import annotations
+
+import dataclasses
+import sys
+import time
+from collections.abc import Hashable, Iterable
+from threading import Lock
+from typing import TYPE_CHECKING, Self, TypeVar, final, override
+
+import numpy as np
+
+from leak_snek.interfaces.storages.rate_store import RateStorage
+from leak_snek.interfaces.values.rate import Rate
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+T_contra = TypeVar("T_contra", contravariant=True, bound=Hashable)
+
+MAX_LOAD_FACTOR = 0.75
+
+
+@final
+@dataclasses.dataclass
+class ColumnarStorage(RateStorage[T_contra]):
+    """A storage implementation that keeps access rates in preallocated typed arrays.
+
+    `ColumnarStorage` stores the `operations` and `updated_at` of every key in two NumPy columns instead of keeping
+    a `Rate` object per key, and maps keys to slot indices of those columns. By default the mapping is a dictionary
+    of the key objects. With `hash_keys` enabled the key objects aren't stored at all: slots are found by the 64-bit
+    `hash()` of the key in an open-addressing table living in the same arrays, which brings the cost of a key down
+    to a few dozen bytes. Distinct keys with equal hashes share a rate in that mode, and since string hashes are
+    randomized per process, the slots are only meaningful within the process that created them.
+
+    Operations are stored as 32-bit integers, which is enough for any bucket holding less than 2**31 operations.
+    The columns grow by doubling once full (or three quarters full with `hash_keys`), so growth is amortized over
+    inserts.
+
+    Attributes
+    ----------
+        capacity (int): The initial number of slots, rounded up to a power of two.
+        hash_keys (bool): Whether to map keys to slots by their hashes instead of storing the key objects.
+        operations (NDArray[int32]): The column of operations, indexed by slot.
+        updated_at (NDArray[float64]): The column of update timestamps in monotonic time, indexed by slot.
+        lock (Lock): The lock guarding the columns.
+
+    Methods
+    -------
+        read: Retrieves the access rate for a given key.
+        write: Sets the access rate for a specified key.
+        slots: Finds the slots of the given keys for vectorized access to the columns.
+    """
+
+    capacity: int = 1024
+    hash_keys: bool = False
+    _size: int = dataclasses.field(default=0, init=False, repr=False)
+    _slots: dict[T_contra, int] = dataclasses.field(default_factory=dict, init=False, repr=False)
+    _used: npt.NDArray[np.bool_] = dataclasses.field(init=False, repr=False)
+    _hashes: npt.NDArray[np.int64] = dataclasses.field(init=False, repr=False)
+    operations: npt.NDArray[np.int32] = dataclasses.field(init=False, repr=False)
+    updated_at: npt.NDArray[np.float64] = dataclasses.field(init=False, repr=False)
+    lock: Lock = dataclasses.field(default_factory=Lock, init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Preallocate the columns."""
+        self.capacity = 1 << max(self.capacity - 1, 1).bit_length()
+        self._used = np.zeros(self.capacity if self.hash_keys else 0, dtype=np.bool_)
+        self._hashes = np.zeros(self.capacity if self.hash_keys else 0, dtype=np.int64)
+        self.operations = np.zeros(self.capacity, dtype=np.int32)
+        self.updated_at = np.zeros(self.capacity, dtype=np.float64)
+
+    def __len__(self: Self) -> int:
+        """Get the number of stored keys."""
+        return self._size
+
+    @property
+    def nbytes(self: Self) -> int:
+        """Get the number of bytes taken by the columns and the slot mapping with its slot indices, excluding the keys.
+
+        The mapping is measured with a pass over the slot indices, so the property takes time linear in the number
+        of keys without `hash_keys`.
+        """
+        columns = self._used.nbytes + self._hashes.nbytes + self.operations.nbytes + self.updated_at.nbytes
+
+        if self.hash_keys:
+            return columns
+
+        return columns + sys.getsizeof(self._slots) + sum(map(sys.getsizeof, self._slots.values()))
+
+    @property
+    def bytes_per_key(self: Self) -> float:
+        """Get the average number of bytes taken by a stored key."""
+        return self.nbytes / max(self._size, 1)
+
+    @override
+    def read(self: Self, key: T_contra) -> Rate:
+        """Retrieve the access rate for the specified key.
+
+        If the key does not exist in the storage, a default rate is returned without being stored.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be fetched.
+
+        Returns:
+        -------
+        Rate: The access rate associated with the given key.
+        """
+        with self.lock:
+            slot = self._find(key)
+
+            if slot < 0:
+                return Rate.default()
+
+            return Rate(operations=int(self.operations[slot]), updated_at=float(self.updated_at[slot]))
+
+    @override
+    def write(self: Self, key: T_contra, value: Rate) -> None:
+        """Set the access rate for a specified key.
+
+        This method updates or inserts the access rate for the given key in the columns, growing them if needed.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be set or updated.
+        value (Rate): The access rate to be set for the specified key.
+        """
+        with self.lock:
+            slot = self._find(key)
+
+            if slot < 0:
+                slot = self._insert(key, ~slot)
+
+            self.operations[slot] = value.operations
+            self.updated_at[slot] = value.updated_at
+
+    def slots(self: Self, keys: Iterable[T_contra]) -> npt.NDArray[np.intp]:
+        """Find the slots of the given keys, storing default rates for the missing ones.
+
+        The slots index the `operations` and `updated_at` columns, which lets callers process the rates of many keys
+        with vectorized operations. The columns may be reallocated while storing missing keys, so they should be
+        accessed after this call, and the `lock` should be held for as long as the slots and columns are in use.
+
+        Args:
+        ----
+        keys (Iterable[T_contra]): The keys whose slots need to be found.
+
+        Returns:
+        -------
+        NDArray[intp]: The slots of the keys, in the same order as the keys.
+        """
+        now = time.monotonic()
+        slots = []
+
+        for key in keys:
+            slot = self._find(key)
+
+            if slot < 0:
+                slot = self._insert(key, ~slot)
+
+                self.operations[slot] = 0
+                self.updated_at[slot] = now
+
+            slots.append(slot)
+
+        return np.array(slots, dtype=np.intp)
+
+    def _find(self: Self, key: T_contra) -> int:
+        """Find the slot of the key, returning the bitwise negation of the slot to insert the key into if missing."""
+        if not self.hash_keys:
+            return self._slots.get(key, ~self._size)
+
+        key_hash = hash(key)
+        mask = self.capacity - 1
+        slot = key_hash & mask
+
+        while self._used[slot]:
+            if self._hashes[slot] == key_hash:
+                return slot
+
+            slot = (slot + 1) & mask
+
+        return ~slot
+
+    def _insert(self: Self, key: T_contra, slot: int) -> int:
+        """Occupy the given free slot with the key, growing the columns first if needed, and return the slot."""
+        if not self.hash_keys:
+            if self._size == self.capacity:
+                self._grow()
+
+            self._slots[key] = slot
+            self._size += 1
+
+            return slot
+
+        if self._size + 1 > self.capacity * MAX_LOAD_FACTOR:
+            self._grow()
+            slot = ~self._find(key)
+
+        self._used[slot] = True
+        self._hashes[slot] = hash(key)
+        self._size += 1
+
+        return slot
+
+    def _grow(self: Self) -> None:
+        """Double the capacity of the columns, rehashing the occupied slots with `hash_keys`."""
+        capacity = self.capacity * 2
+
+        if not self.hash_keys:
+            self.operations = np.concatenate((self.operations, np.zeros(self.capacity, dtype=np.int32)))
+            self.updated_at = np.concatenate((self.updated_at, np.zeros(self.capacity, dtype=np.float64)))
+            self.capacity = capacity
+
+            return
+
+        occupied = np.flatnonzero(self._used)
+        hashes = self._hashes[occupied]
+
+        self._used = np.zeros(capacity, dtype=np.bool_)
+        self._hashes = np.zeros(capacity, dtype=np.int64)
+        operations, self.operations = self.operations[occupied], np.zeros(capacity, dtype=np.int32)
+        updated_at, self.updated_at = self.updated_at[occupied], np.zeros(capacity, dtype=np.float64)
+        self.capacity = capacity
+
+        # Vectorized linear probing: every round, each pending key claims its slot if it's free and no other pending
+        # key claimed it first, the rest move on to the next slot
+        pending = np.arange(occupied.size)
+        slots = hashes & (capacity - 1)
+
+        while pending.size:
+            candidates = pending[~self._used[slots[pending]]]
+            claimed, first = np.unique(slots[candidates], return_index=True)
+            winners = candidates[first]
+
+            self._used[claimed] = True
+            self._hashes[claimed] = hashes[winners]
+            self.operations[claimed] = operations[winners]
+            self.updated_at[claimed] = updated_at[winners]
+
+            pending = np.setdiff1d(pending, winners, assume_unique=True)
+            slots[pending] = (slots[pending] + 1) & (capacity - 1)
@@ -1,19 +1,33 @@
 """The implementation of in-memory rate storage."""
 from __future__ import annotations
 
+import array
 import dataclasses
-from collections.abc import Hashable
-from typing import Self, TypeVar, final, override
-
-from leak_snek.interfaces.storages.rate_store import RateStorage
+import gc
+import struct
+import time
+from collections.abc import Callable, Hashable, Sequence
+from threading import Lock
+from typing import TYPE_CHECKING, Self, TypeVar, final, override
+
+from leak_snek.interfaces.storages.atomic_rate_store import AtomicRateStorage
+from leak_snek.interfaces.storages.batch_rate_store import BatchRateStorage
 from leak_snek.interfaces.values.rate import Rate
 
+if TYPE_CHECKING:
+    from typing import BinaryIO
+
 T_contra = TypeVar("T_contra", contravariant=True, bound=Hashable)
 
+# Magic number, number of keys, wall clock and monotonic clock times of the dump, in native byte order
+SNAPSHOT_HEADER = struct.Struct("=IQdd")
+SNAPSHOT_MAGIC = 0x4C534E50
+KEY_SEPARATOR = "\0"
+
 
 @final
 @dataclasses.dataclass
-class MemoryStorage(RateStorage[T_contra]):
+class MemoryStorage(AtomicRateStorage[T_contra], BatchRateStorage[T_contra]):
     """A storage implementation that keeps access rates in memory.
 
     `MemoryStorage` holds rates associated with specific keys directly in memory. This provides fast read and write
@@ -28,9 +42,14 @@ class MemoryStorage(RateStorage[T_contra]):
     -------
         read: Retrieves the access rate for a given key.
         write: Sets the access rate for a specified key.
+        update: Atomically replaces the access rate for a given key.
+        update_many: Atomically replaces the access rates for the given keys.
+        dump: Writes a binary snapshot of the string keyed rates to a file.
+        load: Creates a storage from a binary snapshot, rebasing the rates to the monotonic clock of the process.
     """
 
     _rates: dict[T_contra, Rate] = dataclasses.field(default_factory=dict)
+    _lock: Lock = dataclasses.field(default_factory=Lock, init=False, repr=False)
 
     @override
     def read(self: Self, key: T_contra) -> Rate:
@@ -46,25 +65,161 @@ class MemoryStorage(RateStorage[T_contra]):
         -------
         Rate: The access rate associated with the given key.
         """
-        rate = self._rates.get(key)
+        with self._lock:
+            rate = self._rates.get(key)
 
-        if rate is None:
-            rate = Rate.default()
-            self._rates[key] = rate
+            if rate is None:
+                rate = Rate.default()
+                self._rates[key] = rate
 
             return rate
 
-        return rate
-
     @override
     def write(self: Self, key: T_contra, value: Rate) -> None:
         """Set the access rate for a specified key.
 
-        This method updates or inserts the access rate for the given key in the storage.
+        This method updates or inserts the access rate for the given key in the storage, waiting for the updates in
+        progress.
 
         Args:
         ----
         key (T_contra): The key whose access rate needs to be set or updated.
         value (Rate): The access rate to be set for the specified key.
         """
-        self._rates[key] = value
+        with self._lock:
+            self._rates[key] = value
+
+    @override
+    def update(self: Self, key: T_contra, function: Callable[[Rate], Rate | None]) -> Rate | None:
+        """Atomically replace the access rate for the specified key with the result of the function.
+
+        Updates, reads and writes all take the lock of the storage, so an update is atomic with respect to all of
+        them, which lets rate limiters use the storage without a mutex.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be updated.
+        function (Callable[[Rate], Rate | None]): The function computing the new rate from the current one,
+                                                   returning None to leave the stored rate unchanged.
+
+        Returns:
+        -------
+        Rate | None: The value returned by the function.
+        """
+        with self._lock:
+            rate = self._rates.get(key)
+
+            value = function(Rate.default() if rate is None else rate)
+
+            if value is not None:
+                self._rates[key] = value
+
+            return value
+
+    @override
+    def update_many(
+        self: Self,
+        keys: Sequence[T_contra],
+        function: Callable[[list[Rate]], list[Rate] | None],
+    ) -> list[Rate] | None:
+        """Atomically replace the access rates for the specified keys with the result of the function.
+
+        Args:
+        ----
+        keys (Sequence[T_contra]): The keys whose access rates need to be updated.
+        function (Callable[[list[Rate]], list[Rate] | None]): The function computing the new rates from the current
+                                                               ones, returning None to leave the stored rates
+                                                               unchanged.
+
+        Returns:
+        -------
+        list[Rate] | None: The value returned by the function.
+        """
+        with self._lock:
+            rates = self._rates
+            values = function([rates.get(key) or Rate.default() for key in keys])
+
+            if values is not None:
+                rates.update(zip(keys, values, strict=True))
+
+            return values
+
+    def dump(self: MemoryStorage[str], file: BinaryIO) -> None:
+        """Write a binary snapshot of the rates to the file.
+
+        The snapshot holds the operations and the update times of all the keys in two arrays of machine values,
+        followed by the keys joined with NUL characters, so it can only be loaded on hosts with the same byte order.
+        The keys must be strings without NUL characters.
+
+        Args:
+        ----
+        file (BinaryIO): The binary file to write the snapshot to.
+
+        Raises:
+        ------
+        ValueError: If a key contains a NUL character.
+        """
+        # A single snapshot of the rates, so the keys and the rates stay aligned even if a key is added meanwhile
+        with self._lock:
+            items = list(self._rates.items())
+
+        keys = KEY_SEPARATOR.join([key for key, _ in items])
+
+        if keys.count(KEY_SEPARATOR) != max(len(items) - 1, 0):
+            msg = "Keys containing NUL characters can't be dumped."
+            raise ValueError(msg)
+
+        file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(items), time.time(), time.monotonic()))
+        file.write(array.array("q", [rate.operations for _, rate in items]).tobytes())
+        file.write(array.array("d", [rate.updated_at for _, rate in items]).tobytes())
+        file.write(keys.encode())
+
+    @classmethod
+    def load(cls: type[MemoryStorage[str]], file: BinaryIO) -> MemoryStorage[str]:
+        """Create a storage holding the rates of a binary snapshot written by `dump`.
+
+        Update times are monotonic, which makes them meaningless in another process or after a reboot, so they are
+        rebased to the monotonic clock of the process, shifted back by the wall clock time elapsed since the dump.
+        The buckets keep leaking for the time the service was down, as if it hadn't restarted.
+
+        Args:
+        ----
+        file (BinaryIO): The binary file to read the snapshot from.
+
+        Returns:
+        -------
+        MemoryStorage[str]: The storage holding the rates of the snapshot.
+
+        Raises:
+        ------
+        ValueError: If the file doesn't hold a snapshot.
+        """
+        data = memoryview(file.read())
+
+        if len(data) < SNAPSHOT_HEADER.size or SNAPSHOT_HEADER.unpack_from(data)[0] != SNAPSHOT_MAGIC:
+            msg = "The file doesn't hold a snapshot of memory storage."
+            raise ValueError(msg)
+
+        _, count, dumped_at, dumped_at_monotonic = SNAPSHOT_HEADER.unpack_from(data)
+        offset = time.monotonic() - max(time.time() - dumped_at, 0) - dumped_at_monotonic
+
+        operations, updated_at = array.array("q"), array.array("d")
+        operations_end = SNAPSHOT_HEADER.size + count * operations.itemsize
+        updated_at_end = operations_end + count * updated_at.itemsize
+
+        operations.frombytes(data[SNAPSHOT_HEADER.size : operations_end])
+        updated_at.frombytes(data[operations_end:updated_at_end])
+        keys = str(data[updated_at_end:], "utf-8").split(KEY_SEPARATOR) if count else []
+
+        # Millions of rates are allocated at once, with no garbage to collect, so collections are only overhead
+        gc_enabled = gc.isenabled()
+        gc.disable()
+
+        try:
+            rebased = [timestamp + offset for timestamp in updated_at]
+            rates = dict(zip(keys, map(Rate, operations, rebased), strict=True))
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        return cls(_rates=rates)
@@ -0,0 +1,125 @@
+"""The implementation of sharded in-memory rate storage."""
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Callable, Hashable
+from threading import Lock
+from typing import Generic, Self, TypeVar, final, override
+
+from leak_snek.interfaces.storages.atomic_rate_store import AtomicRateStorage
+from leak_snek.interfaces.values.rate import Rate
+
+K = TypeVar("K", bound=Hashable)
+T_contra = TypeVar("T_contra", contravariant=True, bound=Hashable)
+
+
+@final
+@dataclasses.dataclass(slots=True)
+class Shard(Generic[K]):
+    """A partition of the sharded storage with its own lock.
+
+    Attributes
+    ----------
+    rates (dict[K, Rate]): A dictionary mapping the keys of the partition to their respective access rates.
+    lock (Lock): The lock guarding the partition.
+    """
+
+    rates: dict[K, Rate] = dataclasses.field(default_factory=dict)
+    lock: Lock = dataclasses.field(default_factory=Lock)
+
+
+@final
+@dataclasses.dataclass
+class ShardedMemoryStorage(AtomicRateStorage[T_contra]):
+    """A storage implementation that keeps access rates in memory, partitioned across independent shards.
+
+    `ShardedMemoryStorage` behaves like `MemoryStorage`, but spreads keys across `shards` dictionaries selected by
+    `hash(key) % shards`, each guarded by its own lock. Threads working with keys of different shards never touch
+    the same dictionary, which lets the storage scale across cores on free-threaded Python builds where a single
+    shared dictionary becomes a point of contention. Atomic updates only lock the shard of the key, so rate limiters
+    using the storage need no mutex.
+
+    Attributes
+    ----------
+        shards (int): The number of independent shards.
+
+    Methods
+    -------
+        read: Retrieves the access rate for a given key.
+        write: Sets the access rate for a specified key.
+        update: Atomically replaces the access rate for a given key.
+    """
+
+    shards: int = 64
+    _shards: tuple[Shard[T_contra], ...] = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Preallocate the shards."""
+        self._shards = tuple(Shard() for _ in range(self.shards))
+
+    @override
+    def read(self: Self, key: T_contra) -> Rate:
+        """Retrieve the access rate for the specified key.
+
+        If the key does not exist in the storage, a default rate is set and returned.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be fetched.
+
+        Returns:
+        -------
+        Rate: The access rate associated with the given key.
+        """
+        shard = self._shards[hash(key) % self.shards]
+
+        with shard.lock:
+            rate = shard.rates.get(key)
+
+            if rate is None:
+                rate = Rate.default()
+                shard.rates[key] = rate
+
+            return rate
+
+    @override
+    def write(self: Self, key: T_contra, value: Rate) -> None:
+        """Set the access rate for a specified key.
+
+        This method updates or inserts the access rate for the given key in the shard the key belongs to.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be set or updated.
+        value (Rate): The access rate to be set for the specified key.
+        """
+        shard = self._shards[hash(key) % self.shards]
+
+        with shard.lock:
+            shard.rates[key] = value
+
+    @override
+    def update(self: Self, key: T_contra, function: Callable[[Rate], Rate | None]) -> Rate | None:
+        """Atomically replace the access rate for the specified key with the result of the function.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be updated.
+        function (Callable[[Rate], Rate | None]): The function computing the new rate from the current one,
+                                                   returning None to leave the stored rate unchanged.
+
+        Returns:
+        -------
+        Rate | None: The value returned by the function.
+        """
+        shard = self._shards[hash(key) % self.shards]
+
+        with shard.lock:
+            rate = shard.rates.get(key)
+
+            value = function(Rate.default() if rate is None else rate)
+
+            if value is not None:
+                shard.rates[key] = value
+
+            return value
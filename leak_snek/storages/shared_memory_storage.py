@@ -0,0 +1,186 @@
+"""The implementation of rate storage shared between the processes of a host.
+
+This module relies on `fcntl` and is only available on POSIX systems.
+"""
+from __future__ import annotations
+
+import dataclasses
+import fcntl
+import mmap
+import os
+import struct
+from typing import TYPE_CHECKING, Self, final, override
+
+from leak_snek.interfaces.storages.atomic_rate_store import AtomicRateStorage
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.mutexes.shared_memory_mutex import SharedMemoryMutex, stable_hash
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+HEADER = struct.Struct("<4sII")
+MAGIC = b"LSNK"
+SLOT = struct.Struct("<Qqd")
+
+
+@final
+@dataclasses.dataclass
+class SharedMemoryStorage(AtomicRateStorage[str]):
+    """A storage implementation that keeps access rates in a memory-mapped file shared by all the processes of a host.
+
+    `SharedMemoryStorage` lays out a fixed-size hash table in the file at `path` (put it on a memory-backed file
+    system such as `/dev/shm` to keep it off disk) and maps it into every process opening the same path, so all the
+    workers of a pre-fork server enforce a single bucket per key with no external service. The rates are kept in
+    monotonic time, which is shared by all the processes of a host.
+
+    The table is set-associative: a key is identified by its stable 64-bit hash and lives in one of the `ways`
+    slots of the bucket selected by the hash. When all the slots of a bucket are taken, a new key replaces the least
+    recently updated one, so the table never grows. Every operation locks the bucket of the key with the
+    `SharedMemoryMutex` of the storage, which makes updates atomic across threads and processes.
+
+    Attributes
+    ----------
+        path (str): The path of the file holding the table. The file is created and initialized if it's empty.
+        buckets (int): The number of buckets in the table, it must be the same in all the processes.
+        ways (int): The number of slots in a bucket, it must be the same in all the processes.
+        mutex (SharedMemoryMutex): The mutex locking the buckets of the table.
+
+    Methods
+    -------
+        read: Retrieves the access rate for a given key.
+        write: Sets the access rate for a specified key.
+        update: Atomically replaces the access rate for a given key.
+        close: Unmaps the file and closes the mutex.
+    """
+
+    path: str
+    buckets: int = 65536
+    ways: int = 8
+    mutex: SharedMemoryMutex = dataclasses.field(init=False, repr=False)
+    _fd: int = dataclasses.field(init=False, repr=False)
+    _table: mmap.mmap = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Open and map the file, initializing the table if the file is empty."""
+        # The descriptor of the mutex is shared, as closing another one would release the record locks of the mutex
+        self.mutex = SharedMemoryMutex(path=self.path, slots=self.buckets)
+        self._fd = self.mutex.fd
+
+        size = HEADER.size + self.buckets * self.ways * SLOT.size
+
+        # The header is locked past the bucket locks, so that concurrently started processes initialize it only once
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, self.buckets)
+
+        try:
+            if not os.fstat(self._fd).st_size:
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, HEADER.pack(MAGIC, self.buckets, self.ways), 0)
+
+            header = os.pread(self._fd, HEADER.size, 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, self.buckets)
+
+        if header != HEADER.pack(MAGIC, self.buckets, self.ways):
+            self.mutex.close()
+
+            msg = f"{self.path} doesn't hold a table of {self.buckets} buckets of {self.ways} ways."
+            raise ValueError(msg)
+
+        self._table = mmap.mmap(self._fd, size)
+
+    @override
+    def read(self: Self, key: str) -> Rate:
+        """Retrieve the access rate for the specified key.
+
+        If the key does not exist in the storage, a default rate is returned without being stored.
+
+        Args:
+        ----
+        key (str): The key whose access rate needs to be fetched.
+
+        Returns:
+        -------
+        Rate: The access rate associated with the given key.
+        """
+        key_hash = stable_hash(key)
+        bucket = key_hash % self.buckets
+
+        with self.mutex.lock_slot(bucket):
+            _, rate = self._find(key_hash, bucket)
+
+        return Rate.default() if rate is None else rate
+
+    @override
+    def write(self: Self, key: str, value: Rate) -> None:
+        """Set the access rate for a specified key.
+
+        This method updates or inserts the access rate for the given key in the table,
+        replacing the least recently updated key of the bucket if it is full.
+
+        Args:
+        ----
+        key (str): The key whose access rate needs to be set or updated.
+        value (Rate): The access rate to be set for the specified key.
+        """
+        key_hash = stable_hash(key)
+        bucket = key_hash % self.buckets
+
+        with self.mutex.lock_slot(bucket):
+            offset, _ = self._find(key_hash, bucket)
+
+            SLOT.pack_into(self._table, offset, key_hash, value.operations, value.updated_at)
+
+    @override
+    def update(self: Self, key: str, function: Callable[[Rate], Rate | None]) -> Rate | None:
+        """Atomically replace the access rate for the specified key with the result of the function.
+
+        Updates are atomic across all the threads and processes using the table.
+
+        Args:
+        ----
+        key (str): The key whose access rate needs to be updated.
+        function (Callable[[Rate], Rate | None]): The function computing the new rate from the current one,
+                                                   returning None to leave the stored rate unchanged.
+
+        Returns:
+        -------
+        Rate | None: The value returned by the function.
+        """
+        key_hash = stable_hash(key)
+        bucket = key_hash % self.buckets
+
+        with self.mutex.lock_slot(bucket):
+            offset, rate = self._find(key_hash, bucket)
+
+            value = function(Rate.default() if rate is None else rate)
+
+            if value is not None:
+                SLOT.pack_into(self._table, offset, key_hash, value.operations, value.updated_at)
+
+            return value
+
+    def close(self: Self) -> None:
+        """Unmap the file and close the mutex, closing the file if no other mutex of the process uses it."""
+        self._table.close()
+        self.mutex.close()
+
+    def _find(self: Self, key_hash: int, bucket: int) -> tuple[int, Rate | None]:
+        """Find the offset of the slot of the key in its bucket along with its rate, or the slot to store it into."""
+        offset = HEADER.size + bucket * self.ways * SLOT.size
+        victim, victim_updated_at = offset, float("inf")
+
+        for _ in range(self.ways):
+            slot_hash, operations, updated_at = SLOT.unpack_from(self._table, offset)
+
+            if slot_hash == key_hash:
+                return offset, Rate(operations=operations, updated_at=updated_at)
+
+            if not slot_hash:
+                return offset, None
+
+            if updated_at < victim_updated_at:
+                victim, victim_updated_at = offset, updated_at
+
+            offset += SLOT.size
+
+        return victim, None
@@ -0,0 +1,241 @@
+"""The implementation of SQLite rate storage."""
+from __future__ import annotations
+
+import dataclasses
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Self, final, override
+
+from leak_snek.interfaces.storages.atomic_rate_store import AtomicRateStorage
+from leak_snek.interfaces.storages.batch_rate_store import BatchRateStorage
+from leak_snek.interfaces.values.rate import Rate
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+CREATE = """
+CREATE TABLE IF NOT EXISTS rates (
+    key TEXT PRIMARY KEY,
+    operations INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+CREATE_CLOCK = """
+CREATE TABLE IF NOT EXISTS clock (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    wall_offset REAL NOT NULL
+)
+"""
+SELECT_CLOCK = "SELECT wall_offset FROM clock WHERE id = 0"
+UPSERT_CLOCK = """
+INSERT INTO clock (id, wall_offset) VALUES (0, ?)
+ON CONFLICT (id) DO UPDATE SET wall_offset = excluded.wall_offset
+"""
+REBASE = "UPDATE rates SET updated_at = updated_at + ?"
+# How far the wall clock may drift from the monotonic one before the update times are considered from another boot
+CLOCK_TOLERANCE = 1.0
+SELECT = "SELECT operations, updated_at FROM rates WHERE key = ?"
+UPSERT = """
+INSERT INTO rates (key, operations, updated_at) VALUES (?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET operations = excluded.operations, updated_at = excluded.updated_at
+"""
+
+
+@final
+@dataclasses.dataclass
+class SQLiteStorage(AtomicRateStorage[str], BatchRateStorage[str]):
+    """A storage implementation that keeps access rates in an SQLite database.
+
+    `SQLiteStorage` persists rates in the `rates` table of the database at `path`, so they survive restarts and are
+    shared by all the processes of a host opening the same database. The database is switched to WAL mode with
+    `synchronous=NORMAL`, which lets readers run concurrently with the writer and defers the syncs of committed
+    writes to checkpoints. Every thread works with its own connection, whose statement cache keeps the few
+    statements of the storage prepared. The connections of threads that exited are closed when a new one is opened.
+
+    Atomic updates take the write lock of the database with `BEGIN IMMEDIATE` and store the new rate with a single
+    upsert, so rate limiters using the storage need no mutex, even across processes. Updates of several keys take
+    the write lock once for all of them and store the new rates with a single batch of upserts.
+
+    The rates are kept in monotonic time, along with the offset of the wall clock from the monotonic one. Monotonic
+    time restarts from an arbitrary point when the host reboots, so when the offset moved by more than a second since
+    the rates were stored, they are rebased to the new monotonic clock once the database is opened, shifted back by
+    the wall clock time elapsed since. The buckets keep leaking for the time the host was down.
+
+    Attributes
+    ----------
+        path (str): The path of the database file. The database and the table are created if they don't exist.
+        timeout (float): How many seconds to wait for the write lock of the database before raising an error.
+
+    Methods
+    -------
+        read: Retrieves the access rate for a given key.
+        write: Sets the access rate for a specified key.
+        update: Atomically replaces the access rate for a given key.
+        update_many: Atomically replaces the access rates for the given keys.
+        close: Closes the connections of all the threads.
+    """
+
+    path: str
+    timeout: float = 5.0
+    _local: threading.local = dataclasses.field(default_factory=threading.local, init=False, repr=False)
+    _connections: dict[threading.Thread, sqlite3.Connection] = dataclasses.field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+    )
+    _lock: threading.Lock = dataclasses.field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Switch the database to WAL mode, create the tables and rebase the rates stored before a reboot."""
+        connection = self._connection()
+
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(CREATE)
+        connection.execute(CREATE_CLOCK)
+
+        offset = time.time() - time.monotonic()
+
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+
+            row = connection.execute(SELECT_CLOCK).fetchone()
+
+            if row is None:
+                connection.execute(UPSERT_CLOCK, (offset,))
+            elif abs(row[0] - offset) > CLOCK_TOLERANCE:
+                # The host rebooted since the rates were stored, the monotonic time elapsed since is the wall time
+                connection.execute(REBASE, (row[0] - offset,))
+                connection.execute(UPSERT_CLOCK, (offset,))
+
+    @override
+    def read(self: Self, key: str) -> Rate:
+        """Retrieve the access rate for the specified key.
+
+        If the key does not exist in the storage, a default rate is returned without being stored.
+
+        Args:
+        ----
+        key (str): The key whose access rate needs to be fetched.
+
+        Returns:
+        -------
+        Rate: The access rate associated with the given key.
+        """
+        row = self._connection().execute(SELECT, (key,)).fetchone()
+
+        return Rate.default() if row is None else Rate(operations=row[0], updated_at=row[1])
+
+    @override
+    def write(self: Self, key: str, value: Rate) -> None:
+        """Set the access rate for a specified key.
+
+        This method updates or inserts the access rate for the given key in the database.
+
+        Args:
+        ----
+        key (str): The key whose access rate needs to be set or updated.
+        value (Rate): The access rate to be set for the specified key.
+        """
+        self._connection().execute(UPSERT, (key, value.operations, value.updated_at))
+
+    @override
+    def update(self: Self, key: str, function: Callable[[Rate], Rate | None]) -> Rate | None:
+        """Atomically replace the access rate for the specified key with the result of the function.
+
+        The rate is read and written in a single immediate transaction, which makes updates atomic across all the
+        threads and processes using the database. The transaction is rolled back if the function raises.
+
+        Args:
+        ----
+        key (str): The key whose access rate needs to be updated.
+        function (Callable[[Rate], Rate | None]): The function computing the new rate from the current one,
+                                                   returning None to leave the stored rate unchanged.
+
+        Returns:
+        -------
+        Rate | None: The value returned by the function.
+        """
+        connection = self._connection()
+
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+
+            row = connection.execute(SELECT, (key,)).fetchone()
+
+            value = function(Rate.default() if row is None else Rate(operations=row[0], updated_at=row[1]))
+
+            if value is not None:
+                connection.execute(UPSERT, (key, value.operations, value.updated_at))
+
+            return value
+
+    @override
+    def update_many(
+        self: Self,
+        keys: Sequence[str],
+        function: Callable[[list[Rate]], list[Rate] | None],
+    ) -> list[Rate] | None:
+        """Atomically replace the access rates for the specified keys with the result of the function.
+
+        The rates are read and written in a single immediate transaction, like the ones of `update`.
+
+        Args:
+        ----
+        keys (Sequence[str]): The keys whose access rates need to be updated.
+        function (Callable[[list[Rate]], list[Rate] | None]): The function computing the new rates from the current
+                                                               ones, returning None to leave the stored rates
+                                                               unchanged.
+
+        Returns:
+        -------
+        list[Rate] | None: The value returned by the function.
+        """
+        connection = self._connection()
+
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+
+            rows = [connection.execute(SELECT, (key,)).fetchone() for key in keys]
+
+            values = function(
+                [Rate.default() if row is None else Rate(operations=row[0], updated_at=row[1]) for row in rows],
+            )
+
+            if values is not None:
+                connection.executemany(
+                    UPSERT,
+                    [(key, value.operations, value.updated_at) for key, value in zip(keys, values, strict=True)],
+                )
+
+            return values
+
+    def close(self: Self) -> None:
+        """Close the connections of all the threads."""
+        with self._lock:
+            for connection in self._connections.values():
+                connection.close()
+
+            self._connections.clear()
+            self._local = threading.local()
+
+    def _connection(self: Self) -> sqlite3.Connection:
+        """Get the connection of the current thread, opening it on first use."""
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+
+        if connection is None:
+            # Transactions are managed explicitly, outside of them every statement is committed on its own
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA synchronous=NORMAL")
+
+            with self._lock:
+                # Threads don't close their connections when they exit, so thread pools replacing their threads
+                # would otherwise keep opening new ones
+                for thread in [thread for thread in self._connections if not thread.is_alive()]:
+                    self._connections.pop(thread).close()
+
+                self._connections[threading.current_thread()] = connection
+
+            self._local.connection = connection
+
+        return connection
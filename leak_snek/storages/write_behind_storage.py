@@ -0,0 +1,227 @@
+"""The implementation of write-behind rate storage."""
+from __future__ import annotations
+
+import dataclasses
+import threading
+from collections.abc import Callable, Hashable
+from itertools import islice
+from typing import TYPE_CHECKING, Self, TypeVar, final, override
+
+from leak_snek.interfaces.storages.atomic_rate_store import AtomicRateStorage
+
+if TYPE_CHECKING:
+    from leak_snek.interfaces.storages.rate_store import RateStorage
+    from leak_snek.interfaces.values.rate import Rate
+
+T_contra = TypeVar("T_contra", contravariant=True, bound=Hashable)
+
+
+@final
+@dataclasses.dataclass
+class WriteBehindStorage(AtomicRateStorage[T_contra]):
+    """A storage wrapper that serves rates from memory and writes them to a slower storage in the background.
+
+    `WriteBehindStorage` keeps an authoritative copy of the rates of `storage` in memory: a key is read from the
+    wrapped storage once, then reads and writes only touch the local copy. Written rates are coalesced per key, so
+    a key written many times between flushes is written to the wrapped storage once, with its latest rate.
+
+    A background thread flushes the pending writes every `flush_interval` seconds, or as soon as `batch_size` keys
+    are pending, which bounds how stale the wrapped storage gets. Writes failing during a background flush are kept
+    pending and retried on the next one, unless the key has been written again in the meantime. Failed background
+    flushes are counted in `failed_flushes` and their exceptions passed to `on_flush_error`. Call `flush` to write
+    the pending rates synchronously and `close` to stop the background thread on shutdown.
+
+    When `max_keys` is set, every flush evicts the least recently written keys of the local copy past the cap, once
+    their rates are in the wrapped storage, so they are read from it again on their next use. Keys whose writes are
+    pending are never evicted, so the local copy may exceed the cap while the wrapped storage fails.
+
+    The local copy is only authoritative for a single process: other processes writing to the same keys of the
+    wrapped storage aren't seen once the keys are loaded. Atomic updates only lock the local copy, so rate limiters
+    using the storage need no mutex and never wait for the wrapped storage, except to load a key.
+
+    Attributes
+    ----------
+        storage (RateStorage[T_contra]): The wrapped storage the rates are loaded from and written to.
+        batch_size (int): The number of pending keys triggering a flush before the interval elapses.
+        flush_interval (float): The maximum number of seconds between flushes.
+        max_keys (int | None): The number of keys the local copy is trimmed to on every flush, or None to keep all
+                               the loaded keys.
+        on_flush_error (Callable[[Exception], None] | None): Function receiving the exceptions of the failed
+                                                             background flushes, from the background thread. It must
+                                                             not raise.
+        failed_flushes (int): The number of failed background flushes.
+
+    Methods
+    -------
+        read: Retrieves the access rate for a given key.
+        write: Sets the access rate for a specified key.
+        update: Atomically replaces the access rate for a given key.
+        flush: Writes the pending rates to the wrapped storage.
+        close: Stops the background thread and flushes the pending rates.
+    """
+
+    storage: RateStorage[T_contra]
+    batch_size: int = 256
+    flush_interval: float = 0.1
+    max_keys: int | None = None
+    on_flush_error: Callable[[Exception], None] | None = None
+    failed_flushes: int = dataclasses.field(default=0, init=False)
+    _rates: dict[T_contra, Rate] = dataclasses.field(default_factory=dict, init=False, repr=False)
+    _pending: dict[T_contra, Rate] = dataclasses.field(default_factory=dict, init=False, repr=False)
+    _condition: threading.Condition = dataclasses.field(default_factory=threading.Condition, init=False, repr=False)
+    _flush_lock: threading.Lock = dataclasses.field(default_factory=threading.Lock, init=False, repr=False)
+    _closed: bool = dataclasses.field(default=False, init=False, repr=False)
+    _evictions: int = dataclasses.field(default=0, init=False, repr=False)
+    _thread: threading.Thread = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        """Start the background thread flushing the pending rates."""
+        self._thread = threading.Thread(target=self._run, name="leak-snek-write-behind", daemon=True)
+        self._thread.start()
+
+    @override
+    def read(self: Self, key: T_contra) -> Rate:
+        """Retrieve the access rate for the specified key.
+
+        If the key hasn't been loaded yet, it is read from the wrapped storage.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be fetched.
+
+        Returns:
+        -------
+        Rate: The access rate associated with the given key.
+        """
+        while (rate := self._rates.get(key)) is None:
+            self._load(key)
+
+        return rate
+
+    @override
+    def write(self: Self, key: T_contra, value: Rate) -> None:
+        """Set the access rate for a specified key.
+
+        The rate is set in the local copy right away and written to the wrapped storage on the next flush.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be set or updated.
+        value (Rate): The access rate to be set for the specified key.
+        """
+        with self._condition:
+            self._store(key, value)
+
+    @override
+    def update(self: Self, key: T_contra, function: Callable[[Rate], Rate | None]) -> Rate | None:
+        """Atomically replace the access rate for the specified key with the result of the function.
+
+        Updates are atomic with respect to each other and to `write` calls. The new rate is written to the wrapped
+        storage on the next flush.
+
+        Args:
+        ----
+        key (T_contra): The key whose access rate needs to be updated.
+        function (Callable[[Rate], Rate | None]): The function computing the new rate from the current one,
+                                                   returning None to leave the stored rate unchanged.
+
+        Returns:
+        -------
+        Rate | None: The value returned by the function.
+        """
+        while True:
+            with self._condition:
+                rate = self._rates.get(key)
+
+                if rate is not None:
+                    value = function(rate)
+
+                    if value is not None:
+                        self._store(key, value)
+
+                    return value
+
+            self._load(key)
+
+    def flush(self: Self) -> None:
+        """Write the pending rates to the wrapped storage.
+
+        If a write fails, the rates that haven't been written are kept pending and the exception is raised. The keys
+        of the local copy past `max_keys` are evicted either way.
+        """
+        with self._flush_lock:
+            with self._condition:
+                remaining, self._pending = list(self._pending.items()), {}
+
+            try:
+                while remaining:
+                    key, value = remaining[-1]
+                    self.storage.write(key, value)
+                    remaining.pop()
+            finally:
+                with self._condition:
+                    for key, value in remaining:
+                        self._pending.setdefault(key, value)
+
+                    self._evict()
+
+    def close(self: Self) -> None:
+        """Stop the background thread and flush the pending rates."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+        self._thread.join()
+        self.flush()
+
+    def _load(self: Self, key: T_contra) -> None:
+        """Read the rate of the key from the wrapped storage into the local copy, unless it has been set meanwhile."""
+        evictions = self._evictions
+        rate = self.storage.read(key)
+
+        with self._condition:
+            # A key evicted during the read may have been written and flushed after it, so the read is discarded
+            if evictions == self._evictions:
+                self._rates.setdefault(key, rate)
+
+    def _store(self: Self, key: T_contra, value: Rate) -> None:
+        """Set the rate in the local copy and queue it for the next flush, the condition must be held."""
+        # The key is moved to the end, so the local copy stays in the order the keys were last written
+        self._rates.pop(key, None)
+        self._rates[key] = value
+        self._pending[key] = value
+
+        if len(self._pending) >= self.batch_size:
+            self._condition.notify()
+
+    def _evict(self: Self) -> None:
+        """Evict the least recently written keys past `max_keys` that aren't pending, the condition must be held."""
+        if self.max_keys is None or len(self._rates) <= self.max_keys:
+            return
+
+        evicted = [key for key in islice(self._rates, len(self._rates) - self.max_keys) if key not in self._pending]
+
+        for key in evicted:
+            del self._rates[key]
+
+        self._evictions += 1
+
+    def _run(self: Self) -> None:
+        """Flush the pending rates every flush interval, or once enough of them are pending, until closed."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or len(self._pending) >= self.batch_size,
+                    timeout=self.flush_interval,
+                )
+
+                if self._closed:
+                    return
+
+            try:
+                self.flush()
+            except Exception as error:  # noqa: BLE001 - failed writes are kept pending and retried on the next flush
+                self.failed_flushes += 1
+
+                if self.on_flush_error is not None:
+                    self.on_flush_error(error)
@@ -0,0 +1,52 @@
+"""Test async coarse clock."""
+import asyncio
+import time
+
+import pytest
+
+from leak_snek.clocks.aio.coarse_clock import AsyncCoarseClock
+
+
+async def test_coarse_clock() -> None:
+    """Test that async coarse clock returns a cached time refreshed by the event loop until closed."""
+    # Given: async coarse clock refreshing the time every millisecond
+    clock = AsyncCoarseClock(resolution=0.001)
+    started_at = clock.monotonic()
+
+    # When: the clock is read again without yielding to the event loop
+    time.sleep(0.01)  # noqa: ASYNC101 - blocks the event loop on purpose
+
+    # Then: the time isn't refreshed
+    assert clock.monotonic() == started_at
+
+    # When: the event loop runs the refresh
+    await asyncio.sleep(0.01)
+
+    # Then: the time moved forward, but not past the system clock
+    assert started_at < clock.monotonic() <= time.monotonic()
+
+    # When: the clock is closed
+    clock.close()
+    closed_at = clock.monotonic()
+    await asyncio.sleep(0.01)
+
+    # Then: the time is no longer refreshed
+    assert clock.monotonic() == closed_at
+
+
+def test_coarse_clock_no_loop() -> None:
+    """Test that async coarse clock requires a running event loop."""
+    # Given: no running event loop
+    # When: async coarse clock is created
+    # Then: corresponding exception is raised
+    with pytest.raises(RuntimeError):
+        AsyncCoarseClock()
+
+
+async def test_coarse_clock_invalid_resolution() -> None:
+    """Test that async coarse clock rejects resolutions that aren't positive."""
+    # Given: a resolution of zero
+    # When: async coarse clock is created with it
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match="resolution must be positive."):
+        AsyncCoarseClock(resolution=0)
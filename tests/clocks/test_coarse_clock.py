@@ -0,0 +1,39 @@
+"""Test coarse clock."""
+import time
+
+import pytest
+
+from leak_snek.clocks.coarse_clock import CoarseClock
+
+
+def test_coarse_clock() -> None:
+    """Test that coarse clock returns a cached time refreshed in the background until closed."""
+    # Given: coarse clock refreshing the time every millisecond
+    clock = CoarseClock(resolution=0.001)
+    started_at = clock.monotonic()
+
+    # When: the clock is read again until it is refreshed
+    deadline = time.monotonic() + 1
+
+    while clock.monotonic() == started_at and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+    # Then: the time moved forward, but not past the system clock
+    assert started_at < clock.monotonic() <= time.monotonic()
+
+    # When: the clock is closed
+    clock.close()
+    closed_at = clock.monotonic()
+    time.sleep(0.01)
+
+    # Then: the time is no longer refreshed
+    assert clock.monotonic() == closed_at
+
+
+def test_coarse_clock_invalid_resolution() -> None:
+    """Test that coarse clock rejects resolutions that aren't positive."""
+    # Given: a resolution of zero
+    # When: coarse clock is created with it
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match="resolution must be positive."):
+        CoarseClock(resolution=0)
@@ -1,10 +1,16 @@
 """Test async rate limit decorator."""
 import dataclasses
 from collections.abc import Awaitable
-from typing import Self, final
+from datetime import timedelta
+from typing import Self, cast, final
 
-from leak_snek.decorators.aio.rate_limit import async_rate_limit
-from tests.fakes.aio.limiter import FakeAsyncRateLimiter
+from leak_snek.decorators.aio.rate_limit import async_rate_limit, async_waiting_rate_limit
+from leak_snek.interfaces.limiters.aio.waiting_rate_limiter import AsyncWaitingRateLimiter
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.aio.leaky_bucket import AsyncLeakyBucketLimiter
+from tests.fakes.aio.limiter import FakeAsyncRateLimiter, FakeAsyncWaitingRateLimiter
+from tests.fakes.aio.storage import FakeAsyncAtomicStorage
+from tests.fakes.observer import FakeObserver
 
 
 @final
@@ -23,6 +29,26 @@ class FakeAsyncFunction:
         return inner()
 
 
+@final
+@dataclasses.dataclass
+class KeyOnlyAsyncRateLimiter:
+    """Fake async rate limiter whose checks don't take a cost, recording the keys."""
+
+    keys: list[str] = dataclasses.field(default_factory=list)
+
+    async def limit_exceeded(self: Self, key: str) -> bool:
+        """Record the key and never exceed the limit."""
+        self.keys.append(key)
+
+        return False
+
+    async def acquire(self: Self, key: str, timeout: float | None = None) -> bool:
+        """Record the key and acquire unless the timeout is negative."""
+        self.keys.append(key)
+
+        return timeout is None or timeout >= 0
+
+
 async def test_rate_limit() -> None:
     """Test that decorated async function is called when limit is not exceeded."""
     # Given: rate limiter in not exceeded state
@@ -53,3 +79,136 @@ async def test_rate_limit_exceeded() -> None:
 
     # Then: the function is not called
     assert not function.called
+
+
+async def test_waiting_rate_limit() -> None:
+    """Test that decorated async function is called once the limiter allows it within the timeout."""
+    # Given: waiting rate limiter allowing operations within the timeout
+    rate_limiter = FakeAsyncWaitingRateLimiter[str](acquired=True)
+    decorator = async_waiting_rate_limit(rate_limiter, lambda: "key", None, timeout=1.5)
+    function = FakeAsyncFunction()
+
+    decorated = decorator(function)
+
+    # When: function decorated with the waiting limiter is called
+    await decorated()
+
+    # Then: the limiter waits with the timeout and the function is called
+    assert rate_limiter.timeouts == [1.5]
+    assert function.called
+
+
+async def test_waiting_rate_limit_timeout() -> None:
+    """Test that decorated async function is not called when the limiter doesn't allow it within the timeout."""
+    # Given: waiting rate limiter not allowing operations within the timeout
+    rate_limiter = FakeAsyncWaitingRateLimiter[str](acquired=False)
+    decorator = async_waiting_rate_limit(rate_limiter, lambda: "key", None)
+    function = FakeAsyncFunction()
+
+    decorated = decorator(function)
+
+    # When: function decorated with the waiting limiter is called
+    await decorated()
+
+    # Then: the function is not called
+    assert not function.called
+
+
+async def test_rate_limit_cost() -> None:
+    """Test that decorated async function calls cost the operations computed from their arguments."""
+    # Given: rate limiter in not exceeded state and waiting rate limiter allowing operations
+    rate_limiter = FakeAsyncRateLimiter[str](exceeded=False)
+    waiting_rate_limiter = FakeAsyncWaitingRateLimiter[str](acquired=True)
+    function = FakeAsyncFunction()
+
+    decorated = async_rate_limit(rate_limiter, lambda: "key", None, cost=lambda: 3)(function)
+    waiting_decorated = async_waiting_rate_limit(waiting_rate_limiter, lambda: "key", None, cost=lambda: 5)(function)
+
+    # When: the decorated functions are called
+    await decorated()
+    await waiting_decorated()
+
+    # Then: the limiters are charged with the computed costs
+    assert rate_limiter.costs == [3]
+    assert waiting_rate_limiter.costs == [5]
+
+
+async def test_rate_limit_observer() -> None:
+    """Test that decorated async function calls report whether they were allowed to the observer."""
+    # Given: rate limiter in exceeded state and waiting rate limiter allowing operations, with observer
+    observer: FakeObserver[str] = FakeObserver()
+    function = FakeAsyncFunction()
+
+    decorated = async_rate_limit(FakeAsyncRateLimiter[str](exceeded=True), lambda: "key", None, observer=observer)(
+        function,
+    )
+    waiting_decorated = async_waiting_rate_limit(
+        FakeAsyncWaitingRateLimiter[str](acquired=True),
+        lambda: "waiting_key",
+        None,
+        observer=observer,
+    )(function)
+
+    # When: the decorated functions are called
+    await decorated()
+    await waiting_decorated()
+
+    # Then: the decisions are reported with the keys
+    assert observer.events == [("decided", "key", False), ("decided", "waiting_key", True)]
+
+
+async def test_rate_limit_without_cost() -> None:
+    """Test that decorated function calls pass no cost to the async limiter without a cost function."""
+    # Given: async rate limiter whose checks only take the key
+    rate_limiter = KeyOnlyAsyncRateLimiter()
+    limiter = cast(AsyncWaitingRateLimiter[str], rate_limiter)
+    function = FakeAsyncFunction()
+
+    decorated = async_rate_limit(limiter, lambda: "key", None)(function)
+    waiting_decorated = async_waiting_rate_limit(limiter, lambda: "waiting_key", None)(function)
+
+    # When: the decorated functions are called
+    await decorated()
+    await waiting_decorated()
+
+    # Then: the limiter is called with the keys alone
+    assert rate_limiter.keys == ["key", "waiting_key"]
+    assert function.called
+
+
+async def test_rate_limit_limiter_observer() -> None:
+    """Test that decorated async function calls don't report the decisions again to the observer of the limiter."""
+    # Given: async rate limiter allowing 1 operation per minute reporting to the same observer as the decorator
+    observer: FakeObserver[str] = FakeObserver()
+    rate_limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncAtomicStorage(),
+        observer=observer,
+    )
+    decorated = async_rate_limit(rate_limiter, lambda: "key", None, observer=observer)(FakeAsyncFunction())
+
+    # When: the decorated function is called
+    await decorated()
+
+    # Then: the decision is reported once, by the limiter
+    assert observer.events == [("storage_called", "key", "update"), ("decided", "key", True)]
+
+
+async def test_rate_limit_other_limiter_observer() -> None:
+    """Test that decorated async function calls report the decisions to their observer and to the one of the limiter."""
+    # Given: async rate limiter allowing 1 operation per minute reporting to another observer than the decorator
+    observer: FakeObserver[str] = FakeObserver()
+    limiter_observer: FakeObserver[str] = FakeObserver()
+    rate_limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncAtomicStorage(),
+        observer=limiter_observer,
+    )
+    decorated = async_rate_limit(rate_limiter, lambda: "key", None, observer=observer)(FakeAsyncFunction())
+
+    # When: the decorated function is called
+    await decorated()
+
+    # Then: the decision is reported to both observers
+    assert observer.events == [("decided", "key", True)]
+    assert limiter_observer.events == [("storage_called", "key", "update"), ("decided", "key", True)]
@@ -1,9 +1,15 @@
 """Test rate limit decorator."""
 import dataclasses
-from typing import Self, final
+from datetime import timedelta
+from typing import Self, cast, final
 
-from leak_snek.decorators.rate_limit import rate_limit
-from tests.fakes.limiter import FakeRateLimiter
+from leak_snek.decorators.rate_limit import rate_limit, waiting_rate_limit
+from leak_snek.interfaces.limiters.waiting_rate_limiter import WaitingRateLimiter
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.leaky_bucket import LeakyBucketLimiter
+from tests.fakes.limiter import FakeRateLimiter, FakeWaitingRateLimiter
+from tests.fakes.observer import FakeObserver
+from tests.fakes.storage import FakeAtomicStorage
 
 
 @final
@@ -18,6 +24,26 @@ class FakeFunction:
         self.called = True
 
 
+@final
+@dataclasses.dataclass
+class KeyOnlyRateLimiter:
+    """Fake rate limiter whose checks don't take a cost, recording the keys."""
+
+    keys: list[str] = dataclasses.field(default_factory=list)
+
+    def limit_exceeded(self: Self, key: str) -> bool:
+        """Record the key and never exceed the limit."""
+        self.keys.append(key)
+
+        return False
+
+    def acquire(self: Self, key: str, timeout: float | None = None) -> bool:
+        """Record the key and acquire unless the timeout is negative."""
+        self.keys.append(key)
+
+        return timeout is None or timeout >= 0
+
+
 def test_rate_limit() -> None:
     """Test that decorated function is called when limit is not exceeded."""
     # Given: rate limiter in not exceeded state
@@ -48,3 +74,134 @@ def test_rate_limit_exceeded() -> None:
 
     # Then: the function is not called
     assert not function.called
+
+
+def test_waiting_rate_limit() -> None:
+    """Test that decorated function is called once the limiter allows it within the timeout."""
+    # Given: waiting rate limiter allowing operations within the timeout
+    rate_limiter = FakeWaitingRateLimiter[str](acquired=True)
+    decorator = waiting_rate_limit(rate_limiter, lambda: "key", None, timeout=1.5)
+    function = FakeFunction()
+
+    decorated = decorator(function)
+
+    # When: function decorated with the waiting limiter is called
+    decorated()
+
+    # Then: the limiter waits with the timeout and the function is called
+    assert rate_limiter.timeouts == [1.5]
+    assert function.called
+
+
+def test_waiting_rate_limit_timeout() -> None:
+    """Test that decorated function is not called when the limiter doesn't allow it within the timeout."""
+    # Given: waiting rate limiter not allowing operations within the timeout
+    rate_limiter = FakeWaitingRateLimiter[str](acquired=False)
+    decorator = waiting_rate_limit(rate_limiter, lambda: "key", None)
+    function = FakeFunction()
+
+    decorated = decorator(function)
+
+    # When: function decorated with the waiting limiter is called
+    decorated()
+
+    # Then: the function is not called
+    assert not function.called
+
+
+def test_rate_limit_cost() -> None:
+    """Test that decorated function calls cost the operations computed from their arguments."""
+    # Given: rate limiter in not exceeded state and waiting rate limiter allowing operations
+    rate_limiter = FakeRateLimiter[str](exceeded=False)
+    waiting_rate_limiter = FakeWaitingRateLimiter[str](acquired=True)
+    function = FakeFunction()
+
+    decorated = rate_limit(rate_limiter, lambda: "key", None, cost=lambda: 3)(function)
+    waiting_decorated = waiting_rate_limit(waiting_rate_limiter, lambda: "key", None, cost=lambda: 5)(function)
+
+    # When: the decorated functions are called
+    decorated()
+    waiting_decorated()
+
+    # Then: the limiters are charged with the computed costs
+    assert rate_limiter.costs == [3]
+    assert waiting_rate_limiter.costs == [5]
+
+
+def test_rate_limit_observer() -> None:
+    """Test that decorated function calls report whether they were allowed to the observer."""
+    # Given: rate limiter in exceeded state and waiting rate limiter allowing operations, with observer
+    observer: FakeObserver[str] = FakeObserver()
+    function = FakeFunction()
+
+    decorated = rate_limit(FakeRateLimiter[str](exceeded=True), lambda: "key", None, observer=observer)(function)
+    waiting_decorated = waiting_rate_limit(
+        FakeWaitingRateLimiter[str](acquired=True),
+        lambda: "waiting_key",
+        None,
+        observer=observer,
+    )(function)
+
+    # When: the decorated functions are called
+    decorated()
+    waiting_decorated()
+
+    # Then: the decisions are reported with the keys
+    assert observer.events == [("decided", "key", False), ("decided", "waiting_key", True)]
+
+
+def test_rate_limit_without_cost() -> None:
+    """Test that decorated function calls pass no cost to the limiter without a cost function."""
+    # Given: rate limiter whose checks only take the key
+    rate_limiter = KeyOnlyRateLimiter()
+    limiter = cast(WaitingRateLimiter[str], rate_limiter)
+    function = FakeFunction()
+
+    decorated = rate_limit(limiter, lambda: "key", None)(function)
+    waiting_decorated = waiting_rate_limit(limiter, lambda: "waiting_key", None)(function)
+
+    # When: the decorated functions are called
+    decorated()
+    waiting_decorated()
+
+    # Then: the limiter is called with the keys alone
+    assert rate_limiter.keys == ["key", "waiting_key"]
+    assert function.called
+
+
+def test_rate_limit_limiter_observer() -> None:
+    """Test that decorated function calls don't report the decisions again to the observer of the limiter."""
+    # Given: rate limiter allowing 1 operation per minute reporting to the same observer as the decorator
+    observer: FakeObserver[str] = FakeObserver()
+    rate_limiter: LeakyBucketLimiter[str] = LeakyBucketLimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAtomicStorage(),
+        observer=observer,
+    )
+    decorated = rate_limit(rate_limiter, lambda: "key", None, observer=observer)(FakeFunction())
+
+    # When: the decorated function is called
+    decorated()
+
+    # Then: the decision is reported once, by the limiter
+    assert observer.events == [("storage_called", "key", "update"), ("decided", "key", True)]
+
+
+def test_rate_limit_other_limiter_observer() -> None:
+    """Test that decorated function calls report the decisions to their observer besides the one of the limiter."""
+    # Given: rate limiter allowing 1 operation per minute reporting to another observer than the decorator
+    observer: FakeObserver[str] = FakeObserver()
+    limiter_observer: FakeObserver[str] = FakeObserver()
+    rate_limiter: LeakyBucketLimiter[str] = LeakyBucketLimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAtomicStorage(),
+        observer=limiter_observer,
+    )
+    decorated = rate_limit(rate_limiter, lambda: "key", None, observer=observer)(FakeFunction())
+
+    # When: the decorated function is called
+    decorated()
+
+    # Then: the decision is reported to both observers
+    assert observer.events == [("decided", "key", True)]
+    assert limiter_observer.events == [("storage_called", "key", "update"), ("decided", "key", True)]
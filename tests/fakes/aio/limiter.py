@@ -3,6 +3,7 @@ import dataclasses
 from typing import Self, TypeVar, final, override
 
 from leak_snek.interfaces.limiters.aio.rate_limiter import AsyncRateLimiter
+from leak_snek.interfaces.limiters.aio.waiting_rate_limiter import AsyncWaitingRateLimiter
 
 T_contra = TypeVar("T_contra", contravariant=True)
 
@@ -10,11 +11,44 @@ T_contra = TypeVar("T_contra", contravariant=True)
 @final
 @dataclasses.dataclass
 class FakeAsyncRateLimiter(AsyncRateLimiter[T_contra]):
-    """Fake rate limiter implementation with control over limit exceeded state."""
+    """Fake rate limiter implementation with control over limit exceeded state, recording the costs."""
 
     exceeded: bool
+    costs: list[int] = dataclasses.field(default_factory=list)
 
     @override
-    async def limit_exceeded(self: Self, key: T_contra) -> bool:  # - unused arg is ok in fake
-        """Return static exceeded state ignoring the key."""
+    async def limit_exceeded(self: Self, key: T_contra, cost: int = 1) -> bool:  # - unused arg is ok in fake
+        """Record the cost and return static exceeded state ignoring the key."""
+        self.costs.append(cost)
+
         return self.exceeded
+
+
+@final
+@dataclasses.dataclass
+class FakeAsyncWaitingRateLimiter(AsyncWaitingRateLimiter[T_contra]):
+    """Fake waiting rate limiter implementation with control over acquired state, recording timeouts and costs."""
+
+    acquired: bool
+    timeouts: list[float | None] = dataclasses.field(default_factory=list)
+    costs: list[int] = dataclasses.field(default_factory=list)
+
+    @override
+    async def limit_exceeded(self: Self, key: T_contra, cost: int = 1) -> bool:  # - unused arg is ok in fake
+        """Record the cost and return static exceeded state ignoring the key."""
+        self.costs.append(cost)
+
+        return not self.acquired
+
+    @override
+    async def acquire(
+        self: Self,
+        key: T_contra,  # - unused arg is ok in fake
+        timeout: float | None = None,
+        cost: int = 1,
+    ) -> bool:
+        """Record the timeout and the cost and return static acquired state ignoring the key."""
+        self.timeouts.append(timeout)
+        self.costs.append(cost)
+
+        return self.acquired
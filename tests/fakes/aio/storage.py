@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import dataclasses
-from collections.abc import Hashable
+from collections.abc import Callable, Hashable
 from typing import Self, TypeVar, final, override
 
+from leak_snek.interfaces.storages.aio.atomic_rate_store import AsyncAtomicRateStorage
+from leak_snek.interfaces.storages.aio.nowait_rate_store import AsyncNowaitRateStorage
 from leak_snek.interfaces.storages.aio.rate_store import AsyncRateStorage
 from leak_snek.interfaces.values.rate import Rate
 
@@ -35,3 +37,64 @@ class FakeAsyncStorage(AsyncRateStorage[T_contra]):
     async def write(self: Self, key: T_contra, value: Rate) -> None:
         """Write rate for given key."""
         self._rates[key] = value
+
+
+@final
+@dataclasses.dataclass
+class FakeAsyncAtomicStorage(AsyncAtomicRateStorage[T_contra]):
+    """Fake rate storage with atomic updates storing rates in memory."""
+
+    _rates: dict[T_contra, Rate] = dataclasses.field(default_factory=dict)
+
+    @override
+    async def read(self: Self, key: T_contra) -> Rate:
+        """Get rate for given key."""
+        return self._rates.get(key) or Rate.default()
+
+    @override
+    async def write(self: Self, key: T_contra, value: Rate) -> None:
+        """Write rate for given key."""
+        self._rates[key] = value
+
+    @override
+    async def update(self: Self, key: T_contra, function: Callable[[Rate], Rate | None]) -> Rate | None:
+        """Update rate for given key."""
+        value = function(await self.read(key))
+
+        if value is not None:
+            await self.write(key, value)
+
+        return value
+
+
+@final
+@dataclasses.dataclass
+class FakeAsyncNowaitStorage(AsyncNowaitRateStorage[T_contra]):
+    """Fake rate storage with updates that never suspend storing rates in memory."""
+
+    _rates: dict[T_contra, Rate] = dataclasses.field(default_factory=dict)
+
+    @override
+    async def read(self: Self, key: T_contra) -> Rate:
+        """Get rate for given key."""
+        return self._rates.get(key) or Rate.default()
+
+    @override
+    async def write(self: Self, key: T_contra, value: Rate) -> None:
+        """Write rate for given key."""
+        self._rates[key] = value
+
+    @override
+    async def update(self: Self, key: T_contra, function: Callable[[Rate], Rate | None]) -> Rate | None:
+        """Fail as the storage is expected to be updated without awaiting."""
+        raise NotImplementedError
+
+    @override
+    def update_nowait(self: Self, key: T_contra, function: Callable[[Rate], Rate | None]) -> Rate | None:
+        """Update rate for given key."""
+        value = function(self._rates.get(key) or Rate.default())
+
+        if value is not None:
+            self._rates[key] = value
+
+        return value
@@ -0,0 +1,26 @@
+"""Fake clock implementation."""
+import dataclasses
+import time
+from typing import Self, final
+
+
+@final
+@dataclasses.dataclass
+class FakeClock:
+    """Fake clock whose time only advances when sleeping, recording the sleeps."""
+
+    now: float = dataclasses.field(default_factory=time.monotonic)
+    sleeps: list[float] = dataclasses.field(default_factory=list)
+
+    def monotonic(self: Self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+    def sleep(self: Self, seconds: float) -> None:
+        """Record the sleep and advance the fake time."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    async def async_sleep(self: Self, seconds: float) -> None:
+        """Record the sleep and advance the fake time without suspending."""
+        self.sleep(seconds)
@@ -3,6 +3,7 @@ import dataclasses
 from typing import Self, TypeVar, final, override
 
 from leak_snek.interfaces.limiters.rate_limiter import RateLimiter
+from leak_snek.interfaces.limiters.waiting_rate_limiter import WaitingRateLimiter
 
 T_contra = TypeVar("T_contra", contravariant=True)
 
@@ -10,11 +11,44 @@ T_contra = TypeVar("T_contra", contravariant=True)
 @final
 @dataclasses.dataclass
 class FakeRateLimiter(RateLimiter[T_contra]):
-    """Fake rate limiter implementation with control over limit exceeded state."""
+    """Fake rate limiter implementation with control over limit exceeded state, recording the costs."""
 
     exceeded: bool
+    costs: list[int] = dataclasses.field(default_factory=list)
 
     @override
-    def limit_exceeded(self: Self, key: T_contra) -> bool:  # - unused arg is ok in fake
-        """Return static exceeded state ignoring the key."""
+    def limit_exceeded(self: Self, key: T_contra, cost: int = 1) -> bool:  # - unused arg is ok in fake
+        """Record the cost and return static exceeded state ignoring the key."""
+        self.costs.append(cost)
+
         return self.exceeded
+
+
+@final
+@dataclasses.dataclass
+class FakeWaitingRateLimiter(WaitingRateLimiter[T_contra]):
+    """Fake waiting rate limiter implementation with control over acquired state, recording timeouts and costs."""
+
+    acquired: bool
+    timeouts: list[float | None] = dataclasses.field(default_factory=list)
+    costs: list[int] = dataclasses.field(default_factory=list)
+
+    @override
+    def limit_exceeded(self: Self, key: T_contra, cost: int = 1) -> bool:  # - unused arg is ok in fake
+        """Record the cost and return static exceeded state ignoring the key."""
+        self.costs.append(cost)
+
+        return not self.acquired
+
+    @override
+    def acquire(
+        self: Self,
+        key: T_contra,  # - unused arg is ok in fake
+        timeout: float | None = None,
+        cost: int = 1,
+    ) -> bool:
+        """Record the timeout and the cost and return static acquired state ignoring the key."""
+        self.timeouts.append(timeout)
+        self.costs.append(cost)
+
+        return self.acquired
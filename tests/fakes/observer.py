@@ -0,0 +1,33 @@
+"""Fake observer implementation."""
+import dataclasses
+from typing import Self, TypeVar, final, override
+
+from leak_snek.interfaces.observers.observer import Observer
+
+T_contra = TypeVar("T_contra", contravariant=True)
+
+
+@final
+@dataclasses.dataclass
+class FakeObserver(Observer[T_contra]):
+    """Fake observer recording the events it receives, without the durations."""
+
+    events: list[tuple[object, ...]] = dataclasses.field(default_factory=list)
+    durations: list[float] = dataclasses.field(default_factory=list)
+
+    @override
+    def decided(self: Self, key: T_contra, *, allowed: bool) -> None:
+        """Record the decision."""
+        self.events.append(("decided", key, allowed))
+
+    @override
+    def lock_waited(self: Self, key: T_contra, seconds: float) -> None:
+        """Record the lock wait."""
+        self.events.append(("lock_waited", key))
+        self.durations.append(seconds)
+
+    @override
+    def storage_called(self: Self, key: T_contra, operation: str, seconds: float) -> None:
+        """Record the storage call."""
+        self.events.append(("storage_called", key, operation))
+        self.durations.append(seconds)
@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import dataclasses
-from collections.abc import Hashable
+from collections.abc import Callable, Hashable, Sequence
 from typing import Self, TypeVar, final, override
 
+from leak_snek.interfaces.storages.atomic_rate_store import AtomicRateStorage
+from leak_snek.interfaces.storages.batch_rate_store import BatchRateStorage
 from leak_snek.interfaces.storages.rate_store import RateStorage
 from leak_snek.interfaces.values.rate import Rate
 
@@ -35,3 +37,66 @@ class FakeStorage(RateStorage[T_contra]):
     def write(self: Self, key: T_contra, value: Rate) -> None:
         """Write rate for given key."""
         self._rates[key] = value
+
+
+@final
+@dataclasses.dataclass
+class FakeAtomicStorage(AtomicRateStorage[T_contra]):
+    """Fake rate storage with atomic updates storing rates in memory."""
+
+    _rates: dict[T_contra, Rate] = dataclasses.field(default_factory=dict)
+
+    @override
+    def read(self: Self, key: T_contra) -> Rate:
+        """Get rate for given key."""
+        return self._rates.get(key) or Rate.default()
+
+    @override
+    def write(self: Self, key: T_contra, value: Rate) -> None:
+        """Write rate for given key."""
+        self._rates[key] = value
+
+    @override
+    def update(self: Self, key: T_contra, function: Callable[[Rate], Rate | None]) -> Rate | None:
+        """Update rate for given key."""
+        value = function(self.read(key))
+
+        if value is not None:
+            self.write(key, value)
+
+        return value
+
+
+@final
+@dataclasses.dataclass
+class FakeBatchStorage(BatchRateStorage[T_contra]):
+    """Fake rate storage with atomic updates of several keys storing rates in memory, recording the batches."""
+
+    batches: list[list[T_contra]] = dataclasses.field(default_factory=list)
+    _rates: dict[T_contra, Rate] = dataclasses.field(default_factory=dict)
+
+    @override
+    def read(self: Self, key: T_contra) -> Rate:
+        """Get rate for given key."""
+        return self._rates.get(key) or Rate.default()
+
+    @override
+    def write(self: Self, key: T_contra, value: Rate) -> None:
+        """Write rate for given key."""
+        self._rates[key] = value
+
+    @override
+    def update_many(
+        self: Self,
+        keys: Sequence[T_contra],
+        function: Callable[[list[Rate]], list[Rate] | None],
+    ) -> list[Rate] | None:
+        """Update rates for given keys."""
+        self.batches.append(list(keys))
+
+        values = function([self.read(key) for key in keys])
+
+        if values is not None:
+            self._rates.update(zip(keys, values, strict=True))
+
+        return values
@@ -0,0 +1,137 @@
+"""Tests for async generic cell rate algorithm."""
+import time
+from datetime import timedelta
+
+import pytest
+
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.aio.gcra import AsyncGCRALimiter
+from tests.fakes.aio.mutex import FakeAsyncMutex
+from tests.fakes.aio.storage import FakeAsyncAtomicStorage, FakeAsyncNowaitStorage, FakeAsyncStorage
+
+
+async def test_gcra() -> None:
+    """Test that async GCRA limits operations."""
+    # Given: async GCRA limiter allowing 1 operation per minute
+    key = "test_key"
+    limiter: AsyncGCRALimiter[str] = AsyncGCRALimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncStorage(),
+        key_mutex=FakeAsyncMutex(),
+    )
+
+    # When: limit exceeded is called two times consecutively
+    # Then: first time limit is not exceeded and second time it is
+    assert not await limiter.limit_exceeded(key)
+    assert await limiter.limit_exceeded(key)
+
+
+async def test_gcra_burst() -> None:
+    """Test that async GCRA allows bursts of up to the number of operations of the limit."""
+    # Given: async GCRA limiter allowing 3 operations per minute
+    limiter: AsyncGCRALimiter[str] = AsyncGCRALimiter(
+        rate_limit=RateLimit(operations=3, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncStorage(),
+        key_mutex=FakeAsyncMutex(),
+    )
+
+    # When: limit exceeded is called four times consecutively
+    # Then: only the fourth operation exceeds the limit
+    assert [await limiter.limit_exceeded("test_key") for _ in range(4)] == [False, False, False, True]
+
+
+async def test_gcra_leak() -> None:
+    """Test that async GCRA drains the bucket over time."""
+    # Given: async GCRA limiter allowing 2 operations per minute
+    #   and two operations were made 30 seconds ago, so the bucket is emptied in 30 seconds
+    key = "test_key"
+    storage: FakeAsyncStorage[str] = FakeAsyncStorage()
+    limiter: AsyncGCRALimiter[str] = AsyncGCRALimiter(
+        rate_limit=RateLimit(operations=2, period=timedelta(minutes=1)),
+        rate_storage=storage,
+        key_mutex=FakeAsyncMutex(),
+    )
+
+    await storage.write(key, Rate(operations=0, updated_at=time.monotonic() + 30))
+
+    # When: limit exceeded is called two times consecutively
+    # Then: only one operation is allowed b/c the bucket was drained for 1 operation
+    assert not await limiter.limit_exceeded(key)
+    assert await limiter.limit_exceeded(key)
+
+
+async def test_gcra_atomic() -> None:
+    """Test that async GCRA limits operations without a mutex using atomic storage updates."""
+    # Given: async GCRA limiter without a mutex allowing 1 operation per minute over atomic storage
+    key = "test_key"
+    limiter: AsyncGCRALimiter[str] = AsyncGCRALimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncAtomicStorage(),
+    )
+
+    # When: limit exceeded is called two times consecutively
+    # Then: first time limit is not exceeded and second time it is
+    assert not await limiter.limit_exceeded(key)
+    assert await limiter.limit_exceeded(key)
+
+
+async def test_gcra_nowait() -> None:
+    """Test that async GCRA limits operations without awaiting storages that never suspend."""
+    # Given: async GCRA limiter without a mutex allowing 1 operation per minute over storage
+    #   failing to be updated with awaiting
+    key = "test_key"
+    limiter: AsyncGCRALimiter[str] = AsyncGCRALimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncNowaitStorage(),
+    )
+
+    # When: limit exceeded is called two times consecutively
+    # Then: first time limit is not exceeded and second time it is
+    assert not await limiter.limit_exceeded(key)
+    assert await limiter.limit_exceeded(key)
+
+
+def test_gcra_no_mutex() -> None:
+    """Test that async GCRA limiter requires a mutex for storages without atomic updates."""
+    # Given:
+    # When: async GCRA limiter is created without a mutex over storage without atomic updates
+    # Then: an exception is raised
+    with pytest.raises(ValueError, match="key_mutex is required"):
+        AsyncGCRALimiter[str](
+            rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+            rate_storage=FakeAsyncStorage(),
+        )
+
+
+async def test_gcra_cost() -> None:
+    """Test that async GCRA advances the theoretical arrival time by the cost of a check at once."""
+    # Given: async GCRA limiter allowing 5 operations per minute
+    key = "test_key"
+    limiter: AsyncGCRALimiter[str] = AsyncGCRALimiter(
+        rate_limit=RateLimit(operations=5, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncStorage(),
+        key_mutex=FakeAsyncMutex(),
+    )
+
+    # When: limit exceeded is called with costs of 3, 3, 2 and 1 operations consecutively
+    # Then: the operations are counted at once, only when all of them fit in the limit
+    assert not await limiter.limit_exceeded(key, cost=3)
+    assert await limiter.limit_exceeded(key, cost=3)
+    assert not await limiter.limit_exceeded(key, cost=2)
+    assert await limiter.limit_exceeded(key)
+
+
+@pytest.mark.parametrize("cost", [0, -1])
+async def test_gcra_invalid_cost(cost: int) -> None:
+    """Test that async GCRA rejects costs lower than 1 instead of moving the theoretical arrival time back."""
+    # Given: async GCRA limiter allowing 5 operations per minute
+    limiter: AsyncGCRALimiter[str] = AsyncGCRALimiter(
+        rate_limit=RateLimit(operations=5, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncAtomicStorage(),
+    )
+
+    # When: limit exceeded is called with a cost lower than 1
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match="cost must be at least 1."):
+        await limiter.limit_exceeded("test_key", cost=cost)
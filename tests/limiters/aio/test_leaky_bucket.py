@@ -1,12 +1,19 @@
 """Tests for async leaky bucket rate limiting algorithm."""
+import math
 import time
 from datetime import timedelta
+from types import SimpleNamespace
 
+import pytest
+
+from leak_snek.interfaces.values.decision import Decision
 from leak_snek.interfaces.values.rate import Rate
 from leak_snek.interfaces.values.rate_limit import RateLimit
 from leak_snek.limiters.aio.leaky_bucket import AsyncLeakyBucketLimiter
 from tests.fakes.aio.mutex import FakeAsyncMutex
-from tests.fakes.aio.storage import FakeAsyncStorage
+from tests.fakes.aio.storage import FakeAsyncAtomicStorage, FakeAsyncNowaitStorage, FakeAsyncStorage
+from tests.fakes.clock import FakeClock
+from tests.fakes.observer import FakeObserver
 
 
 async def test_leaky_bucket() -> None:
@@ -43,3 +50,344 @@ async def test_leaky_bucket_leak() -> None:
     # Then: only one operation is allowed b/c the bucket was drained for 1 operation
     assert not await limiter.limit_exceeded(key)
     assert await limiter.limit_exceeded(key)
+
+
+async def test_leaky_bucket_many() -> None:
+    """Test that async leaky bucket algorithm limits operations of a batch of keys in order."""
+    # Given: leaky bucket limiter allowing 1 operation per minute
+    limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncStorage(),
+        key_mutex=FakeAsyncMutex(),
+    )
+
+    # When: limit exceeded is called for a batch of keys with a repeated key
+    # Then: only the repeated occurrence of the key exceeds the limit
+    assert await limiter.limit_exceeded_many(["first", "second", "first"]) == [False, False, True]
+
+
+async def test_leaky_bucket_atomic() -> None:
+    """Test that async leaky bucket algorithm limits operations without a mutex using atomic storage updates."""
+    # Given: async leaky bucket limiter without a mutex allowing 1 operation per minute over atomic storage
+    key = "test_key"
+    limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncAtomicStorage(),
+    )
+
+    # When: limit exceeded is called two times consecutively
+    # Then: first time limit is not exceeded and second time it is
+    assert not await limiter.limit_exceeded(key)
+    assert await limiter.limit_exceeded(key)
+
+
+async def test_leaky_bucket_nowait() -> None:
+    """Test that async leaky bucket algorithm limits operations without awaiting storages that never suspend."""
+    # Given: async leaky bucket limiter without a mutex allowing 1 operation per minute over storage
+    #   failing to be updated with awaiting
+    key = "test_key"
+    limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncNowaitStorage(),
+    )
+
+    # When: limit exceeded is called two times consecutively
+    # Then: first time limit is not exceeded and second time it is
+    assert not await limiter.limit_exceeded(key)
+    assert await limiter.limit_exceeded(key)
+
+
+def test_leaky_bucket_no_mutex() -> None:
+    """Test that async leaky bucket limiter requires a mutex for storages without atomic updates."""
+    # Given:
+    # When: async leaky bucket limiter is created without a mutex over storage without atomic updates
+    # Then: an exception is raised
+    with pytest.raises(ValueError, match="key_mutex is required"):
+        AsyncLeakyBucketLimiter[str](
+            rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+            rate_storage=FakeAsyncStorage(),
+        )
+
+
+def fake_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Make the async leaky bucket limiter use a fake clock."""
+    clock = FakeClock()
+
+    monkeypatch.setattr(
+        "leak_snek.limiters.aio.leaky_bucket.time",
+        SimpleNamespace(monotonic=clock.monotonic, perf_counter=time.perf_counter),
+    )
+    monkeypatch.setattr("leak_snek.limiters.aio.leaky_bucket.asyncio", SimpleNamespace(sleep=clock.async_sleep))
+
+    return clock
+
+
+async def test_leaky_bucket_acquire(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that async leaky bucket algorithm waits exactly until the bucket takes the operation."""
+    # Given: async leaky bucket limiter allowing 1 operation per minute
+    #   and an operation was made 45 seconds ago
+    key = "test_key"
+    clock = fake_clock(monkeypatch)
+    storage: FakeAsyncStorage[str] = FakeAsyncStorage()
+    limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=storage,
+        key_mutex=FakeAsyncMutex(),
+    )
+
+    await storage.write(key, Rate(operations=1, updated_at=clock.now - 45))
+
+    # When: an operation is acquired
+    # Then: the operation is allowed after a single sleep for the remaining 15 seconds
+    assert await limiter.acquire(key)
+    assert clock.sleeps == [15]
+    assert await storage.read(key) == Rate(operations=1, updated_at=clock.now)
+
+
+async def test_leaky_bucket_acquire_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that async leaky bucket algorithm doesn't wait when the bucket won't take the operation in time."""
+    # Given: async leaky bucket limiter allowing 1 operation per minute over atomic storage
+    #   and an operation was just acquired
+    key = "test_key"
+    clock = fake_clock(monkeypatch)
+    limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncAtomicStorage(),
+    )
+
+    assert await limiter.acquire(key)
+
+    # When: operations are acquired with a timeout shorter, then longer than the time until the bucket leaks
+    # Then: the first one gives up without sleeping and the second one sleeps for the whole period
+    assert not await limiter.acquire(key, timeout=30)
+    assert clock.sleeps == []
+    assert await limiter.acquire(key, timeout=90)
+    assert clock.sleeps == [60]
+
+
+async def test_leaky_bucket_acquire_nowait(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that async leaky bucket algorithm waits for storages that never suspend without awaiting them."""
+    # Given: async leaky bucket limiter allowing 1 operation per minute over storage
+    #   failing to be updated with awaiting
+    key = "test_key"
+    clock = fake_clock(monkeypatch)
+    limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncNowaitStorage(),
+    )
+
+    # When: two operations are acquired consecutively
+    # Then: both are allowed, the second one after waiting for the whole period
+    assert await limiter.acquire(key)
+    assert await limiter.acquire(key)
+    assert clock.sleeps == [60]
+
+
+async def test_leaky_bucket_check(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that async leaky bucket algorithm details the state of the bucket with the decision."""
+    # Given: async leaky bucket limiter allowing 2 operations per minute
+    key = "test_key"
+    clock = fake_clock(monkeypatch)
+    limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=2, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncStorage(),
+        key_mutex=FakeAsyncMutex(),
+    )
+
+    # When: the limit is checked three times consecutively
+    # Then: the bucket has room for one more operation after the first one, none after the second one,
+    #   and takes the third one once it leaks one operation in 30 seconds
+    assert await limiter.check(key) == Decision(allowed=True, remaining=1, reset_at=clock.now + 30, retry_after=0)
+    assert await limiter.check(key) == Decision(allowed=True, remaining=0, reset_at=clock.now + 60, retry_after=0)
+    assert await limiter.check(key) == Decision(allowed=False, remaining=0, reset_at=clock.now + 60, retry_after=30)
+
+
+async def test_leaky_bucket_cost() -> None:
+    """Test that async leaky bucket algorithm adds the cost of a check to the bucket at once."""
+    # Given: async leaky bucket limiter allowing 5 operations per minute
+    key = "test_key"
+    limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=5, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncStorage(),
+        key_mutex=FakeAsyncMutex(),
+    )
+
+    # When: limit exceeded is called with costs of 3, 3, 2 and 1 operations consecutively
+    # Then: the operations are counted at once, only when all of them fit in the limit
+    assert not await limiter.limit_exceeded(key, cost=3)
+    assert await limiter.limit_exceeded(key, cost=3)
+    assert not await limiter.limit_exceeded(key, cost=2)
+    assert await limiter.limit_exceeded(key)
+
+
+async def test_leaky_bucket_cost_over_capacity() -> None:
+    """Test that async leaky bucket algorithm never takes more operations at once than the bucket holds."""
+    # Given: async leaky bucket limiter allowing 2 operations per minute over atomic storage
+    key = "test_key"
+    limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=2, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncAtomicStorage(),
+    )
+
+    # When: 3 operations are checked and acquired at once
+    # Then: they are denied without waiting, as they would never fit in the bucket
+    assert (await limiter.check(key, cost=3)).retry_after == math.inf
+    assert not await limiter.acquire(key, cost=3)
+
+
+async def test_leaky_bucket_observer() -> None:
+    """Test that async leaky bucket algorithm reports the decisions, the lock waits and the storage calls."""
+    # Given: async leaky bucket limiter allowing 1 operation per minute over storage without atomic updates,
+    #   with observer
+    key = "test_key"
+    observer: FakeObserver[str] = FakeObserver()
+    limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncStorage(),
+        key_mutex=FakeAsyncMutex(),
+        observer=observer,
+    )
+
+    # When: limit exceeded is called two times consecutively
+    # Then: the lock wait and the read are reported for both checks, the write only for the allowed one
+    assert not await limiter.limit_exceeded(key)
+    assert await limiter.limit_exceeded(key)
+    assert observer.events == [
+        ("lock_waited", key),
+        ("storage_called", key, "read"),
+        ("storage_called", key, "write"),
+        ("decided", key, True),
+        ("lock_waited", key),
+        ("storage_called", key, "read"),
+        ("decided", key, False),
+    ]
+    assert all(duration >= 0 for duration in observer.durations)
+
+
+async def test_leaky_bucket_observer_atomic(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that async leaky bucket algorithm reports the atomic updates of the checks to the observer."""
+    # Given: async leaky bucket limiters allowing 1 operation per minute over atomic storage and over storage
+    #   updated without awaiting, with observer
+    key = "test_key"
+    clock = fake_clock(monkeypatch)
+    observer: FakeObserver[str] = FakeObserver()
+    limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncAtomicStorage(),
+        observer=observer,
+    )
+    nowait_limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncNowaitStorage(),
+        observer=observer,
+    )
+
+    # When: the limit is checked two times consecutively with both limiters
+    # Then: the decisions are detailed as without observer, and an update is reported for every check
+    assert await limiter.check(key) == Decision(allowed=True, remaining=0, reset_at=clock.now + 60, retry_after=0)
+    assert not (await limiter.check(key)).allowed
+    assert not await nowait_limiter.limit_exceeded(key)
+    assert await nowait_limiter.limit_exceeded(key)
+    assert observer.events == [
+        ("storage_called", key, "update"),
+        ("decided", key, True),
+        ("storage_called", key, "update"),
+        ("decided", key, False),
+        ("storage_called", key, "update_nowait"),
+        ("decided", key, True),
+        ("storage_called", key, "update_nowait"),
+        ("decided", key, False),
+    ]
+
+
+async def test_leaky_bucket_clock() -> None:
+    """Test that async leaky bucket algorithm leaks the buckets with the time of the clock."""
+    # Given: leaky bucket limiter allowing 2 operations per minute driven by a virtual clock starting at 0
+    key = "test_key"
+    clock = FakeClock(now=0)
+    storage: FakeAsyncAtomicStorage[str] = FakeAsyncAtomicStorage()
+    limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=2, period=timedelta(minutes=1)),
+        rate_storage=storage,
+        clock=clock,
+    )
+
+    # When: the limit is checked three times consecutively and then acquired with a timeout
+    # Then: the decisions are computed from the virtual time, and the acquisition gives up without waiting
+    assert await limiter.check(key) == Decision(allowed=True, remaining=1, reset_at=30, retry_after=0)
+    assert await limiter.check(key) == Decision(allowed=True, remaining=0, reset_at=60, retry_after=0)
+    assert await limiter.check(key) == Decision(allowed=False, remaining=0, reset_at=60, retry_after=30)
+    assert not await limiter.acquire(key, timeout=10)
+
+    # When: the limit is checked once the virtual clock advanced by 30 seconds
+    clock.now += 30
+
+    # Then: the bucket leaked one operation and takes another one
+    assert not await limiter.limit_exceeded(key)
+    assert await storage.read(key) == Rate(operations=2, updated_at=30)
+
+
+async def test_leaky_bucket_clock_acquire() -> None:
+    """Test that async leaky bucket algorithm waits with the clock for the bucket to leak."""
+    # Given: leaky bucket limiter allowing 2 operations per minute driven by a virtual clock starting at 0
+    #   and the bucket is full
+    key = "test_key"
+    clock = FakeClock(now=0)
+    storage: FakeAsyncAtomicStorage[str] = FakeAsyncAtomicStorage()
+    limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=2, period=timedelta(minutes=1)),
+        rate_storage=storage,
+        clock=clock,
+    )
+
+    assert not await limiter.limit_exceeded(key, cost=2)
+
+    # When: an operation is acquired without timeout
+    # Then: the operation is allowed after a single sleep of the virtual clock until the bucket leaks one operation
+    assert await limiter.acquire(key)
+    assert clock.sleeps == [30]
+    assert await storage.read(key) == Rate(operations=2, updated_at=30)
+
+
+async def test_leaky_bucket_day_period() -> None:
+    """Test that async leaky bucket algorithm leaks the buckets of periods longer than a day."""
+    # Given: leaky bucket limiter allowing 24 operations per day driven by a virtual clock starting at 0
+    #   and the bucket is full
+    key = "test_key"
+    clock = FakeClock(now=0)
+    limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=24, period=timedelta(days=1)),
+        rate_storage=FakeAsyncAtomicStorage(),
+        clock=clock,
+    )
+
+    assert not await limiter.limit_exceeded(key, cost=24)
+
+    # When: the limit is checked, then checked again once the virtual clock advanced by an hour
+    # Then: the operation is denied until the bucket leaks one operation an hour later
+    assert await limiter.check(key) == Decision(allowed=False, remaining=0, reset_at=86400, retry_after=3600)
+
+    clock.now += 3600
+
+    assert not await limiter.limit_exceeded(key)
+
+
+@pytest.mark.parametrize("cost", [0, -1])
+async def test_leaky_bucket_invalid_cost(cost: int) -> None:
+    """Test that async leaky bucket algorithm rejects costs lower than 1 instead of draining the bucket."""
+    # Given: leaky bucket limiter allowing 5 operations per minute
+    limiter: AsyncLeakyBucketLimiter[str] = AsyncLeakyBucketLimiter(
+        rate_limit=RateLimit(operations=5, period=timedelta(minutes=1)),
+        rate_storage=FakeAsyncAtomicStorage(),
+    )
+
+    # When: the limit is checked or acquired with a cost lower than 1
+    # Then: corresponding exception is raised every time
+    with pytest.raises(ValueError, match="cost must be at least 1."):
+        await limiter.limit_exceeded("test_key", cost=cost)
+
+    with pytest.raises(ValueError, match="cost must be at least 1."):
+        await limiter.check("test_key", cost=cost)
+
+    with pytest.raises(ValueError, match="cost must be at least 1."):
+        await limiter.acquire("test_key", cost=cost)
@@ -0,0 +1,123 @@
+"""Tests for async multi-window leaky bucket rate limiting algorithm."""
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.aio.multi_window import AsyncMultiWindowLimiter
+from tests.fakes.aio.mutex import FakeAsyncMutex
+from tests.fakes.aio.storage import FakeAsyncAtomicStorage, FakeAsyncNowaitStorage, FakeAsyncStorage
+from tests.fakes.clock import FakeClock
+
+RATE_LIMITS = [
+    RateLimit(operations=2, period=timedelta(seconds=1)),
+    RateLimit(operations=3, period=timedelta(minutes=1)),
+]
+
+
+def fake_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Make the async multi-window limiter use a fake clock."""
+    clock = FakeClock()
+
+    monkeypatch.setattr("leak_snek.limiters.aio.multi_window.time", SimpleNamespace(monotonic=clock.monotonic))
+
+    return clock
+
+
+async def test_multi_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that async multi-window algorithm packs the buckets of all the rate limits in a single rate."""
+    clock = fake_clock(monkeypatch)
+    # Given: async multi-window limiter allowing 2 operations per second and 3 operations per minute
+    key = "test_key"
+    storage: FakeAsyncAtomicStorage[str] = FakeAsyncAtomicStorage()
+    limiter = AsyncMultiWindowLimiter[str](rate_limits=RATE_LIMITS, rate_storage=storage)
+
+    # When: limit exceeded is called 3 times consecutively
+    # Then: the per-second limit rejects the third operation, the packed rate holds 2 operations in both buckets
+    assert await limiter.limit_exceeded_many([key, key, key]) == [False, False, True]
+    assert await storage.read(key) == Rate(operations=2 + 2 * 3, updated_at=clock.now)
+
+    # When: limit exceeded is called twice a second later
+    clock.now += 1
+
+    # Then: the per-minute limit rejects the second operation without charging the per-second bucket
+    assert not await limiter.limit_exceeded(key)
+    assert await limiter.limit_exceeded(key)
+    assert await storage.read(key) == Rate(operations=1 + 3 * 3, updated_at=clock.now)
+
+
+async def test_multi_window_nowait(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that async multi-window algorithm updates storages that never suspend without awaiting."""
+    clock = fake_clock(monkeypatch)
+    # Given: async multi-window limiter allowing 2 operations per second and 3 operations per minute
+    #   over storage whose updates never suspend
+    key = "test_key"
+    storage: FakeAsyncNowaitStorage[str] = FakeAsyncNowaitStorage()
+    limiter = AsyncMultiWindowLimiter[str](rate_limits=RATE_LIMITS, rate_storage=storage)
+
+    # When: limit exceeded is called 3 times consecutively with a cost of 2 a second apart
+    # Then: the per-minute limit rejects the second operation without charging the per-second bucket
+    assert not await limiter.limit_exceeded(key, cost=2)
+
+    clock.now += 1
+
+    assert await limiter.limit_exceeded(key, cost=2)
+    assert await storage.read(key) == Rate(operations=2 + 2 * 3, updated_at=clock.now - 1)
+
+
+async def test_multi_window_leaks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that async multi-window algorithm leaks every bucket at the rate of its own limit."""
+    clock = fake_clock(monkeypatch)
+    # Given: async multi-window limiter allowing 2 operations per second and 3 operations per minute over storage
+    #   without atomic updates, with both buckets full
+    key = "test_key"
+    storage: FakeAsyncStorage[str] = FakeAsyncStorage()
+    limiter = AsyncMultiWindowLimiter[str](rate_limits=RATE_LIMITS, rate_storage=storage, key_mutex=FakeAsyncMutex())
+
+    await storage.write(key, Rate(operations=2 + 3 * 3, updated_at=clock.now))
+
+    # When: limit exceeded is called right away and 20 seconds later
+    # Then: the operation is rejected until the per-minute bucket leaked one, the per-second one leaked all
+    assert await limiter.limit_exceeded(key)
+
+    clock.now += 20
+
+    assert not await limiter.limit_exceeded(key)
+    assert await storage.read(key) == Rate(operations=3 * 3, updated_at=clock.now)
+
+
+@pytest.mark.parametrize(
+    ("rate_limits", "message"),
+    [
+        ([], "At least one rate limit is required."),
+        (
+            [
+                RateLimit(operations=2**32, period=timedelta(seconds=1)),
+                RateLimit(operations=2**31, period=timedelta(hours=1)),
+            ],
+            "The buckets of the rate limits don't fit in a 64-bit integer.",
+        ),
+        (RATE_LIMITS, "key_mutex is required for storages without atomic updates."),
+    ],
+)
+def test_multi_window_invalid(rate_limits: list[RateLimit], message: str) -> None:
+    """Test that async multi-window limiter validates its configuration."""
+    # Given: async storage without atomic updates
+    # When: async multi-window limiter is created with invalid rate limits or without mutex
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match=message):
+        AsyncMultiWindowLimiter[str](rate_limits=rate_limits, rate_storage=FakeAsyncStorage())
+
+
+@pytest.mark.parametrize("cost", [0, -1])
+async def test_multi_window_invalid_cost(cost: int) -> None:
+    """Test that async multi-window algorithm rejects costs lower than 1 instead of draining the buckets."""
+    # Given: async multi-window limiter allowing 2 operations per second and 3 per minute
+    limiter = AsyncMultiWindowLimiter[str](rate_limits=RATE_LIMITS, rate_storage=FakeAsyncAtomicStorage())
+
+    # When: limit exceeded is called with a cost lower than 1
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match="cost must be at least 1."):
+        await limiter.limit_exceeded("test_key", cost=cost)
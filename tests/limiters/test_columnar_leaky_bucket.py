@@ -0,0 +1,94 @@
+"""Tests for vectorized leaky bucket rate limiting algorithm."""
+import random
+import time
+from datetime import timedelta
+
+import pytest
+
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.columnar_leaky_bucket import ColumnarLeakyBucketLimiter
+from leak_snek.limiters.leaky_bucket import LeakyBucketLimiter
+from leak_snek.storages.columnar_storage import ColumnarStorage
+from tests.fakes.mutex import FakeMutex
+from tests.fakes.storage import FakeStorage
+
+
+def test_columnar_leaky_bucket() -> None:
+    """Test that vectorized leaky bucket algorithm limits operations."""
+    # Given: vectorized leaky bucket limiter allowing 1 operation per minute
+    key = "test_key"
+    limiter = ColumnarLeakyBucketLimiter[str](
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=ColumnarStorage(),
+    )
+
+    # When: limit exceeded is called two times consecutively
+    # Then: first time limit is not exceeded and second time it is
+    assert not limiter.limit_exceeded(key)
+    assert limiter.limit_exceeded(key)
+
+
+def test_columnar_leaky_bucket_leak() -> None:
+    """Test that vectorized leaky bucket algorithm drains the bucket over time."""
+    # Given: vectorized leaky bucket limiter allowing 2 operations per minute
+    #   and two operations were made 30 seconds ago
+    key = "test_key"
+    storage = ColumnarStorage[str]()
+    limiter = ColumnarLeakyBucketLimiter[str](
+        rate_limit=RateLimit(operations=2, period=timedelta(minutes=1)),
+        rate_storage=storage,
+    )
+
+    storage.write(key, Rate(operations=2, updated_at=time.monotonic() - 30))
+
+    # When: limit exceeded is called for a batch of the same key
+    # Then: only one operation is allowed b/c the bucket was drained for 1 operation
+    assert limiter.limit_exceeded_many([key, key, key]) == [False, True, True]
+
+
+def test_columnar_leaky_bucket_many() -> None:
+    """Test that vectorized leaky bucket algorithm makes the same decisions as checking keys one by one."""
+    # Given: vectorized and regular leaky bucket limiters allowing 3 operations per minute
+    #   and a batch of randomly repeated keys
+    rate_limit = RateLimit(operations=3, period=timedelta(minutes=1))
+    limiter = ColumnarLeakyBucketLimiter[int](rate_limit=rate_limit, rate_storage=ColumnarStorage(hash_keys=True))
+    reference = LeakyBucketLimiter[int](rate_limit=rate_limit, rate_storage=FakeStorage(), key_mutex=FakeMutex())
+
+    keys = random.Random(0).choices(range(50), k=500)
+
+    # When: limit exceeded is called for the batch
+    # Then: the decisions are the same as for the keys checked one by one
+    assert limiter.limit_exceeded_many(keys) == [reference.limit_exceeded(key) for key in keys]
+    assert limiter.limit_exceeded_many([]) == []
+
+
+def test_columnar_leaky_bucket_cost() -> None:
+    """Test that vectorized leaky bucket algorithm adds the cost of a check to the bucket at once."""
+    # Given: vectorized leaky bucket limiter allowing 5 operations per minute
+    key = "test_key"
+    limiter = ColumnarLeakyBucketLimiter[str](
+        rate_limit=RateLimit(operations=5, period=timedelta(minutes=1)),
+        rate_storage=ColumnarStorage(),
+    )
+
+    # When: limit exceeded is called with costs of 3, 3, 2 and 1 operations consecutively
+    # Then: the operations are counted at once, only when all of them fit in the limit
+    assert not limiter.limit_exceeded(key, cost=3)
+    assert limiter.limit_exceeded(key, cost=3)
+    assert not limiter.limit_exceeded(key, cost=2)
+    assert limiter.limit_exceeded(key)
+
+
+def test_columnar_leaky_bucket_invalid_cost() -> None:
+    """Test that vectorized leaky bucket algorithm rejects costs lower than 1 instead of draining the bucket."""
+    # Given: vectorized leaky bucket limiter allowing 5 operations per minute
+    limiter = ColumnarLeakyBucketLimiter[str](
+        rate_limit=RateLimit(operations=5, period=timedelta(minutes=1)),
+        rate_storage=ColumnarStorage(),
+    )
+
+    # When: limit exceeded is called with a negative cost
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match="cost must be at least 1."):
+        limiter.limit_exceeded("test_key", cost=-1)
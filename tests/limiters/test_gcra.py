@@ -0,0 +1,121 @@
+"""Tests for generic cell rate algorithm."""
+import time
+from datetime import timedelta
+
+import pytest
+
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.gcra import GCRALimiter
+from tests.fakes.mutex import FakeMutex
+from tests.fakes.storage import FakeAtomicStorage, FakeStorage
+
+
+def test_gcra() -> None:
+    """Test that GCRA limits operations."""
+    # Given: GCRA limiter allowing 1 operation per minute
+    key = "test_key"
+    limiter: GCRALimiter[str] = GCRALimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeStorage(),
+        key_mutex=FakeMutex(),
+    )
+
+    # When: limit exceeded is called two times consecutively
+    # Then: first time limit is not exceeded and second time it is
+    assert not limiter.limit_exceeded(key)
+    assert limiter.limit_exceeded(key)
+
+
+def test_gcra_burst() -> None:
+    """Test that GCRA allows bursts of up to the number of operations of the limit."""
+    # Given: GCRA limiter allowing 3 operations per minute
+    limiter: GCRALimiter[str] = GCRALimiter(
+        rate_limit=RateLimit(operations=3, period=timedelta(minutes=1)),
+        rate_storage=FakeStorage(),
+        key_mutex=FakeMutex(),
+    )
+
+    # When: limit exceeded is called four times consecutively
+    # Then: only the fourth operation exceeds the limit
+    assert [limiter.limit_exceeded("test_key") for _ in range(4)] == [False, False, False, True]
+
+
+def test_gcra_leak() -> None:
+    """Test that GCRA drains the bucket over time."""
+    # Given: GCRA limiter allowing 2 operations per minute
+    #   and two operations were made 30 seconds ago, so the bucket is emptied in 30 seconds
+    key = "test_key"
+    storage: FakeStorage[str] = FakeStorage()
+    limiter: GCRALimiter[str] = GCRALimiter(
+        rate_limit=RateLimit(operations=2, period=timedelta(minutes=1)),
+        rate_storage=storage,
+        key_mutex=FakeMutex(),
+    )
+
+    storage.write(key, Rate(operations=0, updated_at=time.monotonic() + 30))
+
+    # When: limit exceeded is called two times consecutively
+    # Then: only one operation is allowed b/c the bucket was drained for 1 operation
+    assert not limiter.limit_exceeded(key)
+    assert limiter.limit_exceeded(key)
+
+
+def test_gcra_atomic() -> None:
+    """Test that GCRA limits operations without a mutex using atomic storage updates."""
+    # Given: GCRA limiter without a mutex allowing 1 operation per minute over atomic storage
+    key = "test_key"
+    limiter: GCRALimiter[str] = GCRALimiter(
+        rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+        rate_storage=FakeAtomicStorage(),
+    )
+
+    # When: limit exceeded is called two times consecutively
+    # Then: first time limit is not exceeded and second time it is
+    assert not limiter.limit_exceeded(key)
+    assert limiter.limit_exceeded(key)
+
+
+def test_gcra_no_mutex() -> None:
+    """Test that GCRA limiter requires a mutex for storages without atomic updates."""
+    # Given:
+    # When: GCRA limiter is created without a mutex over storage without atomic updates
+    # Then: an exception is raised
+    with pytest.raises(ValueError, match="key_mutex is required"):
+        GCRALimiter[str](
+            rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)),
+            rate_storage=FakeStorage(),
+        )
+
+
+def test_gcra_cost() -> None:
+    """Test that GCRA advances the theoretical arrival time by the cost of a check at once."""
+    # Given: GCRA limiter allowing 5 operations per minute
+    key = "test_key"
+    limiter: GCRALimiter[str] = GCRALimiter(
+        rate_limit=RateLimit(operations=5, period=timedelta(minutes=1)),
+        rate_storage=FakeStorage(),
+        key_mutex=FakeMutex(),
+    )
+
+    # When: limit exceeded is called with costs of 3, 3, 2 and 1 operations consecutively
+    # Then: the operations are counted at once, only when all of them fit in the limit
+    assert not limiter.limit_exceeded(key, cost=3)
+    assert limiter.limit_exceeded(key, cost=3)
+    assert not limiter.limit_exceeded(key, cost=2)
+    assert limiter.limit_exceeded(key)
+
+
+@pytest.mark.parametrize("cost", [0, -1])
+def test_gcra_invalid_cost(cost: int) -> None:
+    """Test that GCRA rejects costs lower than 1 instead of moving the theoretical arrival time back."""
+    # Given: GCRA limiter allowing 5 operations per minute
+    limiter: GCRALimiter[str] = GCRALimiter(
+        rate_limit=RateLimit(operations=5, period=timedelta(minutes=1)),
+        rate_storage=FakeAtomicStorage(),
+    )
+
+    # When: limit exceeded is called with a cost lower than 1
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match="cost must be at least 1."):
+        limiter.limit_exceeded("test_key", cost=cost)
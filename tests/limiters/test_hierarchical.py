@@ -0,0 +1,202 @@
+"""Tests for hierarchical leaky bucket rate limiting algorithm."""
+from datetime import timedelta
+from pathlib import Path
+from threading import Lock
+from types import SimpleNamespace
+
+import pytest
+
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.hierarchical import HierarchicalLimiter
+from leak_snek.mutexes.memory_mutex import MemoryMutex
+from leak_snek.mutexes.shared_memory_mutex import SharedMemoryMutex
+from leak_snek.mutexes.striped_mutex import StripedMutex
+from leak_snek.storages.bounded_memory_storage import BoundedMemoryStorage
+from tests.fakes.clock import FakeClock
+from tests.fakes.mutex import FakeMutex
+from tests.fakes.storage import FakeAtomicStorage, FakeBatchStorage, FakeStorage
+
+RATE_LIMITS = [
+    RateLimit(operations=2, period=timedelta(minutes=1)),
+    RateLimit(operations=3, period=timedelta(minutes=1)),
+    RateLimit(operations=100, period=timedelta(minutes=1)),
+]
+
+
+def fake_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Make the hierarchical limiter use a fake clock."""
+    clock = FakeClock()
+
+    monkeypatch.setattr("leak_snek.limiters.hierarchical.time", SimpleNamespace(monotonic=clock.monotonic))
+
+    return clock
+
+
+def parents(key: str) -> list[str]:
+    """Derive the tenant and the global key of a user key."""
+    return [key.split(":")[0], "*"]
+
+
+def test_hierarchical(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that hierarchical algorithm charges all the levels with a single batch update."""
+    clock = fake_clock(monkeypatch)
+    # Given: hierarchical limiter allowing 2 operations per minute per user, 3 per tenant and 100 in total
+    storage: FakeBatchStorage[str] = FakeBatchStorage()
+    limiter = HierarchicalLimiter[str](rate_limits=RATE_LIMITS, parents=parents, rate_storage=storage)
+
+    # When: limit exceeded is called 3 times for a user and twice for another user of the same tenant
+    # Then: the user limit rejects the third operation of the first user, the tenant limit rejects the second
+    #   operation of the second user without charging the other levels
+    assert limiter.limit_exceeded_many(["acme:alice"] * 3 + ["acme:bob"] * 2) == [False, False, True, False, True]
+    assert storage.read("acme:alice") == Rate(operations=2, updated_at=clock.now)
+    assert storage.read("acme:bob") == Rate(operations=1, updated_at=clock.now)
+    assert storage.read("acme") == Rate(operations=3, updated_at=clock.now)
+    assert storage.read("*") == Rate(operations=3, updated_at=clock.now)
+    assert storage.batches[0] == ["acme:alice", "acme", "*"]
+    assert len(storage.batches) == 5  # noqa: PLR2004 - a single batch per check
+
+
+def test_hierarchical_refund(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that hierarchical algorithm refunds the charged levels when a level rejects the operation."""
+    clock = fake_clock(monkeypatch)
+    # Given: hierarchical limiter allowing 2 operations per minute per user, 3 per tenant and 100 in total
+    #   over storage with atomic updates of a single key, with a full tenant bucket
+    storage: FakeAtomicStorage[str] = FakeAtomicStorage()
+    limiter = HierarchicalLimiter[str](rate_limits=RATE_LIMITS, parents=parents, rate_storage=storage)
+
+    storage.write("acme", Rate(operations=3, updated_at=clock.now))
+
+    # When: limit exceeded is called for a user of the tenant
+    # Then: the operation is rejected and the user bucket charged before the tenant one is refunded
+    assert limiter.limit_exceeded("acme:alice")
+    assert storage.read("acme:alice") == Rate(operations=0, updated_at=clock.now)
+    assert storage.read("*").operations == 0
+
+    # When: limit exceeded is called for a user of another tenant
+    # Then: the operation is charged to all the levels
+    assert not limiter.limit_exceeded("initech:bob")
+    assert storage.read("initech:bob") == Rate(operations=1, updated_at=clock.now)
+    assert storage.read("initech") == Rate(operations=1, updated_at=clock.now)
+    assert storage.read("*") == Rate(operations=1, updated_at=clock.now)
+
+
+def test_hierarchical_mutex(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that hierarchical algorithm locks all the levels over storages without atomic updates."""
+    clock = fake_clock(monkeypatch)
+    # Given: hierarchical limiter allowing 2 operations per minute per user, 3 per tenant and 100 in total
+    #   over storage without atomic updates
+    storage: FakeStorage[str] = FakeStorage()
+    mutex: FakeMutex[str] = FakeMutex()
+    limiter = HierarchicalLimiter[str](rate_limits=RATE_LIMITS, parents=parents, rate_storage=storage, key_mutex=mutex)
+
+    # When: limit exceeded is called with a cost of 2 for two users of the same tenant
+    # Then: the tenant limit rejects the operations of the second user, and all the levels are unlocked
+    assert not limiter.limit_exceeded("acme:alice", cost=2)
+    assert limiter.limit_exceeded("acme:bob", cost=2)
+    assert storage.read("acme") == Rate(operations=2, updated_at=clock.now)
+    assert storage.read("acme:bob").operations == 0
+    assert sorted(mutex.key_locks) == ["*", "acme", "acme:alice", "acme:bob"]
+    assert not any(lock.locked for lock in mutex.key_locks.values())
+
+    # When: limit exceeded is called for the first user a minute later
+    clock.now += 60
+
+    # Then: the buckets leaked and the operation is allowed
+    assert not limiter.limit_exceeded("acme:alice")
+    assert storage.read("acme:alice") == Rate(operations=1, updated_at=clock.now)
+
+
+def test_hierarchical_mutex_duplicate_keys(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that hierarchical algorithm locks every key once when parents derive the same key twice."""
+    clock = fake_clock(monkeypatch)
+    # Given: hierarchical limiter with non-reentrant locks whose parents derive the same key for two levels
+    storage: FakeStorage[str] = FakeStorage()
+    limiter = HierarchicalLimiter[str](
+        rate_limits=RATE_LIMITS,
+        parents=lambda _: ["*", "*"],
+        rate_storage=storage,
+        key_mutex=MemoryMutex[str, Lock](local_lock=Lock(), lock_factory=Lock),
+    )
+
+    # When: limit exceeded is called
+    # Then: the operation is charged without deadlocking
+    assert not limiter.limit_exceeded("acme:alice")
+    assert storage.read("*") == Rate(operations=1, updated_at=clock.now)
+
+
+def test_hierarchical_invalid_parents() -> None:
+    """Test that hierarchical limiter rejects keys whose parents don't match the rate limits."""
+    # Given: hierarchical limiter with 3 levels whose parents function derives a single parent key
+    limiter = HierarchicalLimiter[str](
+        rate_limits=RATE_LIMITS,
+        parents=lambda key: [key.split(":")[0]],
+        rate_storage=FakeBatchStorage(),
+    )
+
+    # When: limit exceeded is called
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match="parents must derive a key for every rate limit but the first."):
+        limiter.limit_exceeded("acme:alice")
+
+
+@pytest.mark.parametrize(
+    ("rate_limits", "message"),
+    [
+        ([], "At least one rate limit is required."),
+        (RATE_LIMITS, "key_mutex is required for storages without atomic updates."),
+    ],
+)
+def test_hierarchical_invalid(rate_limits: list[RateLimit], message: str) -> None:
+    """Test that hierarchical limiter validates its configuration."""
+    # Given: storage without atomic updates
+    # When: hierarchical limiter is created with invalid rate limits or without mutex
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match=message):
+        HierarchicalLimiter[str](rate_limits=rate_limits, parents=parents, rate_storage=FakeStorage())
+
+
+def test_hierarchical_striped_mutex() -> None:
+    """Test that hierarchical limiter rejects striped mutexes, which may lock several levels with the same lock."""
+    # Given: storage without atomic updates and striped mutex
+    # When: hierarchical limiter is created
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match="Striping mutexes can't lock the keys of all the levels at once"):
+        HierarchicalLimiter[str](
+            rate_limits=RATE_LIMITS,
+            parents=parents,
+            rate_storage=FakeStorage(),
+            key_mutex=StripedMutex(lock_factory=Lock),
+        )
+
+
+def test_hierarchical_shared_memory_mutex(tmp_path: Path) -> None:
+    """Test that hierarchical limiter rejects shared memory mutexes, which stripe the keys over thread locks."""
+    # Given: storage without atomic updates and shared memory mutex locking a user and its tenant with the same lock
+    mutex = SharedMemoryMutex(path=str(tmp_path / "locks"), slots=64)
+
+    assert mutex.stripe("user-1") == mutex.stripe("org-72")
+
+    # When: hierarchical limiter is created
+    # Then: corresponding exception is raised instead of deadlocking on the first check
+    with pytest.raises(ValueError, match="Striping mutexes can't lock the keys of all the levels at once"):
+        HierarchicalLimiter[str](
+            rate_limits=RATE_LIMITS[:2],
+            parents=lambda _: ["org-72"],
+            rate_storage=BoundedMemoryStorage(rate_limit=RATE_LIMITS[0]),
+            key_mutex=mutex,
+        )
+
+    mutex.close()
+
+
+@pytest.mark.parametrize("cost", [0, -1])
+def test_hierarchical_invalid_cost(cost: int) -> None:
+    """Test that hierarchical algorithm rejects costs lower than 1 instead of draining the buckets."""
+    # Given: hierarchical limiter over batch storage
+    limiter = HierarchicalLimiter[str](rate_limits=RATE_LIMITS, parents=parents, rate_storage=FakeBatchStorage())
+
+    # When: limit exceeded is called with a cost lower than 1
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match="cost must be at least 1."):
+        limiter.limit_exceeded("acme:alice", cost=cost)
@@ -0,0 +1,181 @@
+"""Tests for leasing leaky bucket rate limiting algorithm."""
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.leasing import LeasingLimiter
+from tests.fakes.clock import FakeClock
+from tests.fakes.mutex import FakeMutex
+from tests.fakes.storage import FakeAtomicStorage, FakeStorage
+
+
+def fake_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Make the leasing limiter use a fake clock."""
+    clock = FakeClock()
+
+    monkeypatch.setattr("leak_snek.limiters.leasing.time", SimpleNamespace(monotonic=clock.monotonic))
+
+    return clock
+
+
+def test_leasing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that leasing algorithm spends the operations leased from the storage locally."""
+    clock = fake_clock(monkeypatch)
+    # Given: leasing limiter allowing 10 operations per minute, leasing 4 operations at once
+    key = "test_key"
+    storage: FakeAtomicStorage[str] = FakeAtomicStorage()
+    limiter = LeasingLimiter[str](
+        rate_limit=RateLimit(operations=10, period=timedelta(minutes=1)),
+        rate_storage=storage,
+        lease_size=4,
+    )
+
+    # When: limit exceeded is called 5 times consecutively
+    # Then: the operations are allowed, leasing 4 operations for the first one and 4 more for the fifth one
+    assert not limiter.limit_exceeded(key)
+    assert storage.read(key) == Rate(operations=4, updated_at=clock.now)
+
+    assert limiter.limit_exceeded_many([key, key, key, key]) == [False, False, False, False]
+    assert storage.read(key) == Rate(operations=8, updated_at=clock.now)
+    assert limiter.leases[key].tokens == 3  # noqa: PLR2004 - 3 leased operations are left
+
+
+def test_leasing_exceeded(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that leasing algorithm limits operations once the bucket is full."""
+    clock = fake_clock(monkeypatch)
+    # Given: leasing limiter allowing 2 operations per minute, leasing 4 operations at once over storage
+    #   without atomic updates
+    key = "test_key"
+    storage: FakeStorage[str] = FakeStorage()
+    limiter = LeasingLimiter[str](
+        rate_limit=RateLimit(operations=2, period=timedelta(minutes=1)),
+        rate_storage=storage,
+        key_mutex=FakeMutex(),
+        lease_size=4,
+    )
+
+    # When: limit exceeded is called 3 times consecutively
+    # Then: only the 2 operations fitting in the bucket are leased and allowed
+    assert limiter.limit_exceeded_many([key, key, key]) == [False, False, True]
+    assert storage.read(key) == Rate(operations=2, updated_at=clock.now)
+
+
+def test_leasing_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that leasing algorithm returns the operations left in an expired lease with the next lease."""
+    clock = fake_clock(monkeypatch)
+    # Given: leasing limiter allowing 10 operations per minute, leasing 4 operations for a second at once
+    #   and an operation was spent from a lease 2 seconds ago
+    key = "test_key"
+    storage: FakeAtomicStorage[str] = FakeAtomicStorage()
+    limiter = LeasingLimiter[str](
+        rate_limit=RateLimit(operations=10, period=timedelta(minutes=1)),
+        rate_storage=storage,
+        lease_size=4,
+        lease_duration=1,
+    )
+
+    assert not limiter.limit_exceeded(key)
+    clock.sleep(2)
+
+    # When: limit exceeded is called
+    # Then: the 3 expired operations are removed from the bucket and 4 new ones are leased
+    assert not limiter.limit_exceeded(key)
+    assert storage.read(key) == Rate(operations=5, updated_at=clock.now)
+
+
+def test_leasing_release(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that leasing algorithm removes the operations left in the leases on release."""
+    clock = fake_clock(monkeypatch)
+    # Given: leasing limiter allowing 10 operations per minute, leasing 4 operations at once
+    #   and an operation was spent from a lease
+    key = "test_key"
+    storage: FakeAtomicStorage[str] = FakeAtomicStorage()
+    limiter = LeasingLimiter[str](
+        rate_limit=RateLimit(operations=10, period=timedelta(minutes=1)),
+        rate_storage=storage,
+        lease_size=4,
+    )
+
+    assert not limiter.limit_exceeded(key)
+
+    # When: the leases are released
+    limiter.release()
+
+    # Then: only the spent operation is left in the bucket
+    assert storage.read(key) == Rate(operations=1, updated_at=clock.now)
+    assert limiter.leases[key].tokens == 0
+
+
+def test_leasing_no_mutex() -> None:
+    """Test that leasing limiter requires a mutex for storages without atomic updates."""
+    # Given:
+    # When: leasing limiter is created without a mutex over storage without atomic updates
+    # Then: an exception is raised
+    with pytest.raises(ValueError, match="key_mutex is required"):
+        LeasingLimiter[str](rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)), rate_storage=FakeStorage())
+
+
+def test_leasing_cost(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that leasing algorithm takes the cost of a check from the lease at once."""
+    # Given: leasing limiter allowing 10 operations per minute, leasing 4 operations at once
+    key = "test_key"
+    clock = fake_clock(monkeypatch)
+    storage: FakeAtomicStorage[str] = FakeAtomicStorage()
+    limiter = LeasingLimiter[str](
+        rate_limit=RateLimit(operations=10, period=timedelta(minutes=1)),
+        rate_storage=storage,
+        lease_size=4,
+    )
+
+    # When: limit exceeded is called with costs of 3, 5 and 5 operations consecutively
+    # Then: the first check is served by a lease of 4 operations and the second one by a lease of 5 operations,
+    #   returning the operation left, while the third one is denied keeping the 2 operations it leased
+    assert not limiter.limit_exceeded(key, cost=3)
+    assert not limiter.limit_exceeded(key, cost=5)
+    assert storage.read(key) == Rate(operations=8, updated_at=clock.now)
+
+    assert limiter.limit_exceeded(key, cost=5)
+    assert storage.read(key) == Rate(operations=10, updated_at=clock.now)
+    assert limiter.leases[key].tokens == 2  # noqa: PLR2004 - the leased operations are kept
+
+
+def test_leasing_day_period(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that leasing algorithm leaks the buckets of periods longer than a day."""
+    clock = fake_clock(monkeypatch)
+    # Given: leasing limiter allowing 2 operations per day, leasing 2 operations at once
+    #   and the bucket is full
+    key = "test_key"
+    storage: FakeAtomicStorage[str] = FakeAtomicStorage()
+    limiter = LeasingLimiter[str](
+        rate_limit=RateLimit(operations=2, period=timedelta(days=1)),
+        rate_storage=storage,
+        lease_size=2,
+    )
+
+    assert limiter.limit_exceeded_many([key, key, key]) == [False, False, True]
+
+    # When: the limit is checked once the lease expired and 12 hours passed
+    clock.sleep(12 * 3600)
+
+    # Then: the operation leaked from the bucket is leased and allowed
+    assert not limiter.limit_exceeded(key)
+    assert storage.read(key) == Rate(operations=2, updated_at=clock.now)
+
+
+@pytest.mark.parametrize("cost", [0, -1])
+def test_leasing_invalid_cost(cost: int) -> None:
+    """Test that leasing algorithm rejects costs lower than 1 instead of returning operations to the lease."""
+    # Given: leasing limiter allowing 10 operations per minute, leasing 4 operations at once
+    limiter = LeasingLimiter[str](
+        rate_limit=RateLimit(operations=10, period=timedelta(minutes=1)),
+        rate_storage=FakeAtomicStorage(),
+        lease_size=4,
+    )
+
+    # When: limit exceeded is called with a cost lower than 1
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match="cost must be at least 1."):
+        limiter.limit_exceeded("test_key", cost=cost)
@@ -0,0 +1,73 @@
+"""Tests for in-memory leaky bucket rate limiting algorithm."""
+import time
+from datetime import timedelta
+
+import pytest
+
+from leak_snek.decorators.rate_limit import rate_limit
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.memory_leaky_bucket import Bucket, MemoryLeakyBucketLimiter
+
+
+def test_memory_leaky_bucket() -> None:
+    """Test that in-memory leaky bucket algorithm limits operations."""
+    # Given: in-memory leaky bucket limiter allowing 1 operation per minute
+    key = "test_key"
+    limiter = MemoryLeakyBucketLimiter[str](rate_limit=RateLimit(operations=1, period=timedelta(minutes=1)))
+
+    # When: limit exceeded is called two times consecutively
+    # Then: first time limit is not exceeded and second time it is
+    assert not limiter.limit_exceeded(key)
+    assert limiter.limit_exceeded(key)
+
+
+def test_memory_leaky_bucket_leak() -> None:
+    """Test that in-memory leaky bucket algorithm drains the bucket over time."""
+    # Given: in-memory leaky bucket limiter allowing 2 operations per minute
+    #   and two operations were made 30 seconds ago
+    key = "test_key"
+    limiter = MemoryLeakyBucketLimiter[str](rate_limit=RateLimit(operations=2, period=timedelta(minutes=1)))
+
+    limiter.buckets[key] = Bucket(operations=2, updated_at=time.monotonic() - 30)
+
+    # When: limit exceeded is called two times consecutively
+    # Then: only one operation is allowed b/c the bucket was drained for 1 operation
+    assert not limiter.limit_exceeded(key)
+    assert limiter.limit_exceeded(key)
+
+
+def test_memory_leaky_bucket_decorator() -> None:
+    """Test that in-memory leaky bucket limiter is usable with the rate limit decorator."""
+    # Given: function decorated with in-memory leaky bucket limiter allowing 1 operation per day
+    limiter = MemoryLeakyBucketLimiter[str](rate_limit=RateLimit(operations=1, period=timedelta(days=1)))
+    decorated = rate_limit(limiter, lambda: "key", default=False)(lambda: True)
+
+    # When: decorated function is called two times consecutively
+    # Then: the function is called the first time only
+    assert decorated()
+    assert not decorated()
+
+
+def test_memory_leaky_bucket_cost() -> None:
+    """Test that in-memory leaky bucket algorithm adds the cost of a check to the bucket at once."""
+    # Given: in-memory leaky bucket limiter allowing 5 operations per minute
+    key = "test_key"
+    limiter = MemoryLeakyBucketLimiter[str](rate_limit=RateLimit(operations=5, period=timedelta(minutes=1)))
+
+    # When: limit exceeded is called with costs of 3, 3, 2 and 1 operations consecutively
+    # Then: the operations are counted at once, only when all of them fit in the limit
+    assert not limiter.limit_exceeded(key, cost=3)
+    assert limiter.limit_exceeded(key, cost=3)
+    assert not limiter.limit_exceeded(key, cost=2)
+    assert limiter.limit_exceeded(key)
+
+
+def test_memory_leaky_bucket_invalid_cost() -> None:
+    """Test that in-memory leaky bucket algorithm rejects costs lower than 1 instead of draining the bucket."""
+    # Given: in-memory leaky bucket limiter allowing 5 operations per minute
+    limiter = MemoryLeakyBucketLimiter[str](rate_limit=RateLimit(operations=5, period=timedelta(minutes=1)))
+
+    # When: limit exceeded is called with a negative cost
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match="cost must be at least 1."):
+        limiter.limit_exceeded("test_key", cost=-1)
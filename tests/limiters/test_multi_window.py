@@ -0,0 +1,122 @@
+"""Tests for multi-window leaky bucket rate limiting algorithm."""
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.multi_window import MultiWindowLimiter
+from tests.fakes.clock import FakeClock
+from tests.fakes.mutex import FakeMutex
+from tests.fakes.storage import FakeAtomicStorage, FakeStorage
+
+RATE_LIMITS = [
+    RateLimit(operations=2, period=timedelta(seconds=1)),
+    RateLimit(operations=3, period=timedelta(minutes=1)),
+]
+
+
+def fake_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Make the multi-window limiter use a fake clock."""
+    clock = FakeClock()
+
+    monkeypatch.setattr("leak_snek.limiters.multi_window.time", SimpleNamespace(monotonic=clock.monotonic))
+
+    return clock
+
+
+def test_multi_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that multi-window algorithm packs the buckets of all the rate limits in a single rate."""
+    clock = fake_clock(monkeypatch)
+    # Given: multi-window limiter allowing 2 operations per second and 3 operations per minute
+    key = "test_key"
+    storage: FakeAtomicStorage[str] = FakeAtomicStorage()
+    limiter = MultiWindowLimiter[str](rate_limits=RATE_LIMITS, rate_storage=storage)
+
+    # When: limit exceeded is called 3 times consecutively
+    # Then: the per-second limit rejects the third operation, the packed rate holds 2 operations in both buckets
+    assert limiter.limit_exceeded_many([key, key, key]) == [False, False, True]
+    assert storage.read(key) == Rate(operations=2 + 2 * 3, updated_at=clock.now)
+
+    # When: limit exceeded is called twice a second later
+    clock.now += 1
+
+    # Then: the per-minute limit rejects the second operation without charging the per-second bucket
+    assert not limiter.limit_exceeded(key)
+    assert limiter.limit_exceeded(key)
+    assert storage.read(key) == Rate(operations=1 + 3 * 3, updated_at=clock.now)
+
+
+def test_multi_window_leaks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that multi-window algorithm leaks every bucket at the rate of its own limit."""
+    clock = fake_clock(monkeypatch)
+    # Given: multi-window limiter allowing 2 operations per second and 3 operations per minute over storage
+    #   without atomic updates, with both buckets full
+    key = "test_key"
+    storage: FakeStorage[str] = FakeStorage()
+    limiter = MultiWindowLimiter[str](rate_limits=RATE_LIMITS, rate_storage=storage, key_mutex=FakeMutex())
+
+    storage.write(key, Rate(operations=2 + 3 * 3, updated_at=clock.now))
+
+    # When: limit exceeded is called right away and 20 seconds later
+    # Then: the operation is rejected until the per-minute bucket leaked one, the per-second one leaked all
+    assert limiter.limit_exceeded(key)
+
+    clock.now += 20
+
+    assert not limiter.limit_exceeded(key)
+    assert storage.read(key) == Rate(operations=3 * 3, updated_at=clock.now)
+
+
+def test_multi_window_cost(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that multi-window algorithm adds the cost of an operation to every bucket."""
+    clock = fake_clock(monkeypatch)
+    # Given: multi-window limiter allowing 2 operations per second and 3 operations per minute
+    key = "test_key"
+    storage: FakeAtomicStorage[str] = FakeAtomicStorage()
+    limiter = MultiWindowLimiter[str](rate_limits=RATE_LIMITS, rate_storage=storage)
+
+    # When: limit exceeded is called with a cost of 2, then with a cost of 3 a second later
+    # Then: the first operation fills the per-second bucket, the second one doesn't fit in the per-second bucket
+    assert not limiter.limit_exceeded(key, cost=2)
+
+    clock.now += 1
+
+    assert limiter.limit_exceeded(key, cost=3)
+    assert storage.read(key) == Rate(operations=2 + 2 * 3, updated_at=clock.now - 1)
+
+
+@pytest.mark.parametrize(
+    ("rate_limits", "message"),
+    [
+        ([], "At least one rate limit is required."),
+        (
+            [
+                RateLimit(operations=2**32, period=timedelta(seconds=1)),
+                RateLimit(operations=2**31, period=timedelta(hours=1)),
+            ],
+            "The buckets of the rate limits don't fit in a 64-bit integer.",
+        ),
+        (RATE_LIMITS, "key_mutex is required for storages without atomic updates."),
+    ],
+)
+def test_multi_window_invalid(rate_limits: list[RateLimit], message: str) -> None:
+    """Test that multi-window limiter validates its configuration."""
+    # Given: storage without atomic updates
+    # When: multi-window limiter is created with invalid rate limits or without mutex
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match=message):
+        MultiWindowLimiter[str](rate_limits=rate_limits, rate_storage=FakeStorage())
+
+
+@pytest.mark.parametrize("cost", [0, -1])
+def test_multi_window_invalid_cost(cost: int) -> None:
+    """Test that multi-window algorithm rejects costs lower than 1 instead of draining the buckets."""
+    # Given: multi-window limiter allowing 2 operations per second and 3 per minute
+    limiter = MultiWindowLimiter[str](rate_limits=RATE_LIMITS, rate_storage=FakeAtomicStorage())
+
+    # When: limit exceeded is called with a cost lower than 1
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match="cost must be at least 1."):
+        limiter.limit_exceeded("test_key", cost=cost)
@@ -0,0 +1,167 @@
+"""Tests for in-memory sliding window rate limiting algorithms."""
+import array
+import time
+from collections import deque
+from datetime import timedelta
+
+import pytest
+
+from leak_snek.decorators.rate_limit import rate_limit
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.sliding_window import (
+    SlidingWindowCounterLimiter,
+    SlidingWindowLogLimiter,
+    WindowCounter,
+    WindowLog,
+)
+
+
+def test_sliding_window_log() -> None:
+    """Test that sliding window log algorithm limits operations."""
+    # Given: sliding window log limiter allowing 2 operations per minute
+    key = "test_key"
+    limiter = SlidingWindowLogLimiter[str](rate_limit=RateLimit(operations=2, period=timedelta(minutes=1)))
+
+    # When: limit exceeded is called three times consecutively
+    # Then: the first two operations are allowed and the third one is not
+    assert not limiter.limit_exceeded(key)
+    assert not limiter.limit_exceeded(key)
+    assert limiter.limit_exceeded(key)
+
+
+def test_sliding_window_log_rolls() -> None:
+    """Test that sliding window log algorithm only counts the operations of the last period."""
+    # Given: sliding window log limiter allowing 2 operations per minute
+    #   and operations were made 70 and 30 seconds ago
+    key = "test_key"
+    limiter = SlidingWindowLogLimiter[str](rate_limit=RateLimit(operations=2, period=timedelta(minutes=1)))
+    now = time.monotonic()
+
+    limiter.logs[key] = WindowLog(timestamps=deque([now - 70, now - 30], maxlen=2))
+
+    # When: limit exceeded is called two times consecutively
+    # Then: only one operation is allowed b/c the operation made 30 seconds ago is still in the window
+    assert not limiter.limit_exceeded(key)
+    assert limiter.limit_exceeded(key)
+    assert len(limiter.logs[key].timestamps) == 2  # noqa: PLR2004 - the log is bounded by the limit
+
+
+def test_sliding_window_log_decorator() -> None:
+    """Test that sliding window log limiter is usable with the rate limit decorator."""
+    # Given: function decorated with sliding window log limiter allowing 1 operation per day
+    limiter = SlidingWindowLogLimiter[str](rate_limit=RateLimit(operations=1, period=timedelta(days=1)))
+    decorated = rate_limit(limiter, lambda: "key", default=False)(lambda: True)
+
+    # When: decorated function is called two times consecutively
+    # Then: the function is called the first time only
+    assert decorated()
+    assert not decorated()
+
+
+def test_sliding_window_counter() -> None:
+    """Test that sliding window counter algorithm limits operations."""
+    # Given: sliding window counter limiter allowing 2 operations per minute
+    key = "test_key"
+    limiter = SlidingWindowCounterLimiter[str](rate_limit=RateLimit(operations=2, period=timedelta(minutes=1)))
+
+    # When: limit exceeded is called three times consecutively
+    # Then: the first two operations are allowed and the third one is not
+    assert not limiter.limit_exceeded(key)
+    assert not limiter.limit_exceeded(key)
+    assert limiter.limit_exceeded(key)
+
+
+def test_sliding_window_counter_weights_oldest_sub_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that sliding window counter algorithm counts the oldest sub-window in proportion to its overlap."""
+    # Given: sliding window counter limiter allowing 10 operations per minute in 6 sub-windows of 10 seconds
+    #   and 10 operations were made in the sub-window starting 60 seconds before the current one
+    key = "test_key"
+    limiter = SlidingWindowCounterLimiter[str](
+        rate_limit=RateLimit(operations=10, period=timedelta(minutes=1)),
+        sub_windows=6,
+    )
+    counts = array.array("q", [0] * 7)
+    counts[100 % 7] = 10
+    limiter.counters[key] = WindowCounter(counts=counts, slot=100, total=10)
+
+    # When: limit exceeded is called 2.5 seconds, then 5 seconds into the current sub-window
+    # Then: 2 operations are allowed while 7.5 of the old operations are estimated to be in the window,
+    #   and 3 more once only 5 of them are left
+    monkeypatch.setattr("leak_snek.limiters.sliding_window.monotonic", lambda: 1062.5)
+    assert not limiter.limit_exceeded(key)
+    assert not limiter.limit_exceeded(key)
+    assert limiter.limit_exceeded(key)
+
+    monkeypatch.setattr("leak_snek.limiters.sliding_window.monotonic", lambda: 1065.0)
+    assert not limiter.limit_exceeded(key)
+    assert not limiter.limit_exceeded(key)
+    assert not limiter.limit_exceeded(key)
+    assert limiter.limit_exceeded(key)
+
+
+def test_sliding_window_counter_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that sliding window counter algorithm forgets the operations older than the window."""
+    # Given: sliding window counter limiter allowing 2 operations per minute in 6 sub-windows of 10 seconds
+    #   and 2 operations made in the current sub-window
+    key = "test_key"
+    limiter = SlidingWindowCounterLimiter[str](
+        rate_limit=RateLimit(operations=2, period=timedelta(minutes=1)),
+        sub_windows=6,
+    )
+    monkeypatch.setattr("leak_snek.limiters.sliding_window.monotonic", lambda: 1000.0)
+    assert not limiter.limit_exceeded(key)
+    assert not limiter.limit_exceeded(key)
+
+    # When: limit exceeded is called once the sub-window fully left the window, then much later
+    # Then: operations are allowed again and the counts of the ring never exceed the limit
+    monkeypatch.setattr("leak_snek.limiters.sliding_window.monotonic", lambda: 1070.0)
+    assert not limiter.limit_exceeded(key)
+
+    monkeypatch.setattr("leak_snek.limiters.sliding_window.monotonic", lambda: 5000.0)
+    assert not limiter.limit_exceeded(key)
+    assert not limiter.limit_exceeded(key)
+    assert limiter.limit_exceeded(key)
+    assert limiter.counters[key].total == 2  # noqa: PLR2004 - the expired operations aren't counted
+    assert sum(limiter.counters[key].counts) == 2  # noqa: PLR2004 - the expired operations aren't counted
+
+
+def test_sliding_window_log_cost() -> None:
+    """Test that sliding window log algorithm logs the cost of a check at once."""
+    # Given: sliding window log limiter allowing 5 operations per minute
+    key = "test_key"
+    limiter = SlidingWindowLogLimiter[str](rate_limit=RateLimit(operations=5, period=timedelta(minutes=1)))
+
+    # When: limit exceeded is called with costs of 3, 3, 2 and 1 operations consecutively
+    # Then: the operations are counted at once, only when all of them fit in the limit
+    assert not limiter.limit_exceeded(key, cost=3)
+    assert limiter.limit_exceeded(key, cost=3)
+    assert not limiter.limit_exceeded(key, cost=2)
+    assert limiter.limit_exceeded(key)
+
+
+def test_sliding_window_counter_cost() -> None:
+    """Test that sliding window counter algorithm counts the cost of a check at once."""
+    # Given: sliding window counter limiter allowing 5 operations per minute
+    key = "test_key"
+    limiter = SlidingWindowCounterLimiter[str](rate_limit=RateLimit(operations=5, period=timedelta(minutes=1)))
+
+    # When: limit exceeded is called with costs of 3, 3, 2 and 1 operations consecutively
+    # Then: the operations are counted at once, only when all of them fit in the limit
+    assert not limiter.limit_exceeded(key, cost=3)
+    assert limiter.limit_exceeded(key, cost=3)
+    assert not limiter.limit_exceeded(key, cost=2)
+    assert limiter.limit_exceeded(key)
+
+
+@pytest.mark.parametrize("limiter_class", [SlidingWindowLogLimiter, SlidingWindowCounterLimiter])
+def test_sliding_window_invalid_cost(
+    limiter_class: type[SlidingWindowLogLimiter[str]] | type[SlidingWindowCounterLimiter[str]],
+) -> None:
+    """Test that sliding window algorithms reject costs lower than 1 instead of freeing room in the window."""
+    # Given: sliding window limiter allowing 5 operations per minute
+    limiter = limiter_class(rate_limit=RateLimit(operations=5, period=timedelta(minutes=1)))
+
+    # When: limit exceeded is called with a negative cost
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match="cost must be at least 1."):
+        limiter.limit_exceeded("test_key", cost=-1)
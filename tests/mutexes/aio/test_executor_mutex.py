@@ -0,0 +1,149 @@
+"""Test async executor mutex adapter."""
+import asyncio
+from contextlib import AbstractContextManager
+from threading import Lock, RLock
+from typing import Any, Self, final
+
+import pytest
+
+from leak_snek.mutexes.aio.executor_mutex import AsyncExecutorMutex
+from leak_snek.mutexes.striped_mutex import StripedMutex
+from tests.fakes.mutex import FakeMutex
+
+
+async def test_executor_mutex() -> None:
+    """Test that async executor mutex locks the keys."""
+    # Given:
+    test_key = "test_key"
+    mutex = FakeMutex[str]()
+    executor_mutex = AsyncExecutorMutex[str](mutex=mutex)
+
+    # When: mutex lock context manager is entered
+    async with executor_mutex.lock(test_key):
+        # Then: the key is locked
+        assert mutex.key_locks[test_key].locked
+
+    # Then: and unlocked after exiting the lock context manager
+    assert not mutex.key_locks[test_key].locked
+
+    executor_mutex.close()
+
+
+async def test_executor_mutex_rlock() -> None:
+    """Test that async executor mutex releases the locks from the threads that acquired them."""
+    # Given: mutex of reentrant locks, which can only be released by the thread owning them
+    test_key = "test_key"
+    lock = RLock()
+    executor_mutex = AsyncExecutorMutex[str](mutex=StripedMutex[str, RLock](lock_factory=lambda: lock, stripes=1))
+
+    # When: the key is locked and unlocked twice
+    for _ in range(2):
+        async with executor_mutex.lock(test_key):
+            pass
+
+    # Then: the lock is released and can be acquired by another thread
+    assert lock.acquire(blocking=False)
+
+    lock.release()
+    executor_mutex.close()
+
+
+async def test_executor_mutex_cancelled() -> None:
+    """Test that async executor mutex releases the locks acquired for cancelled coroutines."""
+    # Given: the key is locked by another thread
+    test_key = "test_key"
+    lock = Lock()
+    executor_mutex = AsyncExecutorMutex[str](mutex=StripedMutex[str, Lock](lock_factory=lambda: lock, stripes=1))
+
+    lock.acquire()
+
+    async def wait_for_lock() -> None:
+        async with executor_mutex.lock(test_key):
+            pass
+
+    waiter = asyncio.create_task(wait_for_lock())
+    await asyncio.sleep(0.01)
+
+    # When: the coroutine waiting for the key lock is cancelled and the other thread releases the key
+    waiter.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    lock.release()
+
+    # Then: the lock acquired for the cancelled coroutine is released
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+
+        if not lock.locked():
+            break
+
+    assert not lock.locked()
+
+    executor_mutex.close()
+
+
+@final
+class BrokenLock(AbstractContextManager[Any]):
+    """Fake lock failing to be acquired once released."""
+
+    def __init__(self: Self) -> None:
+        """Create the lock held by another thread."""
+        self.held = Lock()
+        self.held.acquire()
+
+    def __enter__(self: Self) -> bool:
+        """Wait for the other thread and fail to acquire the lock."""
+        with self.held:
+            raise RuntimeError
+
+    def __exit__(self: Self, *_: object) -> None:
+        """Fail as the lock is never acquired."""
+        raise AssertionError
+
+
+async def test_executor_mutex_cancelled_failed() -> None:
+    """Test that async executor mutex doesn't release the locks failed to be acquired for cancelled coroutines."""
+    # Given: the key is locked by another thread
+    broken_lock = BrokenLock()
+    executor_mutex = AsyncExecutorMutex[str](
+        mutex=StripedMutex[str, AbstractContextManager[Any]](lock_factory=lambda: broken_lock, stripes=1),
+    )
+
+    async def wait_for_lock() -> None:
+        async with executor_mutex.lock("test_key"):
+            pass
+
+    waiter = asyncio.create_task(wait_for_lock())
+    await asyncio.sleep(0.01)
+
+    # When: the coroutine waiting for the key lock is cancelled and the lock fails to be acquired
+    waiter.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    broken_lock.held.release()
+
+    # Then: the lock isn't released
+    executor_mutex.close()
+    await asyncio.sleep(0.01)
+
+
+async def test_executor_mutex_failed() -> None:
+    """Test that async executor mutex raises the exceptions of the locks failing to be acquired."""
+    # Given: lock failing to be acquired
+    broken_lock = BrokenLock()
+    broken_lock.held.release()
+    executor_mutex = AsyncExecutorMutex[str](
+        mutex=StripedMutex[str, AbstractContextManager[Any]](lock_factory=lambda: broken_lock, stripes=1),
+    )
+
+    # When: the key is locked
+    # Then: the exception of the lock is raised
+    with pytest.raises(RuntimeError):
+        async with executor_mutex.lock("test_key"):
+            pass
+
+    executor_mutex.close()
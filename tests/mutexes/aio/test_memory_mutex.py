@@ -0,0 +1,73 @@
+"""Test async memory mutex."""
+import asyncio
+
+import pytest
+
+from leak_snek.mutexes.aio.memory_mutex import AsyncMemoryMutex
+
+
+async def test_memory_mutex() -> None:
+    """Test that async memory mutex locks the keys."""
+    # Given:
+    test_key = "test_key"
+    memory_mutex = AsyncMemoryMutex[str]()
+
+    # When: mutex lock context manager is entered
+    async with memory_mutex.lock(test_key):
+        # Then: the key is locked
+        assert memory_mutex.key_locks[test_key].lock.locked()
+
+    # Then: and unlocked and removed after exiting the lock context manager
+    assert test_key not in memory_mutex.key_locks
+
+
+async def test_memory_mutex_exclusive() -> None:
+    """Test that async memory mutex lets a single coroutine at a time into the critical section of a key."""
+    # Given:
+    test_key = "test_key"
+    memory_mutex = AsyncMemoryMutex[str]()
+    inside = 0
+    most_inside = 0
+
+    async def critical_section() -> None:
+        nonlocal inside, most_inside
+
+        async with memory_mutex.lock(test_key):
+            inside += 1
+            most_inside = max(most_inside, inside)
+            await asyncio.sleep(0)
+            inside -= 1
+
+    # When: many coroutines enter the critical section of the same key concurrently
+    await asyncio.gather(*(critical_section() for _ in range(10)))
+
+    # Then: they enter it one by one and the key lock is removed afterwards
+    assert most_inside == 1
+    assert test_key not in memory_mutex.key_locks
+
+
+async def test_memory_mutex_reclaim_cancelled() -> None:
+    """Test that async memory mutex removes key locks whose waiting holders are cancelled."""
+    # Given: the key is locked
+    test_key = "test_key"
+    memory_mutex = AsyncMemoryMutex[str]()
+
+    async def wait_for_lock() -> None:
+        async with memory_mutex.lock(test_key):
+            pass
+
+    async with memory_mutex.lock(test_key):
+        waiter = asyncio.create_task(wait_for_lock())
+        await asyncio.sleep(0)
+
+        # When: a coroutine waiting for the key lock is cancelled
+        waiter.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        # Then: it's no longer a holder of the key lock
+        assert memory_mutex.key_locks[test_key].holders == 1
+
+    # Then: and the key lock is removed once released
+    assert test_key not in memory_mutex.key_locks
@@ -1,4 +1,9 @@
 """Test memory mutex."""
+from contextlib import AbstractContextManager
+from typing import Any, Self, final
+
+import pytest
+
 from leak_snek.mutexes.memory_mutex import MemoryMutex
 from tests.fakes.mutex import FakeLock
 
@@ -17,3 +22,48 @@ def test_memory_mutex() -> None:
 
     # Then: and unlocked after exiting the lock context manager
     assert not key_lock.locked
+
+
+def test_memory_mutex_reclaim() -> None:
+    """Test that memory mutex removes key locks once their last holder releases them."""
+    # Given:
+    test_key = "test_key"
+    memory_mutex = MemoryMutex[str, FakeLock](local_lock=FakeLock(), lock_factory=FakeLock)
+
+    # When: the key lock is held by two holders
+    with memory_mutex.lock(test_key):
+        with memory_mutex.lock(test_key):
+            # Then: the key lock is tracked with both holders
+            assert memory_mutex.key_locks[test_key].holders == 2  # noqa: PLR2004 - two nested holders
+
+        # Then: the key lock is still tracked after the first holder releases it
+        assert memory_mutex.key_locks[test_key].holders == 1
+
+    # Then: and removed after the last holder releases it
+    assert test_key not in memory_mutex.key_locks
+
+
+@final
+class BrokenLock(AbstractContextManager[Any]):
+    """Fake lock failing to be acquired."""
+
+    def __enter__(self: Self) -> bool:
+        """Fail to acquire the lock."""
+        raise RuntimeError
+
+    def __exit__(self: Self, *_: object) -> None:
+        """Do nothing as the lock is never acquired."""
+
+
+def test_memory_mutex_reclaim_failed() -> None:
+    """Test that memory mutex removes key locks that failed to be acquired."""
+    # Given:
+    test_key = "test_key"
+    memory_mutex = MemoryMutex[str, AbstractContextManager[Any]](local_lock=FakeLock(), lock_factory=BrokenLock)
+
+    # When: the key lock fails to be acquired
+    with pytest.raises(RuntimeError), memory_mutex.lock(test_key):
+        pass
+
+    # Then: the key lock is removed
+    assert test_key not in memory_mutex.key_locks
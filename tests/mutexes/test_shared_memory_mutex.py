@@ -0,0 +1,113 @@
+"""Test shared memory mutex."""
+import fcntl
+import multiprocessing
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from leak_snek.mutexes.shared_memory_mutex import SharedMemoryMutex, stable_hash
+
+
+def try_lock(path: str, slot: int, locked: "multiprocessing.SimpleQueue[bool]") -> None:
+    """Report whether the slot of the file at the path is locked by another process."""
+    fd = os.open(path, os.O_RDWR)
+
+    try:
+        fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, slot)
+    except OSError:
+        is_slot_locked = True
+    else:
+        is_slot_locked = False
+    finally:
+        os.close(fd)
+
+    locked.put(is_slot_locked)
+
+
+def is_locked(path: str, slot: int) -> bool:
+    """Check whether the slot of the file at the path is locked, as seen from another process."""
+    context = multiprocessing.get_context("spawn")
+    locked: multiprocessing.SimpleQueue[bool] = context.SimpleQueue()
+    process = context.Process(target=try_lock, args=(path, slot, locked))
+
+    process.start()
+    process.join()
+
+    assert process.exitcode == 0
+
+    return locked.get()
+
+
+def test_shared_memory_mutex(tmp_path: Path) -> None:
+    """Test that shared memory mutex locks the keys for other processes."""
+    # Given:
+    test_key = "test_key"
+    path = str(tmp_path / "locks")
+    mutex = SharedMemoryMutex(path=path, slots=16)
+    slot = stable_hash(test_key) % 16
+
+    # When: mutex lock context manager is entered
+    with mutex.lock(test_key):
+        # Then: the key is locked for other processes
+        assert is_locked(path, slot)
+
+    # Then: and unlocked after exiting the lock context manager
+    assert not is_locked(path, slot)
+
+    mutex.close()
+
+
+def test_shared_memory_mutex_shared_file(tmp_path: Path) -> None:
+    """Test that closing another mutex of the same file keeps the locks of the process."""
+    # Given:
+    test_key = "test_key"
+    path = str(tmp_path / "locks")
+    mutex = SharedMemoryMutex(path=path, slots=16)
+    slot = stable_hash(test_key) % 16
+
+    # When: another mutex of the same file is created and closed while the key is locked
+    with mutex.lock(test_key):
+        other_mutex = SharedMemoryMutex(path=str(tmp_path / "." / "locks"), slots=16)
+        other_mutex.close()
+
+        # Then: both mutexes share the file descriptor and the key stays locked for other processes
+        assert other_mutex.fd == mutex.fd
+        assert is_locked(path, slot)
+
+    mutex.close()
+
+    # Then: the file descriptor is closed with the last mutex
+    with pytest.raises(OSError, match="Bad file descriptor"):
+        os.fstat(mutex.fd)
+
+
+def test_shared_memory_mutex_threads(tmp_path: Path) -> None:
+    """Test that the mutexes of a process locking the same file exclude the threads of the process."""
+    # Given: two mutexes of the same file
+    test_key = "test_key"
+    path = str(tmp_path / "locks")
+    mutex = SharedMemoryMutex(path=path, slots=16)
+    other_mutex = SharedMemoryMutex(path=path, slots=16)
+    entered = threading.Event()
+
+    def lock_other() -> None:
+        with other_mutex.lock(test_key):
+            entered.set()
+
+    thread = threading.Thread(target=lock_other)
+
+    # When: another thread locks the key with the other mutex while it is locked
+    with mutex.lock(test_key):
+        thread.start()
+
+        # Then: the other thread waits for the key to be unlocked
+        assert not entered.wait(timeout=0.1)
+
+    # Then: and locks it once it is unlocked
+    thread.join()
+    assert entered.is_set()
+
+    other_mutex.close()
+    mutex.close()
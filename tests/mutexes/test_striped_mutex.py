@@ -0,0 +1,31 @@
+"""Test striped mutex."""
+from leak_snek.mutexes.striped_mutex import StripedMutex
+from tests.fakes.mutex import FakeLock
+
+
+def test_striped_mutex() -> None:
+    """Test that striped mutex locks the keys."""
+    # Given:
+    test_key = "test_key"
+    striped_mutex = StripedMutex[str, FakeLock](lock_factory=FakeLock, stripes=4)
+    key_lock = striped_mutex.lock(test_key)
+
+    # When: mutex lock context manager is entered
+    with key_lock:
+        # Then: the key is locked
+        assert key_lock.locked
+
+    # Then: and unlocked after exiting the lock context manager
+    assert not key_lock.locked
+
+
+def test_striped_mutex_stripes() -> None:
+    """Test that striped mutex shares a bounded number of locks between keys."""
+    # Given:
+    striped_mutex = StripedMutex[int, FakeLock](lock_factory=FakeLock, stripes=4)
+
+    # When: locks are obtained for many keys
+    locks = {id(striped_mutex.lock(key)) for key in range(100)}
+
+    # Then: no more locks than stripes are used
+    assert len(locks) == 4  # noqa: PLR2004 - stripes set above
@@ -0,0 +1,62 @@
+"""Test metrics observer."""
+import math
+
+from leak_snek.observers.metrics_observer import Histogram, MetricsObserver
+
+
+def test_histogram() -> None:
+    """Test that histogram counts values in the buckets of their upper bounds."""
+    # Given: histogram with buckets up to 1, 2 and 4
+    histogram = Histogram(bounds=(1, 2, 4))
+
+    # When: values within and above the bounds are observed
+    for value in (0.5, 1, 1.5, 3, 3, 8):
+        histogram.observe(value)
+
+    # Then: the values are counted in their buckets, and the quantiles are estimated as the bucket bounds
+    assert histogram.counts == [2, 1, 2, 1]
+    assert histogram.count == 6  # noqa: PLR2004 - 6 values were observed
+    assert histogram.total == 17  # noqa: PLR2004 - the sum of the values
+    assert histogram.quantile(0.5) == 2  # noqa: PLR2004 - the third value is in the bucket up to 2
+    assert histogram.quantile(0.8) == 4  # noqa: PLR2004 - the fifth value is in the bucket up to 4
+    assert histogram.quantile(1) == math.inf
+
+
+def test_histogram_empty() -> None:
+    """Test that histogram without values has no quantiles."""
+    # Given: histogram without values
+    histogram = Histogram()
+
+    # When: a quantile is estimated
+    # Then: it is not a number
+    assert math.isnan(histogram.quantile(0.99))
+
+
+def test_metrics_observer() -> None:
+    """Test that metrics observer counts decisions and records latencies."""
+    # Given: metrics observer with latency buckets up to 1 and 2 seconds
+    observer = MetricsObserver(bounds=(1, 2))
+
+    # When: decisions, lock waits and storage calls are reported
+    observer.decided("key", allowed=True)
+    observer.decided("key", allowed=True)
+    observer.decided("key", allowed=True)
+    observer.decided("key", allowed=False)
+    observer.lock_waited("key", 1.5)
+    observer.storage_called("key", "read", 0.5)
+    observer.storage_called("key", "read", 3)
+    observer.storage_called("key", "write", 0.5)
+
+    # Then: decisions are counted and latencies are recorded in the histograms
+    assert (observer.allowed, observer.denied, observer.denied_ratio) == (3, 1, 0.25)
+    assert observer.lock_wait.counts == [0, 1, 0]
+    assert observer.storage_latency["read"].counts == [1, 0, 1]
+    assert observer.storage_latency["write"].counts == [1, 0, 0]
+
+
+def test_metrics_observer_empty() -> None:
+    """Test that metrics observer without decisions has no denied operations."""
+    # Given:
+    # When: metrics observer is created
+    # Then: no operation is denied
+    assert MetricsObserver().denied_ratio == 0
@@ -4,7 +4,7 @@ from datetime import timedelta
 import pytest
 
 from leak_snek.interfaces.values.rate_limit import RateLimit
-from leak_snek.shortcuts.rate_limit import rl
+from leak_snek.shortcuts.rate_limit import rl, rls
 
 
 @pytest.mark.parametrize(
@@ -45,3 +45,23 @@ def test_rl_fail(rate_limit: str, message_regex: str) -> None:
     # Then: corresponding exception is raised
     with pytest.raises(ValueError, match=message_regex):
         rl(rate_limit)
+
+
+def test_rls() -> None:
+    """Test that rls parses every rate limit of a compound rate limit string."""
+    # Given:
+    # When: rls is called with a compound rate limit string
+    # Then: corresponding rate limit objects are returned in the same order
+    assert rls("10/s;1000/h") == [
+        RateLimit(operations=10, period=timedelta(seconds=1)),
+        RateLimit(operations=1000, period=timedelta(hours=1)),
+    ]
+
+
+def test_rls_fail() -> None:
+    """Test that rls raises exceptions for invalid compound rate limit strings."""
+    # Given:
+    # When: rls is called with a compound rate limit string holding an invalid rate limit string
+    # Then: corresponding exception is raised
+    with pytest.raises(ValueError, match="Unexpected end of rate limit string."):
+        rls("10/s;")
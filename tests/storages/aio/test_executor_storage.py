@@ -0,0 +1,170 @@
+"""Test async executor storage adapters."""
+import asyncio
+import threading
+from collections.abc import Callable
+from functools import partial
+from time import monotonic
+from typing import Any
+
+import pytest
+
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.storages.aio.executor_storage import AsyncExecutorAtomicStorage, AsyncExecutorStorage, ExecutorBatcher
+from tests.fakes.storage import FakeAtomicStorage, FakeStorage
+
+
+def count_hops(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """Record the number of calls of every executor hop of the running event loop."""
+    loop = asyncio.get_running_loop()
+    run_in_executor = loop.run_in_executor
+    hops: list[int] = []
+
+    def counting_run_in_executor(executor: Any, function: Callable[..., Any], *args: Any) -> Any:  # noqa: ANN401
+        hops.append(len(args[0]))
+
+        return run_in_executor(executor, function, *args)
+
+    monkeypatch.setattr(loop, "run_in_executor", counting_run_in_executor)
+
+    return hops
+
+
+async def test_executor_storage() -> None:
+    """Test async executor storage read/write."""
+    # Given:
+    key = "test_key"
+    storage = AsyncExecutorStorage[str](storage=FakeStorage())
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: rate is written for the key
+    await storage.write(key, rate)
+
+    # Then: the same rate is returned for the same key
+    assert await storage.read(key) == rate
+
+    storage.close()
+
+
+async def test_executor_atomic_storage() -> None:
+    """Test async executor atomic storage read/write/update."""
+    # Given:
+    key = "test_key"
+    storage = AsyncExecutorAtomicStorage[str](storage=FakeAtomicStorage())
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: rate is written for the key and then updated with a function returning None
+    await storage.write(key, rate)
+    skipped = await storage.update(key, lambda _: None)
+
+    # Then: the rate is unchanged
+    assert skipped is None
+    assert await storage.read(key) == rate
+
+    storage.close()
+
+
+async def test_executor_batcher(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that executor batcher runs the calls made in the same iteration of the event loop in a single hop."""
+    # Given:
+    hops = count_hops(monkeypatch)
+    batcher = ExecutorBatcher()
+
+    # When: many calls are made concurrently
+    results = await asyncio.gather(*(batcher.run(partial(int, value)) for value in range(10)))
+
+    # Then: the results are returned in order after a single executor hop
+    assert results == list(range(10))
+    assert hops == [10]
+
+    batcher.close()
+
+
+async def test_executor_batcher_max_batch(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that executor batcher splits the calls in batches of at most the maximum size."""
+    # Given:
+    hops = count_hops(monkeypatch)
+    batcher = ExecutorBatcher(max_batch=2)
+
+    # When: more calls than the maximum batch size are made concurrently
+    await asyncio.gather(*(batcher.run(lambda: None) for _ in range(5)))
+
+    # Then: the calls are run in batches of the maximum size
+    assert hops == [2, 2, 1]
+
+    batcher.close()
+
+
+async def test_executor_batcher_exception() -> None:
+    """Test that executor batcher raises the exception of a call only in the coroutine making it."""
+    # Given:
+    batcher = ExecutorBatcher()
+
+    def fail() -> None:
+        raise RuntimeError
+
+    # When: a failing call is made together with another call
+    failed, succeeded = await asyncio.gather(batcher.run(fail), batcher.run(lambda: 1), return_exceptions=True)
+
+    # Then: the exception is only raised for the failing call
+    assert isinstance(failed, RuntimeError)
+    assert succeeded == 1
+
+    batcher.close()
+
+
+class AbortError(BaseException):
+    """Exception aborting the whole batch."""
+
+
+async def test_executor_batcher_abort() -> None:
+    """Test that executor batcher raises the exception aborting a batch in all its coroutines."""
+    # Given:
+    batcher = ExecutorBatcher()
+
+    def abort() -> None:
+        raise AbortError
+
+    # When: a call aborting the batch is made together with another call
+    results = await asyncio.gather(batcher.run(abort), batcher.run(lambda: 1), return_exceptions=True)
+
+    # Then: the exception is raised for both calls
+    assert all(isinstance(result, AbortError) for result in results)
+
+    batcher.close()
+
+
+async def test_executor_batcher_closed() -> None:
+    """Test that executor batcher fails the calls made after it's closed."""
+    # Given:
+    batcher = ExecutorBatcher()
+    batcher.close()
+
+    # When: a call is made
+    # Then: an exception is raised
+    with pytest.raises(RuntimeError):
+        await batcher.run(lambda: None)
+
+
+async def test_executor_batcher_cancelled() -> None:
+    """Test that executor batcher completes the batches of coroutines cancelled while waiting for them."""
+    # Given: a call blocked in the pool
+    batcher = ExecutorBatcher()
+    release = threading.Event()
+
+    waiter = asyncio.create_task(batcher.run(release.wait))
+    await asyncio.sleep(0)
+
+    # When: the coroutine waiting for the call is cancelled and the call completes
+    waiter.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    release.set()
+
+    # Then: the batcher keeps running calls
+    assert await batcher.run(lambda: 1) == 1
+
+    batcher.close()
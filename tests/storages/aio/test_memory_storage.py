@@ -0,0 +1,54 @@
+"""Test async memory storage."""
+from time import monotonic
+
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.storages.aio.memory_storage import AsyncMemoryStorage
+
+
+async def test_memory_storage() -> None:
+    """Test async memory storage read/write."""
+    # Given:
+    key = "test_key"
+    memory_storage = AsyncMemoryStorage[str]()
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: rate is written for the key
+    await memory_storage.write(key, rate)
+
+    # Then: the same rate is returned for the same key
+    assert await memory_storage.read(key) == rate
+
+
+async def test_memory_storage_default() -> None:
+    """Test that async memory storage returns zero initialized rate for not stored key read."""
+    # Given:
+    memory_storage = AsyncMemoryStorage[str]()
+
+    # When: not stored key is read from the storage
+    rate = await memory_storage.read("key")
+
+    # Then: default zero initialized rate is returned and stored
+    assert rate.operations == 0
+    assert await memory_storage.read("key") is rate
+
+
+async def test_memory_storage_update() -> None:
+    """Test that async memory storage atomically replaces rates with the result of the update function."""
+    # Given:
+    key = "test_key"
+    memory_storage = AsyncMemoryStorage[str]()
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: the key is updated with a function returning a new rate and then with a function returning None
+    updated = await memory_storage.update(
+        key,
+        lambda current: Rate(operations=current.operations + 1, updated_at=rate.updated_at),
+    )
+    skipped = memory_storage.update_nowait(key, lambda _: None)
+
+    # Then: the new rate is stored and left unchanged by the function returning None
+    assert updated == rate
+    assert skipped is None
+    assert await memory_storage.read(key) == rate
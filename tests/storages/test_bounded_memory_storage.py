@@ -0,0 +1,72 @@
+"""Test bounded memory storage."""
+from datetime import timedelta
+from time import monotonic
+
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.storages.bounded_memory_storage import BoundedMemoryStorage
+
+RATE_LIMIT = RateLimit(operations=2, period=timedelta(minutes=1))
+
+
+def test_bounded_memory_storage() -> None:
+    """Test bounded memory storage read/write."""
+    # Given:
+    key = "test_key"
+    storage = BoundedMemoryStorage[str](rate_limit=RATE_LIMIT)
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: rate is written for the key
+    storage.write(key, rate)
+
+    # Then: the same rate is returned for the same key
+    assert storage.read(key) == rate
+
+
+def test_bounded_memory_storage_default() -> None:
+    """Test that bounded memory storage returns zero initialized rate without storing it for not stored key read."""
+    # Given:
+    storage = BoundedMemoryStorage[str](rate_limit=RATE_LIMIT)
+
+    # When: not stored key is read from the storage
+    rate = storage.read("key")
+
+    # Then: default zero initialized rate is returned and no key is tracked
+    assert rate.operations == 0
+    assert len(storage) == 0
+
+
+def test_bounded_memory_storage_expiry() -> None:
+    """Test that bounded memory storage drops fully leaked rates on access."""
+    # Given: storage with a rate of 1 operation made 30 seconds ago (fully leaked)
+    #   and a rate of 2 operations made 10 seconds ago (not fully leaked)
+    storage = BoundedMemoryStorage[str](rate_limit=RATE_LIMIT)
+
+    storage.write("leaked", Rate(operations=1, updated_at=monotonic() - 30))
+    storage.write("fresh", Rate(operations=2, updated_at=monotonic() - 10))
+
+    # When: any key is read from the storage
+    storage.read("other")
+
+    # Then: only the fully leaked rate is dropped
+    assert len(storage) == 1
+    assert storage.read("fresh").operations == 2  # noqa: PLR2004 - operations written above
+
+
+def test_bounded_memory_storage_max_keys() -> None:
+    """Test that bounded memory storage evicts least recently used rates past the max keys cap."""
+    # Given: storage capped at 2 keys with 2 stored rates, the first of which was read recently
+    storage = BoundedMemoryStorage[str](rate_limit=RATE_LIMIT, max_keys=2)
+
+    storage.write("first", Rate(operations=1, updated_at=monotonic()))
+    storage.write("second", Rate(operations=1, updated_at=monotonic()))
+    storage.read("first")
+
+    # When: the third key is written
+    storage.write("third", Rate(operations=1, updated_at=monotonic()))
+
+    # Then: the least recently used key is evicted
+    assert len(storage) == 2  # noqa: PLR2004 - max keys set above
+    assert storage.read("second").operations == 0
+    assert storage.read("first").operations == 1
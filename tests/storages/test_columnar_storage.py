@@ -0,0 +1,104 @@
+"""Test columnar storage."""
+import sys
+from time import monotonic
+
+import pytest
+
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.storages.columnar_storage import ColumnarStorage
+
+
+@pytest.mark.parametrize("hash_keys", [False, True])
+def test_columnar_storage(*, hash_keys: bool) -> None:
+    """Test columnar storage read/write."""
+    # Given:
+    key = "test_key"
+    storage = ColumnarStorage[str](hash_keys=hash_keys)
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: rate is written for the key
+    storage.write(key, rate)
+    storage.write(key, rate)
+
+    # Then: the same rate is returned for the same key
+    assert storage.read(key) == rate
+    assert len(storage) == 1
+
+
+@pytest.mark.parametrize("hash_keys", [False, True])
+def test_columnar_storage_default(*, hash_keys: bool) -> None:
+    """Test that columnar storage returns zero initialized rate without storing it for not stored key read."""
+    # Given:
+    storage = ColumnarStorage[str](hash_keys=hash_keys)
+
+    # When: not stored key is read from the storage
+    rate = storage.read("key")
+
+    # Then: default zero initialized rate is returned and no key is stored
+    assert rate.operations == 0
+    assert len(storage) == 0
+
+
+@pytest.mark.parametrize("hash_keys", [False, True])
+def test_columnar_storage_grow(*, hash_keys: bool) -> None:
+    """Test that columnar storage keeps the rates while growing past its initial capacity."""
+    # Given: storage with capacity for a couple of keys
+    storage = ColumnarStorage[int](capacity=2, hash_keys=hash_keys)
+
+    rates = {key: Rate(operations=key, updated_at=float(key)) for key in range(0, 3000, 3)}
+
+    # When: many more keys are written
+    for key, rate in rates.items():
+        storage.write(key, rate)
+
+    # Then: the same rates are returned for the same keys
+    assert {key: storage.read(key) for key in rates} == rates
+    assert len(storage) == len(rates)
+
+
+def test_columnar_storage_hash_collisions() -> None:
+    """Test that columnar storage with hashed keys tells apart keys whose hashes land on the same slot."""
+    # Given: storage with 16 slots
+    storage = ColumnarStorage[int](capacity=16, hash_keys=True)
+
+    rates = {key: Rate(operations=key, updated_at=float(key)) for key in range(0, 64, 16)}
+
+    # When: keys landing on the same slot are written
+    for key, rate in rates.items():
+        storage.write(key, rate)
+
+    # Then: the same rates are returned for the same keys
+    assert {key: storage.read(key) for key in rates} == rates
+
+
+def test_columnar_storage_bytes_per_key() -> None:
+    """Test that columnar storage with hashed keys takes a few dozen bytes per key."""
+    # Given:
+    storage = ColumnarStorage[int](hash_keys=True)
+
+    # When: many keys are written
+    for key in range(10_000):
+        storage.write(key, Rate(operations=1, updated_at=monotonic()))
+
+    # Then: a key takes at most a slot of 21 bytes divided by the lowest load factor of 3/8
+    assert storage.bytes_per_key <= 21 * 8 / 3
+
+
+def test_columnar_storage_nbytes() -> None:
+    """Test that columnar storage counts the slot indices of the mapping of the key objects."""
+    # Given:
+    storage = ColumnarStorage[int]()
+
+    # When: many keys are written
+    for key in range(10_000):
+        storage.write(key, Rate(operations=1, updated_at=monotonic()))
+
+    # Then: the columns, the mapping and the slot indices are counted
+    mapping = {}
+
+    for slot in range(10_000):
+        mapping[slot] = slot
+
+    slots = sys.getsizeof(mapping) + sum(map(sys.getsizeof, mapping.values()))
+    assert storage.nbytes >= storage.operations.nbytes + storage.updated_at.nbytes + slots
@@ -1,6 +1,10 @@
 """Test memory storage."""
+from io import BytesIO
+from threading import Thread
 from time import monotonic
 
+import pytest
+
 from leak_snek.interfaces.values.rate import Rate
 from leak_snek.storages.memory_storage import MemoryStorage
 
@@ -30,3 +34,131 @@ def test_memory_storage_default() -> None:
 
     # Then: default zero initialized rate is returned
     assert rate.operations == 0
+
+
+def test_memory_storage_update() -> None:
+    """Test that memory storage atomically replaces rates with the result of the update function."""
+    # Given:
+    key = "test_key"
+    storage = MemoryStorage[str]()
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: the key is updated with a function returning a new rate and then with a function returning None
+    updated = storage.update(key, lambda current: Rate(operations=current.operations + 1, updated_at=rate.updated_at))
+    skipped = storage.update(key, lambda _: None)
+
+    # Then: the new rate is stored and left unchanged by the function returning None
+    assert updated == rate
+    assert skipped is None
+    assert storage.read(key) == rate
+
+
+def test_memory_storage_update_many() -> None:
+    """Test that memory storage atomically replaces the rates of several keys with the result of the update function."""
+    # Given:
+    keys = ["user", "tenant"]
+    storage = MemoryStorage[str]()
+
+    rate = Rate(operations=1, updated_at=monotonic())
+    storage.write("tenant", rate)
+
+    # When: the keys are updated with a function returning new rates and then with a function returning None
+    updated = storage.update_many(
+        keys,
+        lambda current: [Rate(operations=value.operations + 1, updated_at=rate.updated_at) for value in current],
+    )
+    skipped = storage.update_many(keys, lambda _: None)
+
+    # Then: the new rates are stored and left unchanged by the function returning None
+    assert updated == [rate, Rate(operations=2, updated_at=rate.updated_at)]
+    assert skipped is None
+    assert [storage.read(key) for key in keys] == updated
+
+
+def test_memory_storage_snapshot() -> None:
+    """Test that memory storage loaded from a snapshot holds the dumped rates, rebased to the monotonic clock."""
+    # Given: storage holding rates updated a second ago and ten seconds ago
+    now = monotonic()
+    memory_storage = MemoryStorage[str]()
+    memory_storage.write("recent", Rate(operations=1, updated_at=now - 1))
+    memory_storage.write("old", Rate(operations=2, updated_at=now - 10))
+
+    snapshot = BytesIO()
+
+    # When: the storage is dumped and loaded back
+    memory_storage.dump(snapshot)
+    snapshot.seek(0)
+
+    loaded = MemoryStorage[str].load(snapshot)
+
+    # Then: the loaded storage holds the same operations, updated as long ago as in the dumped storage
+    assert loaded.read("recent").operations == 1
+    assert loaded.read("old").operations == 2  # noqa: PLR2004 - operations written above
+    assert loaded.read("recent").updated_at == pytest.approx(now - 1, abs=0.5)
+    assert loaded.read("old").updated_at == pytest.approx(now - 10, abs=0.5)
+
+
+def test_memory_storage_empty_snapshot() -> None:
+    """Test that empty memory storage is loaded from its snapshot."""
+    # Given:
+    snapshot = BytesIO()
+
+    # When: empty storage is dumped and loaded back
+    MemoryStorage[str]().dump(snapshot)
+    snapshot.seek(0)
+
+    loaded = MemoryStorage[str].load(snapshot)
+
+    # Then: the loaded storage is empty
+    assert loaded.read("key").operations == 0
+
+
+def test_memory_storage_snapshot_nul_key() -> None:
+    """Test that memory storage refuses to dump keys containing NUL characters."""
+    # Given:
+    memory_storage = MemoryStorage[str]()
+    memory_storage.write("nul\0key", Rate.default())
+
+    # When: the storage is dumped
+    # Then: an exception is raised
+    with pytest.raises(ValueError, match="NUL characters"):
+        memory_storage.dump(BytesIO())
+
+
+def test_memory_storage_invalid_snapshot() -> None:
+    """Test that memory storage refuses to load files not holding a snapshot."""
+    # Given:
+    snapshot = BytesIO(b"not a snapshot")
+
+    # When: the file is loaded
+    # Then: an exception is raised
+    with pytest.raises(ValueError, match="doesn't hold a snapshot"):
+        MemoryStorage[str].load(snapshot)
+
+
+def test_memory_storage_write_during_update() -> None:
+    """Test that memory storage writes wait for the updates in progress."""
+    # Given:
+    key = "test_key"
+    storage = MemoryStorage[str]()
+
+    rate = Rate(operations=1, updated_at=monotonic())
+    written = Rate(operations=2, updated_at=monotonic())
+    writer = Thread(target=storage.write, args=(key, written))
+
+    def start_writer(_: Rate) -> Rate:
+        writer.start()
+        writer.join(timeout=0.1)
+
+        # Then: the write waits for the update
+        assert writer.is_alive()
+
+        return rate
+
+    # When: the key is written by another thread while it is updated
+    storage.update(key, start_writer)
+    writer.join()
+
+    # Then: the write is applied after the update
+    assert storage.read(key) == written
@@ -0,0 +1,50 @@
+"""Test sharded memory storage."""
+from time import monotonic
+
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.storages.sharded_memory_storage import ShardedMemoryStorage
+
+
+def test_sharded_memory_storage() -> None:
+    """Test sharded memory storage read/write."""
+    # Given:
+    storage = ShardedMemoryStorage[int](shards=4)
+
+    rates = {key: Rate(operations=key, updated_at=monotonic()) for key in range(16)}
+
+    # When: rates are written for keys spread across the shards
+    for key, rate in rates.items():
+        storage.write(key, rate)
+
+    # Then: the same rates are returned for the same keys
+    assert {key: storage.read(key) for key in rates} == rates
+
+
+def test_sharded_memory_storage_default() -> None:
+    """Test that sharded memory storage returns zero initialized rate for not stored key read."""
+    # Given:
+    storage = ShardedMemoryStorage[str]()
+
+    # When: not stored key is read from the storage
+    rate = storage.read("key")
+
+    # Then: default zero initialized rate is returned
+    assert rate.operations == 0
+
+
+def test_sharded_memory_storage_update() -> None:
+    """Test that sharded memory storage atomically replaces rates with the result of the update function."""
+    # Given:
+    key = "test_key"
+    storage = ShardedMemoryStorage[str]()
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: the key is updated with a function returning a new rate and then with a function returning None
+    updated = storage.update(key, lambda current: Rate(operations=current.operations + 1, updated_at=rate.updated_at))
+    skipped = storage.update(key, lambda _: None)
+
+    # Then: the new rate is stored and left unchanged by the function returning None
+    assert updated == rate
+    assert skipped is None
+    assert storage.read(key) == rate
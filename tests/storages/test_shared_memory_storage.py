@@ -0,0 +1,145 @@
+"""Test shared memory storage."""
+import multiprocessing
+from datetime import timedelta
+from pathlib import Path
+from time import monotonic
+
+import pytest
+
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.interfaces.values.rate_limit import RateLimit
+from leak_snek.limiters.leaky_bucket import LeakyBucketLimiter
+from leak_snek.storages.shared_memory_storage import SharedMemoryStorage
+
+
+def test_shared_memory_storage(tmp_path: Path) -> None:
+    """Test shared memory storage read/write."""
+    # Given:
+    key = "test_key"
+    storage = SharedMemoryStorage(path=str(tmp_path / "rates"), buckets=16)
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: rate is written for the key
+    storage.write(key, rate)
+    storage.write(key, rate)
+
+    # Then: the same rate is returned for the same key
+    assert storage.read(key) == rate
+
+    storage.close()
+
+
+def test_shared_memory_storage_default(tmp_path: Path) -> None:
+    """Test that shared memory storage returns zero initialized rate for not stored key read."""
+    # Given:
+    storage = SharedMemoryStorage(path=str(tmp_path / "rates"), buckets=16)
+
+    # When: not stored key is read from the storage
+    rate = storage.read("key")
+
+    # Then: default zero initialized rate is returned
+    assert rate.operations == 0
+
+    storage.close()
+
+
+def test_shared_memory_storage_update(tmp_path: Path) -> None:
+    """Test that shared memory storage atomically replaces rates with the result of the update function."""
+    # Given:
+    key = "test_key"
+    storage = SharedMemoryStorage(path=str(tmp_path / "rates"), buckets=16)
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: the key is updated with a function returning a new rate and then with a function returning None
+    updated = storage.update(key, lambda current: Rate(operations=current.operations + 1, updated_at=rate.updated_at))
+    skipped = storage.update(key, lambda _: None)
+
+    # Then: the new rate is stored and left unchanged by the function returning None
+    assert updated == rate
+    assert skipped is None
+    assert storage.read(key) == rate
+
+    storage.close()
+
+
+def test_shared_memory_storage_full_bucket(tmp_path: Path) -> None:
+    """Test that shared memory storage replaces the least recently updated key of a full bucket."""
+    # Given: storage with a single bucket of 2 slots holding an older and a newer rate
+    storage = SharedMemoryStorage(path=str(tmp_path / "rates"), buckets=1, ways=2)
+
+    storage.write("older", Rate(operations=1, updated_at=monotonic() - 10))
+    storage.write("newer", Rate(operations=1, updated_at=monotonic()))
+
+    # When: a third key is written
+    storage.write("third", Rate(operations=1, updated_at=monotonic()))
+
+    # Then: the least recently updated key is replaced
+    assert storage.read("older").operations == 0
+    assert storage.read("newer").operations == 1
+    assert storage.read("third").operations == 1
+
+    storage.close()
+
+
+def test_shared_memory_storage_attach(tmp_path: Path) -> None:
+    """Test that shared memory storages opened at the same path share the rates."""
+    # Given: two storages opened at the same path
+    key = "test_key"
+    path = str(tmp_path / "rates")
+    storage = SharedMemoryStorage(path=path, buckets=16)
+    attached = SharedMemoryStorage(path=path, buckets=16)
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: rate is written for the key to the first storage
+    storage.write(key, rate)
+
+    # Then: the same rate is returned for the same key by the second storage
+    assert attached.read(key) == rate
+
+    attached.close()
+    storage.close()
+
+
+def test_shared_memory_storage_mismatch(tmp_path: Path) -> None:
+    """Test that shared memory storage refuses to open a table of a different layout."""
+    # Given: storage table of 16 buckets
+    path = str(tmp_path / "rates")
+    SharedMemoryStorage(path=path, buckets=16).close()
+
+    # When: the table is opened as a table of 32 buckets
+    # Then: an exception is raised
+    with pytest.raises(ValueError, match="doesn't hold a table of 32 buckets"):
+        SharedMemoryStorage(path=path, buckets=32)
+
+
+def count_allowed(path: str, attempts: int, allowed: "multiprocessing.SimpleQueue[int]") -> None:
+    """Count the operations allowed by a leaky bucket limiter over the shared memory storage at the path."""
+    limiter = LeakyBucketLimiter[str](
+        rate_limit=RateLimit(operations=100, period=timedelta(hours=1)),
+        rate_storage=SharedMemoryStorage(path=path, buckets=16),
+    )
+
+    allowed.put(sum(not limiter.limit_exceeded("key") for _ in range(attempts)))
+
+
+def test_shared_memory_storage_processes(tmp_path: Path) -> None:
+    """Test that processes using shared memory storage enforce a single limit together."""
+    # Given: 4 processes making 50 attempts each against a shared limit of 100 operations per hour
+    path = str(tmp_path / "rates")
+    context = multiprocessing.get_context("spawn")
+    allowed: multiprocessing.SimpleQueue[int] = context.SimpleQueue()
+    processes = [context.Process(target=count_allowed, args=(path, 50, allowed)) for _ in range(4)]
+
+    # When: the processes make their attempts concurrently
+    for process in processes:
+        process.start()
+
+    for process in processes:
+        process.join()
+
+    # Then: exactly the limit of operations is allowed in total
+    assert all(process.exitcode == 0 for process in processes)
+    assert sum(allowed.get() for _ in processes) == 100  # noqa: PLR2004 - rate limit set above
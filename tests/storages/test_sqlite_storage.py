@@ -0,0 +1,213 @@
+"""Test SQLite storage."""
+import sqlite3
+from pathlib import Path
+from threading import Thread
+from time import monotonic
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.storages.sqlite_storage import SQLiteStorage
+
+
+def test_sqlite_storage(tmp_path: Path) -> None:
+    """Test SQLite storage read/write."""
+    # Given:
+    key = "test_key"
+    storage = SQLiteStorage(path=str(tmp_path / "rates.db"))
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: rate is written for the key
+    storage.write(key, rate)
+    storage.write(key, rate)
+
+    # Then: the same rate is returned for the same key
+    assert storage.read(key) == rate
+
+    storage.close()
+
+
+def test_sqlite_storage_default(tmp_path: Path) -> None:
+    """Test that SQLite storage returns zero initialized rate for not stored key read."""
+    # Given:
+    storage = SQLiteStorage(path=str(tmp_path / "rates.db"))
+
+    # When: not stored key is read from the storage
+    rate = storage.read("key")
+
+    # Then: default zero initialized rate is returned
+    assert rate.operations == 0
+
+    storage.close()
+
+
+def test_sqlite_storage_update(tmp_path: Path) -> None:
+    """Test that SQLite storage atomically replaces rates with the result of the update function."""
+    # Given:
+    key = "test_key"
+    storage = SQLiteStorage(path=str(tmp_path / "rates.db"))
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: the key is updated with a function returning a new rate and then with a function returning None
+    updated = storage.update(key, lambda current: Rate(operations=current.operations + 1, updated_at=rate.updated_at))
+    skipped = storage.update(key, lambda _: None)
+
+    # Then: the new rate is stored and left unchanged by the function returning None
+    assert updated == rate
+    assert skipped is None
+    assert storage.read(key) == rate
+
+    storage.close()
+
+
+def test_sqlite_storage_update_many(tmp_path: Path) -> None:
+    """Test that SQLite storage atomically replaces the rates of several keys with the result of the update function."""
+    # Given:
+    keys = ["user", "tenant"]
+    storage = SQLiteStorage(path=str(tmp_path / "rates.db"))
+
+    rate = Rate(operations=1, updated_at=monotonic())
+    storage.write("tenant", rate)
+
+    # When: the keys are updated with a function returning new rates and then with a function returning None
+    updated = storage.update_many(
+        keys,
+        lambda current: [Rate(operations=value.operations + 1, updated_at=rate.updated_at) for value in current],
+    )
+    skipped = storage.update_many(keys, lambda _: None)
+
+    # Then: the new rates are stored and left unchanged by the function returning None
+    assert updated == [rate, Rate(operations=2, updated_at=rate.updated_at)]
+    assert skipped is None
+    assert [storage.read(key) for key in keys] == updated
+
+    storage.close()
+
+
+def test_sqlite_storage_update_rollback(tmp_path: Path) -> None:
+    """Test that SQLite storage leaves the rate unchanged when the update function raises."""
+    # Given:
+    key = "test_key"
+    storage = SQLiteStorage(path=str(tmp_path / "rates.db"))
+
+    rate = Rate(operations=1, updated_at=monotonic())
+    storage.write(key, rate)
+
+    def fail(_: Rate) -> Rate:
+        raise RuntimeError
+
+    # When: the key is updated with a function raising an exception
+    with pytest.raises(RuntimeError):
+        storage.update(key, fail)
+
+    # Then: the stored rate is unchanged and the storage remains usable
+    assert storage.read(key) == rate
+
+    storage.close()
+
+
+def test_sqlite_storage_persistence(tmp_path: Path) -> None:
+    """Test that SQLite storage keeps the rates after being reopened."""
+    # Given:
+    key = "test_key"
+    path = str(tmp_path / "rates.db")
+    storage = SQLiteStorage(path=path)
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: rate is written for the key and the storage is reopened
+    storage.write(key, rate)
+    storage.close()
+
+    reopened = SQLiteStorage(path=path)
+
+    # Then: the same rate is returned for the same key
+    assert reopened.read(key) == rate
+
+    reopened.close()
+
+
+def test_sqlite_storage_reboot(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that SQLite storage rebases the rates stored before the monotonic clock restarted."""
+    # Given: rate updated 10 seconds before being written, when the monotonic clock was 9000 seconds behind the wall
+    #   clock
+    key = "test_key"
+    path = str(tmp_path / "rates.db")
+
+    monkeypatch.setattr(
+        "leak_snek.storages.sqlite_storage.time",
+        SimpleNamespace(time=lambda: 10_000.0, monotonic=lambda: 1_000.0),
+    )
+    storage = SQLiteStorage(path=path)
+    storage.write(key, Rate(operations=1, updated_at=990.0))
+    storage.close()
+
+    # When: the storage is reopened 100 seconds later, after a reboot restarted the monotonic clock
+    monkeypatch.setattr(
+        "leak_snek.storages.sqlite_storage.time",
+        SimpleNamespace(time=lambda: 10_100.0, monotonic=lambda: 10.0),
+    )
+    reopened = SQLiteStorage(path=path)
+
+    # Then: the rate was updated 110 seconds ago on the new monotonic clock
+    assert reopened.read(key) == Rate(operations=1, updated_at=-100.0)
+
+    reopened.close()
+
+
+def test_sqlite_storage_exited_threads(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that SQLite storage closes the connections of the threads that exited."""
+    # Given: storage recording the connections it opens
+    connections: list[sqlite3.Connection] = []
+
+    def connect(*args: Any, **kwargs: Any) -> sqlite3.Connection:  # noqa: ANN401 - forwarded to sqlite3
+        connection: sqlite3.Connection = sqlite3.connect(*args, **kwargs)
+        connections.append(connection)
+
+        return connection
+
+    monkeypatch.setattr("leak_snek.storages.sqlite_storage.sqlite3", SimpleNamespace(connect=connect))
+    storage = SQLiteStorage(path=str(tmp_path / "rates.db"))
+
+    # When: the storage is used by a thread that exits, then by another thread
+    for _ in range(2):
+        thread = Thread(target=storage.read, args=["test_key"])
+        thread.start()
+        thread.join()
+
+    # Then: the connection of the first thread was closed when the second one opened its own
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[1].execute("SELECT 1")
+
+    connections[2].execute("SELECT 1")
+
+    storage.close()
+
+
+def test_sqlite_storage_threads(tmp_path: Path) -> None:
+    """Test that SQLite storage atomically updates the rates from multiple threads."""
+    # Given:
+    key = "test_key"
+    storage = SQLiteStorage(path=str(tmp_path / "rates.db"))
+
+    def increment() -> None:
+        for _ in range(50):
+            storage.update(key, lambda current: Rate(operations=current.operations + 1, updated_at=monotonic()))
+
+    threads = [Thread(target=increment) for _ in range(4)]
+
+    # When: the key is incremented concurrently from 4 threads with their own connections
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    # Then: no increment is lost
+    assert storage.read(key).operations == 200  # noqa: PLR2004 - 4 threads making 50 increments each
+
+    storage.close()
@@ -0,0 +1,283 @@
+"""Test write-behind storage."""
+from __future__ import annotations
+
+import dataclasses
+from threading import Event
+from time import monotonic
+from typing import TYPE_CHECKING, Self, final, override
+
+import pytest
+
+from leak_snek.interfaces.storages.rate_store import RateStorage
+from leak_snek.interfaces.values.rate import Rate
+from leak_snek.storages.write_behind_storage import WriteBehindStorage
+from tests.fakes.storage import FakeStorage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@final
+@dataclasses.dataclass
+class RecordingStorage(RateStorage[str]):
+    """Fake rate storage recording the reads and the writes, optionally failing the writes."""
+
+    rates: dict[str, Rate] = dataclasses.field(default_factory=dict)
+    reads: list[str] = dataclasses.field(default_factory=list)
+    writes: list[str] = dataclasses.field(default_factory=list)
+    written: Event = dataclasses.field(default_factory=Event)
+    failing: bool = False
+    on_read: Callable[[], None] | None = None
+
+    @override
+    def read(self: Self, key: str) -> Rate:
+        """Get rate for given key, calling the read function once."""
+        self.reads.append(key)
+
+        on_read, self.on_read = self.on_read, None
+
+        if on_read is not None:
+            on_read()
+
+        return self.rates.get(key) or Rate.default()
+
+    @override
+    def write(self: Self, key: str, value: Rate) -> None:
+        """Write rate for given key, unless failing."""
+        if self.failing:
+            raise RuntimeError
+
+        self.rates[key] = value
+        self.writes.append(key)
+        self.written.set()
+
+
+def test_write_behind_storage() -> None:
+    """Test write-behind storage read/write."""
+    # Given:
+    key = "test_key"
+    backend = RecordingStorage()
+    storage = WriteBehindStorage[str](storage=backend, flush_interval=60)
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: rate is written for the key
+    storage.write(key, rate)
+
+    # Then: the same rate is returned for the same key, and only written to the wrapped storage on flush
+    assert storage.read(key) == rate
+    assert not backend.writes
+
+    storage.flush()
+
+    assert backend.rates == {key: rate}
+
+    storage.close()
+
+
+def test_write_behind_storage_load() -> None:
+    """Test that write-behind storage loads not stored keys from the wrapped storage."""
+    # Given: wrapped storage holding a rate for the key
+    key = "test_key"
+    rate = Rate(operations=1, updated_at=monotonic())
+    backend = FakeStorage[str]()
+    backend.write(key, rate)
+
+    storage = WriteBehindStorage[str](storage=backend)
+
+    # When: the key is read from the storage
+    # Then: the rate of the wrapped storage is returned
+    assert storage.read(key) == rate
+
+    storage.close()
+
+
+def test_write_behind_storage_update() -> None:
+    """Test that write-behind storage atomically replaces rates with the result of the update function."""
+    # Given:
+    key = "test_key"
+    backend = RecordingStorage()
+    storage = WriteBehindStorage[str](storage=backend, flush_interval=60)
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: the key is updated with a function returning a new rate and then with a function returning None
+    updated = storage.update(key, lambda current: Rate(operations=current.operations + 1, updated_at=rate.updated_at))
+    skipped = storage.update(key, lambda _: None)
+
+    # Then: the new rate is stored and left unchanged by the function returning None
+    assert updated == rate
+    assert skipped is None
+    assert storage.read(key) == rate
+
+    storage.close()
+
+    assert backend.rates == {key: rate}
+
+
+def test_write_behind_storage_coalescing() -> None:
+    """Test that write-behind storage writes only the latest rate of a key written many times between flushes."""
+    # Given:
+    key = "test_key"
+    backend = RecordingStorage()
+    storage = WriteBehindStorage[str](storage=backend, flush_interval=60)
+
+    # When: the key is written many times before a flush
+    for operations in range(10):
+        storage.write(key, Rate(operations=operations, updated_at=monotonic()))
+
+    storage.flush()
+
+    # Then: the wrapped storage is written once with the latest rate
+    assert backend.writes == [key]
+    assert backend.rates[key].operations == 9  # noqa: PLR2004 - the last of 10 writes
+
+    storage.close()
+
+
+def test_write_behind_storage_batch_size() -> None:
+    """Test that write-behind storage flushes in the background once enough keys are pending."""
+    # Given:
+    backend = RecordingStorage()
+    storage = WriteBehindStorage[str](storage=backend, batch_size=2, flush_interval=60)
+
+    # When: as many keys as the batch size are written
+    storage.write("first", Rate(operations=1, updated_at=monotonic()))
+    storage.write("second", Rate(operations=1, updated_at=monotonic()))
+
+    # Then: the keys are written to the wrapped storage without waiting for the interval
+    assert backend.written.wait(timeout=10)
+
+    storage.close()
+
+
+def test_write_behind_storage_flush_interval() -> None:
+    """Test that write-behind storage flushes in the background once the interval elapses."""
+    # Given:
+    backend = RecordingStorage()
+    storage = WriteBehindStorage[str](storage=backend, flush_interval=0.01)
+
+    # When: a single key is written
+    storage.write("key", Rate(operations=1, updated_at=monotonic()))
+
+    # Then: the key is written to the wrapped storage once the interval elapses
+    assert backend.written.wait(timeout=10)
+
+    storage.close()
+
+
+def test_write_behind_storage_failed_flush() -> None:
+    """Test that write-behind storage keeps the rates pending when the wrapped storage fails to write them."""
+    # Given: failing wrapped storage
+    key = "test_key"
+    backend = RecordingStorage(failing=True)
+    storage = WriteBehindStorage[str](storage=backend, flush_interval=60)
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: rate is written for the key and flushed
+    storage.write(key, rate)
+
+    # Then: an exception is raised
+    with pytest.raises(RuntimeError):
+        storage.flush()
+
+    # Then: and the rate is written once the wrapped storage recovers
+    backend.failing = False
+    storage.close()
+
+    assert backend.rates == {key: rate}
+
+
+def test_write_behind_storage_failed_background_flush() -> None:
+    """Test that write-behind storage reports the failures of the background flushes."""
+    # Given: failing wrapped storage, with a function receiving the flush errors
+    errors: list[Exception] = []
+    failed = Event()
+
+    def on_flush_error(error: Exception) -> None:
+        errors.append(error)
+        failed.set()
+
+    backend = RecordingStorage(failing=True)
+    storage = WriteBehindStorage[str](storage=backend, flush_interval=0.01, on_flush_error=on_flush_error)
+
+    # When: rate is written for a key
+    storage.write("test_key", Rate(operations=1, updated_at=monotonic()))
+
+    # Then: the failed background flush is counted and its exception is passed to the function
+    assert failed.wait(timeout=10)
+    assert storage.failed_flushes >= 1
+    assert isinstance(errors[0], RuntimeError)
+
+    backend.failing = False
+    storage.close()
+
+
+def test_write_behind_storage_max_keys() -> None:
+    """Test that write-behind storage evicts the least recently written keys past the cap once flushed."""
+    # Given: write-behind storage keeping at most 1 key
+    backend = RecordingStorage()
+    storage = WriteBehindStorage[str](storage=backend, flush_interval=60, max_keys=1)
+
+    rate = Rate(operations=1, updated_at=monotonic())
+    changed = Rate(operations=2, updated_at=rate.updated_at)
+
+    # When: rates are written for 2 keys and flushed, and the rates of the wrapped storage change
+    storage.write("first", rate)
+    storage.write("second", rate)
+    storage.flush()
+
+    backend.rates = {"first": changed, "second": changed}
+
+    # Then: the least recently written key is read from the wrapped storage again, the other one from memory
+    assert storage.read("first") == changed
+    assert storage.update("second", lambda current: current) == rate
+
+    storage.close()
+
+
+def test_write_behind_storage_max_keys_pending() -> None:
+    """Test that write-behind storage doesn't evict the keys whose writes are pending."""
+    # Given: failing wrapped storage and write-behind storage keeping at most 1 key
+    backend = RecordingStorage(failing=True)
+    storage = WriteBehindStorage[str](storage=backend, flush_interval=60, max_keys=1)
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    # When: rates are written for 2 keys and the flush fails
+    storage.write("first", rate)
+    storage.write("second", rate)
+
+    with pytest.raises(RuntimeError):
+        storage.flush()
+
+    backend.rates = {"first": Rate(operations=2, updated_at=rate.updated_at)}
+
+    # Then: both keys are kept in memory
+    assert storage.read("first") == rate
+
+    backend.failing = False
+    storage.close()
+
+
+def test_write_behind_storage_eviction_during_load() -> None:
+    """Test that write-behind storage reads a key again when keys are evicted while it is read."""
+    # Given: write-behind storage keeping at most 1 key, with 2 keys written
+    backend = RecordingStorage()
+    storage = WriteBehindStorage[str](storage=backend, flush_interval=60, max_keys=1)
+
+    rate = Rate(operations=1, updated_at=monotonic())
+
+    storage.write("first", rate)
+    storage.write("second", rate)
+
+    # When: a key is loaded while a flush evicts keys
+    backend.rates["third"] = rate
+    backend.on_read = storage.flush
+
+    # Then: the key is read again from the wrapped storage
+    assert storage.read("third") == rate
+    assert backend.reads == ["third", "third"]
+
+    storage.close()